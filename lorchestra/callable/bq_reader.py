@@ -8,6 +8,8 @@ Params:
     sqlite_path: str — target SQLite file path (e.g., "~/clinical-vault/local.db")
     table: str — target SQLite table name (e.g., "clients")
     dataset: str (optional) — "canonical" (default) or "derived"
+    mode: str (optional) — "diff" to sync only changed rows (see
+        lorchestra.sqlite_sync); projected_at is then marked volatile
 
 Returns:
     CallableResult with items=[{
@@ -36,6 +38,7 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             - sqlite_path: str — target SQLite path
             - table: str — target SQLite table name
             - dataset: str (optional) — "canonical" or "derived"
+            - mode: str (optional) — "diff" for a diff sqlite.sync
 
     Returns:
         CallableResult dict with single item for sqlite.sync
@@ -49,6 +52,7 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
     sqlite_path = params.get("sqlite_path")
     table = params.get("table")
     dataset_key = params.get("dataset", "canonical")
+    mode = params.get("mode")
 
     missing = [
         k for k, v in [
@@ -73,6 +77,11 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
     # Resolve sqlite_path (expand ~)
     resolved_sqlite_path = str(Path(sqlite_path).expanduser())
 
+    # Diff mode: projected_at changes every run, so it is excluded from row hashes
+    sync_options: dict[str, Any] = {}
+    if mode == "diff":
+        sync_options = {"mode": "diff", "auto_timestamp_columns": ["projected_at"]}
+
     # Build fully qualified BQ view name
     view_name = f"`{project}.{dataset}.{projection}`"
     sql = f"SELECT * FROM {view_name}"
@@ -90,6 +99,7 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
                 "table": table,
                 "columns": [],
                 "rows": [],
+                **sync_options,
             }],
             stats={"input": 0, "output": 0, "skipped": 0, "errors": 0},
         )
@@ -118,6 +128,7 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             "table": table,
             "columns": columns,
             "rows": sync_rows,
+            **sync_options,
         }],
         stats={
             "input": len(rows),
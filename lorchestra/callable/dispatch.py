@@ -12,10 +12,24 @@ Error handling contract:
 - Classification happens at the source (callables) or executor boundary
 - CallableResult is success-only; errors are exceptions, not values
 
-Note: The CALLABLES registry imports are lazy to avoid import cycles and
-allow graceful handling when callable modules are not installed.
+Loading is lazy per name: the registry maps each name to its module path
+(CALLABLE_MODULES) and a module is only imported the first time that name is
+dispatched, so a `render` step never pays for importing the BigQuery or LLM
+SDKs behind injest or inferometer. Modules that fail to import behave as
+stubs raising NotImplementedError when called.
+
+Plugins: names not in CALLABLE_MODULES are looked up among installed
+`lorchestra.callables` entry points, e.g. in a plugin's pyproject.toml:
+
+    [project.entry-points."lorchestra.callables"]
+    my_callable = "my_package.callable"          # module with execute()
+    other = "my_package.other:run"               # or an explicit function
+
+Entry points are only scanned on the first dispatch of an unknown name.
 """
 
+import importlib
+from importlib.metadata import entry_points
 from typing import Callable
 
 from lorchestra.callable.result import CallableResult
@@ -24,6 +38,35 @@ from lorchestra.callable.result import CallableResult
 # Type alias for callable functions
 CallableFn = Callable[[dict], dict]
 
+# Entry point group for plugin callables
+ENTRY_POINT_GROUP = "lorchestra.callables"
+
+# Callable name -> candidate modules (first importable one with execute() wins).
+# External callables are top-level packages (injest, canonizer, etc.); internal
+# callables live in lorchestra.callable.* and are registered under their short
+# name (e.g., "view_creator").
+CALLABLE_MODULES: dict[str, tuple[str, ...]] = {
+    # External packages
+    "injest": ("injest",),
+    "canonizer": ("canonizer",),
+    "finalform": ("finalform",),
+    "projectionist": ("projectionist",),
+    "workman": ("workman",),
+    # "inferometer" can be used from either the internal adapter or the external
+    # package; prefer the adapter (more flexible for lorchestra integration)
+    "inferometer": ("lorchestra.callable.inferometer_adapter", "inferometer"),
+    # Internal callables
+    "view_creator": ("lorchestra.callable.view_creator",),
+    "molt_projector": ("lorchestra.callable.molt_projector",),
+    "bq_reader": ("lorchestra.callable.bq_reader",),
+    "file_renderer": ("lorchestra.callable.file_renderer",),
+    "egret_builder": ("lorchestra.callable.egret_builder",),
+    "render": ("lorchestra.callable.render",),
+    "inferometer_adapter": ("lorchestra.callable.inferometer_adapter",),
+    # Aliases: "egret" -> egret_builder (callable: egret in job definitions)
+    "egret": ("lorchestra.callable.egret_builder",),
+}
+
 
 def _try_import_callable(module_name: str) -> CallableFn | None:
     """
@@ -32,7 +75,6 @@ def _try_import_callable(module_name: str) -> CallableFn | None:
     Returns None if import fails or module doesn't have execute function.
     """
     try:
-        import importlib
         module = importlib.import_module(module_name)
         if hasattr(module, 'execute') and callable(module.execute):
             return module.execute
@@ -41,64 +83,74 @@ def _try_import_callable(module_name: str) -> CallableFn | None:
     return None
 
 
-def _get_callables() -> dict[str, CallableFn]:
+class _LazyCallable:
+    """
+    Registry entry that imports its callable on first call.
+
+    Tries each candidate module in order; if none imports, calls behave like
+    _stub_callable (NotImplementedError).
     """
-    Build the callable registry with lazy imports.
 
-    This function is called once and cached. It attempts to import
-    each callable module and only registers those that are available.
+    __slots__ = ("__name__", "_modules", "_fn")
+
+    def __init__(self, name: str, modules: tuple[str, ...]):
+        self.__name__ = name
+        self._modules = modules
+        self._fn: CallableFn | None = None
+
+    def load(self) -> CallableFn:
+        """Import the callable (once) and return it."""
+        if self._fn is None:
+            for module_name in self._modules:
+                fn = _try_import_callable(module_name)
+                if fn is not None:
+                    self._fn = fn
+                    break
+            else:
+                self._fn = _stub_callable(self.__name__)
+        return self._fn
+
+    def __call__(self, params: dict) -> dict:
+        return self.load()(params)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._fn is not None else "not loaded"
+        return f"<callable {self.__name__} ({state})>"
+
+
+class _EntryPointCallable:
+    """Registry entry for a plugin entry point, loaded on first call."""
+
+    __slots__ = ("__name__", "_entry_point", "_fn")
+
+    def __init__(self, entry_point):
+        self.__name__ = entry_point.name
+        self._entry_point = entry_point
+        self._fn: CallableFn | None = None
 
-    External callables are top-level packages (injest, canonizer, etc.).
-    Internal callables live in lorchestra.callable.* and are registered
-    under their short name (e.g., "view_creator").
+    def load(self) -> CallableFn:
+        """Load the entry point (once); a module target uses its execute()."""
+        if self._fn is None:
+            target = self._entry_point.load()
+            fn = getattr(target, "execute", target)
+            if not callable(fn):
+                raise TypeError(
+                    f"Entry point '{self.__name__}' ({self._entry_point.value}) is not callable"
+                )
+            self._fn = fn
+        return self._fn
+
+    def __call__(self, params: dict) -> dict:
+        return self.load()(params)
+
+
+def _get_callables() -> dict[str, CallableFn]:
     """
-    # External packages (top-level imports)
-    external = [
-        "injest",
-        "canonizer",
-        "finalform",
-        "projectionist",
-        "workman",
-        "inferometer",
-    ]
-    # Internal callables (lorchestra.callable.*)
-    internal = [
-        "view_creator",
-        "molt_projector",
-        "bq_reader",
-        "file_renderer",
-        "egret_builder",
-        "render",
-        "inferometer_adapter",
-    ]
-
-    callables: dict[str, CallableFn] = {}
-
-    for name in external:
-        fn = _try_import_callable(name)
-        if fn is not None:
-            callables[name] = fn
-        else:
-            callables[name] = _stub_callable(name)
-
-    for name in internal:
-        fn = _try_import_callable(f"lorchestra.callable.{name}")
-        if fn is not None:
-            callables[name] = fn
-        else:
-            callables[name] = _stub_callable(name)
-
-    # Aliases: map friendly names to internal callable modules
-    # "egret" -> egret_builder (for use in job definitions as callable: egret)
-    if "egret_builder" in callables:
-        callables["egret"] = callables["egret_builder"]
-    
-    # "inferometer" can be used from either the external package or internal adapter
-    # Prefer internal adapter if available (more flexible for lorchestra integration)
-    if "inferometer_adapter" in callables and callables["inferometer_adapter"].__name__ != "stub":
-        callables["inferometer"] = callables["inferometer_adapter"]
-
-    return callables
+    Build the callable registry without importing any callable module.
+
+    Each name maps to a lazy entry that imports its module on first call.
+    """
+    return {name: _LazyCallable(name, modules) for name, modules in CALLABLE_MODULES.items()}
 
 
 def _stub_callable(name: str) -> CallableFn:
@@ -114,6 +166,9 @@ def _stub_callable(name: str) -> CallableFn:
 # Lazy-initialized callable registry
 _CALLABLES: dict[str, CallableFn] | None = None
 
+# Plugin entry points by name (scanned once, on first unknown name)
+_PLUGINS: dict[str, CallableFn] | None = None
+
 
 def get_callables() -> dict[str, CallableFn]:
     """Get the callable registry, initializing if needed."""
@@ -123,6 +178,25 @@ def get_callables() -> dict[str, CallableFn]:
     return _CALLABLES
 
 
+def discover_plugins() -> dict[str, CallableFn]:
+    """
+    Get plugin callables from installed `lorchestra.callables` entry points.
+
+    Entry points are listed once (no plugin module is imported until its
+    name is dispatched).
+
+    Returns:
+        Dict of plugin name -> lazy callable
+    """
+    global _PLUGINS
+    if _PLUGINS is None:
+        _PLUGINS = {
+            ep.name: _EntryPointCallable(ep)
+            for ep in entry_points(group=ENTRY_POINT_GROUP)
+        }
+    return _PLUGINS
+
+
 def dispatch_callable(name: str, params: dict) -> CallableResult:
     """
     Dispatch to in-proc callable by name and return CallableResult.
@@ -148,7 +222,11 @@ def dispatch_callable(name: str, params: dict) -> CallableResult:
     fn = callables.get(name)
 
     if fn is None:
-        raise ValueError(f"Unknown callable: {name}")
+        # Not built in: look for a plugin entry point and keep it registered
+        fn = discover_plugins().get(name)
+        if fn is None:
+            raise ValueError(f"Unknown callable: {name}")
+        callables[name] = fn
 
     # Invoke callable - exceptions propagate unchanged
     result_dict = fn(params)
@@ -11,14 +11,34 @@ Params:
     path_template: str — Python format string for file path (e.g., "{client_folder}/contact.md")
     content_template: str — Python format string for file content body
     front_matter: dict (optional) — YAML front matter template (values are format strings)
+    manifest_path: str (optional) — JSON manifest of rendered files for
+        incremental projection (see below)
+    allow_empty: bool (optional) — let a query that returns no rows delete
+        every file in the manifest
 
 Returns:
     CallableResult with items=[{"path": "/full/path.md", "content": "---\\n...\\n---\\n\\nbody"}]
+
+Incremental projection (manifest_path set):
+    The manifest maps each rendered path to the hash of its content (rendered
+    with a fixed `_projected_at`, so the timestamp alone never changes a
+    file) and the time it was rendered. A row is only emitted when its hash
+    changed, or when its file is missing or older than the manifest entry (a
+    previous write that never landed). Paths in the manifest that no query
+    row renders any more are emitted as {"path": ..., "delete": true,
+    "base_path": ...} items until the file is gone. Only paths under base_path
+    are deleted, and a query returning no rows (e.g. an emptied table)
+    deletes nothing unless allow_empty is set. Stats report skipped
+    (unchanged) and deleted.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import sqlite3
+import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -39,9 +59,12 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             - path_template: str — format string for file path
             - content_template: str — format string for file body
             - front_matter: dict (optional) — front matter template
+            - manifest_path: str (optional) — manifest for incremental projection
+            - allow_empty: bool (optional) — let an empty query delete every file
 
     Returns:
-        CallableResult dict with one item per rendered file
+        CallableResult dict with one item per rendered file (with a
+        manifest: per changed file, plus deletions)
 
     Raises:
         ValueError: If required params are missing
@@ -52,6 +75,7 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
     path_template = params.get("path_template")
     content_template = params.get("content_template")
     front_matter_spec = params.get("front_matter")
+    manifest_path_str = params.get("manifest_path")
 
     missing = [
         k for k, v in [
@@ -67,30 +91,16 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
 
     sqlite_path = Path(sqlite_path_str).expanduser()
     base_path = Path(base_path_str).expanduser()
-
-    # Query SQLite
-    conn = sqlite3.connect(sqlite_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        cursor = conn.execute(query)
-        rows = [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
-
-    if not rows:
-        result = CallableResult(
-            items=[],
-            stats={"input": 0, "output": 0, "skipped": 0, "errors": 0},
-        )
-        return result.to_dict()
+    manifest_path = Path(manifest_path_str).expanduser() if manifest_path_str else None
+    manifest = _load_manifest(manifest_path) if manifest_path else None
 
     # Capture projection timestamp
     projected_at = datetime.now(timezone.utc).isoformat()
+    rendered_at = datetime.now(timezone.utc).timestamp()
 
-    # Render one file.write item per row
-    items = []
-    for row in rows:
-        row_with_meta = {**row, "_projected_at": projected_at}
+    def _render(row: dict, projected: str) -> tuple[str, str]:
+        """Render a row's file path and content."""
+        row_with_meta = {**row, "_projected_at": projected}
 
         # Build file path
         file_path = str(base_path / path_template.format(**row_with_meta))
@@ -110,19 +120,94 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             front_matter_yaml = yaml.safe_dump(
                 resolved, sort_keys=False, allow_unicode=True
             )
-            content = f"---\n{front_matter_yaml}---\n\n{content_body}"
-        else:
-            content = content_body
-
-        items.append({"path": file_path, "content": content})
-
-    result = CallableResult(
-        items=items,
-        stats={
-            "input": len(rows),
-            "output": len(items),
-            "skipped": 0,
-            "errors": 0,
-        },
-    )
+            return file_path, f"---\n{front_matter_yaml}---\n\n{content_body}"
+        return file_path, content_body
+
+    # Query SQLite, rendering rows as they stream from the cursor
+    items = []
+    input_count = 0
+    skipped = 0
+    rendered: dict[str, list] = {}
+    conn = sqlite3.connect(sqlite_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(query):
+            input_count += 1
+            row = dict(row)
+
+            if manifest is None:
+                file_path, content = _render(row, projected_at)
+                items.append({"path": file_path, "content": content})
+                continue
+
+            # Hash the content without the volatile projection timestamp
+            file_path, stable = _render(row, "")
+            digest = hashlib.sha256(stable.encode("utf-8")).hexdigest()
+            entry = manifest.get(file_path)
+            if entry and entry[0] == digest and _landed(file_path, entry[1]):
+                rendered[file_path] = entry
+                skipped += 1
+                continue
+            _, content = _render(row, projected_at)
+            items.append({"path": file_path, "content": content})
+            rendered[file_path] = [digest, rendered_at]
+    finally:
+        conn.close()
+
+    deleted = 0
+    if manifest is not None:
+        if input_count == 0 and not params.get("allow_empty"):
+            # No rows at all is more likely an emptied table than every row
+            # gone: delete nothing, and keep the manifest for the next run
+            rendered = dict(manifest)
+        # Files no row renders any more: delete, forgetting them once gone
+        for file_path in manifest:
+            if (
+                file_path not in rendered
+                and Path(file_path).resolve().is_relative_to(base_path.resolve())
+                and Path(file_path).exists()
+            ):
+                items.append({"path": file_path, "delete": True, "base_path": str(base_path)})
+                rendered[file_path] = manifest[file_path]
+                deleted += 1
+        _save_manifest(manifest_path, rendered)
+
+    stats = {
+        "input": input_count,
+        "output": len(items),
+        "skipped": skipped,
+        "errors": 0,
+    }
+    if manifest is not None:
+        stats["deleted"] = deleted
+    result = CallableResult(items=items, stats=stats)
     return result.to_dict()
+
+
+def _landed(file_path: str, rendered_at: float) -> bool:
+    """True if the file exists and was written no earlier than it was rendered."""
+    try:
+        return os.stat(file_path).st_mtime >= rendered_at
+    except OSError:
+        return False
+
+
+def _load_manifest(path: Path) -> dict[str, list]:
+    """Load a render manifest ({path: [content_hash, rendered_at]}); empty if none."""
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f).get("files", {})
+
+
+def _save_manifest(path: Path, files: dict[str, list]) -> None:
+    """Atomically replace a render manifest."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"files": files}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
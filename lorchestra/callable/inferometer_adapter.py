@@ -3,11 +3,44 @@ inferometer_adapter callable — Execute LLM inference via inferometer.
 
 This callable bridges lorchestra's dict-based callable protocol with
 inferometer's PromptPlan execution model.
+
+Results are cached in the inference cache (see lorchestra.inference_cache),
+keyed by model, prompt hash (step templates and inputs) and config hash, so
+re-running a plan that already succeeded does not call the model again.
+Set `cache: false` to bypass the cache, or `cache: {ttl_seconds: N}` to
+accept only entries younger than N seconds. stats.cache_hit reports a hit.
+
+Calls to inferometer go through the model's rate limiter (see
+lorchestra.rate_limiter), so transient failures back off every caller of
+the model.
+
+Batch mode: with `items:`, one plan is built per item and the plans run
+concurrently (up to `max_concurrency`, within the model's rate limits).
+Each item's fields are added to the inputs of every prompt step, so one
+step covers a whole list of sessions:
+
+    - step_id: extract_evidence
+      op: call
+      params:
+        callable: inferometer
+        model: claude-3-5-sonnet
+        prompt_template: "Extract evidence: {transcript}"
+        items: '@run.peek.items'       # each item supplies transcript, ...
+        key_field: session_id          # copied to each result as "key"
+        max_concurrency: 8
+
+The result has one item per input, in input order, with its "index" (and
+"key"). An input whose plan fails gets {"index", "error", "error_type"}
+instead of an inference result, without failing the others; the step only
+fails if every input does.
 """
 
+import json
 from typing import Any
 
 from lorchestra.errors import PermanentError, TransientError
+from lorchestra.inference_cache import InferenceCache, cache_options, get_inference_cache, sha256_json
+from lorchestra.rate_limiter import LLMCall, dispatch_concurrent, estimate_tokens, get_limiter
 
 
 MAX_TOKENS_CEILING = 100000
@@ -22,14 +55,19 @@ _PARAM_KEYS = {
     "inputs",
     "steps",
     "plan",
+    "cache",
+    "items",
+    "key_field",
+    "max_concurrency",
 }
 
+_TRANSIENT_PHRASES = ("rate_limit", "rate limit", "quota", "unavailable", "capacity", "overloaded")
 
-def execute(params: dict[str, Any]) -> dict[str, Any]:
-    """Execute LLM analysis via inferometer."""
+
+def _import_inferometer():
     try:
         import inferometer
-        from inferometer import (
+        from inferometer import (  # noqa: F401 - checked here, used through the module
             PermanentError as InferometerPermanentError,
             PromptPlan,
             PromptStep,
@@ -37,7 +75,24 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
         )
     except ImportError as e:
         raise PermanentError(f"inferometer not installed: {e}") from e
+    return inferometer
+
+
+def _build_plan(
+    inferometer: Any,
+    params: dict[str, Any],
+    item: dict[str, Any] | None = None,
+) -> tuple[Any, dict[str, Any], list[dict]]:
+    """
+    Build the PromptPlan for params (and a batch item's inputs).
+
+    Returns:
+        (plan, config, step_specs) where step_specs are the step dicts the
+        plan was built from (hashed for the cache key)
 
+    Raises:
+        PermanentError: If the params do not describe a valid plan
+    """
     model = params.get("model")
     prompt_template = params.get("prompt_template")
     transcript = params.get("transcript")
@@ -65,6 +120,11 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
         if key not in _PARAM_KEYS:
             config_overrides[key] = value
 
+    def _with_item(step: dict) -> dict:
+        if item is None:
+            return step
+        return {**step, "inputs": {**(step.get("inputs") or {}), **item}}
+
     try:
         if plan_param is not None:
             if not isinstance(plan_param, dict):
@@ -87,11 +147,11 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             if not isinstance(plan_steps, list) or not plan_steps:
                 raise PermanentError("plan.steps must be a non-empty list")
 
-            steps = []
+            step_specs = []
             for s in plan_steps:
                 if not isinstance(s, dict):
                     raise PermanentError("plan.steps items must be dicts")
-                steps.append(PromptStep(**s))
+                step_specs.append(_with_item(s))
 
         elif steps_param is not None:
             if not isinstance(steps_param, list) or not steps_param:
@@ -102,16 +162,16 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             plan_model = model
             config = dict(config_overrides)
 
-            steps = []
+            step_specs = []
             for s in steps_param:
                 if not isinstance(s, dict):
                     raise PermanentError("steps items must be dicts")
-                steps.append(PromptStep(**s))
+                step_specs.append(_with_item(s))
 
         else:
             if not model or not prompt_template:
                 raise PermanentError("Required params missing: model, prompt_template")
-            if transcript is None and inputs_param is None:
+            if transcript is None and inputs_param is None and item is None:
                 raise PermanentError("Required params missing: transcript or inputs")
 
             plan_model = model
@@ -120,17 +180,17 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             inputs: dict[str, str] = {}
             if inputs_param is not None:
                 inputs.update(inputs_param)
+            if item is not None:
+                inputs.update(item)
             if transcript is not None:
                 inputs.setdefault("transcript", transcript)
 
-            steps = [
-                PromptStep(
-                    step_id=step_id,
-                    prompt_template=prompt_template,
-                    inputs=inputs,
-                )
+            step_specs = [
+                {"step_id": step_id, "prompt_template": prompt_template, "inputs": inputs}
             ]
 
+        steps = [inferometer.PromptStep(**s) for s in step_specs]
+
         # temperature: params overrides config; config overrides default
         if "temperature" in params:
             config["temperature"] = params.get("temperature")
@@ -147,25 +207,35 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
             raise PermanentError(f"max_tokens {max_tokens} exceeds ceiling of {MAX_TOKENS_CEILING}")
         config["max_tokens"] = max_tokens
 
-        plan = PromptPlan(model=plan_model, config=config, steps=steps)
+        plan = inferometer.PromptPlan(model=plan_model, config=config, steps=steps)
 
     except PermanentError:
         raise
     except Exception as e:
         raise PermanentError(f"Invalid inference plan: {e}") from e
 
-    try:
-        result = inferometer.execute(plan)
-    except InferometerTransientError as e:
-        raise TransientError(f"Inference transient failure: {e}") from e
-    except InferometerPermanentError as e:
-        raise PermanentError(f"Inference failed: {e}") from e
-    except Exception as e:
-        error_str = str(e).lower()
-        if any(phrase in error_str for phrase in ("rate_limit", "rate limit", "quota", "unavailable", "capacity", "overloaded")):
-            raise TransientError(f"Inference transient failure: {e}") from e
-        raise PermanentError(f"Inference failed: {e}") from e
+    return plan, config, step_specs
+
 
+def _plan_runner(inferometer: Any, plan: Any):
+    """Function executing a plan, mapping its failures to lorchestra errors."""
+    def run():
+        try:
+            return inferometer.execute(plan)
+        except inferometer.TransientError as e:
+            raise TransientError(f"Inference transient failure: {e}") from e
+        except inferometer.PermanentError as e:
+            raise PermanentError(f"Inference failed: {e}") from e
+        except Exception as e:
+            error_str = str(e).lower()
+            if any(phrase in error_str for phrase in _TRANSIENT_PHRASES):
+                raise TransientError(f"Inference transient failure: {e}") from e
+            raise PermanentError(f"Inference failed: {e}") from e
+    return run
+
+
+def _result_item(result: Any, plan: Any, config: dict[str, Any]) -> dict[str, Any]:
+    """Normalize an inferometer result into an output item."""
     item: dict[str, Any] = {
         "prompt_hash": result.prompt_hash,
         "output_hash": result.output_hash,
@@ -185,5 +255,139 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
         item["output"] = result.output
     if getattr(result, "output_ref", None) is not None:
         item["output_ref"] = result.output_ref
+    return item
+
+
+def _cache_key(plan: Any, config: dict[str, Any], step_specs: list[dict]) -> str:
+    return InferenceCache.make_key(plan.model, sha256_json(step_specs), sha256_json(config))
 
-    return {"items": [item], "stats": {"steps_count": len(result.steps)}}
+
+def execute(params: dict[str, Any]) -> dict[str, Any]:
+    """Execute LLM analysis via inferometer."""
+    inferometer = _import_inferometer()
+
+    try:
+        cache_enabled, cache_ttl = cache_options(params.get("cache"))
+    except ValueError as e:
+        raise PermanentError(str(e)) from e
+    cache = get_inference_cache() if cache_enabled else None
+
+    if params.get("items") is not None:
+        return _execute_batch(inferometer, params, cache, cache_ttl)
+
+    plan, config, step_specs = _build_plan(inferometer, params)
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _cache_key(plan, config, step_specs)
+        cached = cache.get(cache_key, ttl_seconds=cache_ttl)
+        if cached is not None:
+            return {"items": [cached["item"]], "stats": {**cached["stats"], "cache_hit": True}}
+
+    result = get_limiter(plan.model).call(
+        _plan_runner(inferometer, plan),
+        tokens=estimate_tokens(json.dumps(step_specs, default=str)),
+    )
+    item = _result_item(result, plan, config)
+
+    stats = {"steps_count": len(result.steps)}
+    if cache_key is not None:
+        cache.put(cache_key, {"item": item, "stats": stats}, model=plan.model)
+    return {"items": [item], "stats": {**stats, "cache_hit": False}}
+
+
+def _execute_batch(
+    inferometer: Any,
+    params: dict[str, Any],
+    cache: InferenceCache | None,
+    cache_ttl: float | None,
+) -> dict[str, Any]:
+    """Run one plan per entry of params["items"] concurrently (see module docstring)."""
+    items = params["items"]
+    if isinstance(items, (str, bytes, dict)):
+        raise PermanentError("items must be a list when provided")
+    key_field = params.get("key_field")
+    max_concurrency = params.get("max_concurrency")
+    if max_concurrency is not None:
+        try:
+            max_concurrency = int(max_concurrency)
+        except (TypeError, ValueError) as e:
+            raise PermanentError("max_concurrency must be an integer") from e
+        if max_concurrency < 1:
+            raise PermanentError(f"max_concurrency must be >= 1, got {max_concurrency}")
+    base_params = {k: v for k, v in params.items() if k != "items"}
+
+    entries: list[dict[str, Any] | None] = []
+    errors: list[BaseException] = []
+    cache_hits = 0
+    steps_count = 0
+    pending: list[tuple[int, Any, dict, str | None]] = []
+    calls: list[LLMCall] = []
+
+    def _fail(index: int, error: BaseException) -> None:
+        errors.append(error)
+        entries[index] = {
+            "index": index,
+            "error": str(error),
+            "error_type": "transient" if isinstance(error, TransientError) else "permanent",
+        }
+
+    for index, input_item in enumerate(items):
+        entries.append(None)
+        if not isinstance(input_item, dict):
+            _fail(index, PermanentError("items entries must be dicts"))
+            continue
+        try:
+            plan, config, step_specs = _build_plan(inferometer, base_params, input_item)
+        except PermanentError as e:
+            _fail(index, e)
+            continue
+
+        cache_key = None
+        if cache is not None:
+            cache_key = _cache_key(plan, config, step_specs)
+            cached = cache.get(cache_key, ttl_seconds=cache_ttl)
+            if cached is not None:
+                entries[index] = {"index": index, **cached["item"]}
+                cache_hits += 1
+                steps_count += cached["stats"]["steps_count"]
+                continue
+
+        pending.append((index, plan, config, cache_key))
+        calls.append(LLMCall(
+            plan.model,
+            _plan_runner(inferometer, plan),
+            tokens=estimate_tokens(json.dumps(step_specs, default=str)),
+        ))
+
+    outcomes = dispatch_concurrent(calls, max_concurrency=max_concurrency) if calls else []
+    for (index, plan, config, cache_key), outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            _fail(index, outcome)
+            continue
+        item = _result_item(outcome, plan, config)
+        steps_count += len(outcome.steps)
+        if cache_key is not None:
+            cache.put(cache_key, {"item": item, "stats": {"steps_count": len(outcome.steps)}}, model=plan.model)
+        entries[index] = {"index": index, **item}
+
+    if entries and len(errors) == len(entries):
+        # Nothing succeeded: fail the step (retryable if any input was transient)
+        raise next((e for e in errors if isinstance(e, TransientError)), errors[0])
+
+    if key_field:
+        for input_item, entry in zip(items, entries):
+            if isinstance(input_item, dict):
+                entry["key"] = input_item.get(key_field)
+
+    return {
+        "items": entries,
+        "stats": {
+            "items_count": len(entries),
+            "succeeded": len(entries) - len(errors),
+            "failed": len(errors),
+            "cache_hits": cache_hits,
+            "steps_count": steps_count,
+            "errors": [e["error"] for e in entries if "error" in e],
+        },
+    }
@@ -0,0 +1,273 @@
+"""
+Parallel callable execution - run a callable over chunks of items in a
+process pool.
+
+A `call` step with `parallel:` splits params["items"] into chunks and runs
+the callable on each chunk in a ProcessPoolExecutor, so CPU-bound callables
+(canonizer transforms, finalform scoring) use every core instead of the
+executor's single thread:
+
+    - step_id: canonize
+      op: call
+      params:
+        callable: canonizer
+        items: '@run.read.items'
+        parallel: true                 # or: {workers: 4, chunk_size: 500}
+
+Each worker process imports the callable once, when it starts. The chunk
+results are concatenated in input order and their stats merged (see
+merge_stats), giving the same CallableResult as a single call over all items.
+Inputs that fit in one chunk run in-process, without a pool.
+
+Transport (`transport:` option):
+
+- spill (default): the items are written once to an NDJSON spill file in
+  shared memory (see lorchestra.spill) and each worker is only sent its
+  byte range; it maps the file, parses its rows and writes its result items
+  to a spill file of its own. The workers' files are concatenated into the
+  step's spill file and returned as SpilledItems, so the results are never
+  parsed in the parent. Only params and stats are pickled. Items JSON cannot
+  represent fall back to pickle.
+  Spilled step outputs (items_ref) are handed to the workers as they are,
+  without being read or written again.
+- pickle: chunks and results are pickled through the pool's pipes.
+
+Callables must treat chunks independently: anything computed across all items
+(e.g. de-duplication) only sees its own chunk.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from lorchestra.callable.dispatch import CallableFn, discover_plugins, get_callables
+from lorchestra.callable.result import CallableResult
+from lorchestra.spill import SpilledItems, concat_spills, read_rows, spill_dir, write_rows
+
+
+# Smallest chunk a parallel step is split into (smaller inputs run in-process)
+MIN_CHUNK_SIZE = 50
+
+# Chunks per worker when chunk_size is not given (smooths uneven chunk costs)
+CHUNKS_PER_WORKER = 4
+
+# How items reach the workers: "spill" (shared-memory NDJSON) or "pickle"
+TRANSPORTS = ("spill", "pickle")
+
+# The callable loaded by this worker process (set by _init_worker)
+_WORKER_FN: CallableFn | None = None
+
+
+def parallel_options(spec: Any, n_items: int) -> tuple[int, int, str]:
+    """
+    Resolve a step's `parallel:` value to (workers, chunk_size, transport).
+
+    Args:
+        spec: true, a worker count, or {workers, chunk_size, transport}
+        n_items: Number of items to process
+
+    Returns:
+        (workers, chunk_size, transport)
+
+    Raises:
+        ValueError: If spec is not a valid parallel option
+    """
+    if spec is True:
+        spec = {}
+    elif isinstance(spec, int) and not isinstance(spec, bool):
+        spec = {"workers": spec}
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid parallel option: {spec!r}")
+
+    workers = spec.get("workers")
+    workers = int(workers) if workers is not None else (os.cpu_count() or 1)
+    if workers < 1:
+        raise ValueError(f"parallel.workers must be >= 1, got {workers}")
+    chunk_size = spec.get("chunk_size")
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, math.ceil(n_items / (workers * CHUNKS_PER_WORKER)))
+    chunk_size = int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError(f"parallel.chunk_size must be >= 1, got {chunk_size}")
+    transport = spec.get("transport", "spill")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"parallel.transport must be one of {TRANSPORTS}, got {transport!r}")
+    return workers, chunk_size, transport
+
+
+def merge_stats(stats_list: list[dict]) -> dict:
+    """
+    Merge the stats of chunk results, in order.
+
+    Numbers are summed, lists concatenated and dicts merged recursively;
+    for any other value the last chunk's wins.
+    """
+    merged: dict = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            current = merged.get(key)
+            if key not in merged:
+                merged[key] = value
+            elif (isinstance(value, (int, float)) and isinstance(current, (int, float))
+                  and not isinstance(value, bool) and not isinstance(current, bool)):
+                merged[key] = current + value
+            elif isinstance(value, list) and isinstance(current, list):
+                merged[key] = current + value
+            elif isinstance(value, dict) and isinstance(current, dict):
+                merged[key] = merge_stats([current, value])
+            else:
+                merged[key] = value
+    return merged
+
+
+def _resolve(name: str) -> CallableFn:
+    """Look up a callable (built-in or plugin) and import it."""
+    fn = get_callables().get(name) or discover_plugins().get(name)
+    if fn is None:
+        raise ValueError(f"Unknown callable: {name}")
+    return fn.load() if hasattr(fn, "load") else fn
+
+
+def _init_worker(name: str) -> None:
+    """Pool initializer: import the callable once per worker process."""
+    global _WORKER_FN
+    _WORKER_FN = _resolve(name)
+
+
+def _run_chunk(params: dict) -> dict:
+    """Run the worker's callable on one chunk."""
+    return _WORKER_FN(params)
+
+
+def _run_spilled_chunk(task: dict) -> dict:
+    """
+    Run the worker's callable on the rows in a byte range of the input spill.
+
+    Result items are written to task["out"] and replaced by "items_path".
+    """
+    items = list(read_rows(Path(task["path"]), task["start"], task["end"]))
+    result = _WORKER_FN({**task["params"], "items": items})
+    if result.get("items") is not None:
+        write_rows(result.pop("items"), Path(task["out"]))
+        result["items_path"] = task["out"]
+    return result
+
+
+def _inline_items_error(name: str) -> ValueError:
+    return ValueError(f"Callable '{name}' returned items_ref; parallel steps need inline items")
+
+
+def _map_spilled(
+    pool: ProcessPoolExecutor,
+    name: str,
+    params: dict,
+    items: list,
+    chunk_size: int,
+    out_path: Path | None,
+) -> tuple[list[dict], SpilledItems] | None:
+    """
+    Run chunks through spill files; None if the items cannot be spilled.
+
+    Returns:
+        The chunk results (without items), and their items concatenated in
+        order into out_path (default: a new file in spill_dir())
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="lorchestra-parallel-", dir=spill_dir()))
+    try:
+        if isinstance(items, SpilledItems):
+            path, offsets = items.path, items.offsets
+        else:
+            path = work_dir / "items.ndjson"
+            try:
+                offsets = write_rows(items, path)
+            except TypeError:
+                return None
+        tasks = [
+            {
+                "params": params,
+                "path": str(path),
+                "start": offsets[i],
+                "end": offsets[min(i + chunk_size, len(items))],
+                "out": str(work_dir / f"out_{i // chunk_size}.ndjson"),
+            }
+            for i in range(0, len(items), chunk_size)
+        ]
+        results = list(pool.map(_run_spilled_chunk, tasks))
+        if any("items_path" not in result for result in results):
+            raise _inline_items_error(name)
+        if out_path is None:
+            fd, tmp = tempfile.mkstemp(prefix="lorchestra-parallel-", suffix=".ndjson", dir=spill_dir())
+            os.close(fd)
+            out_path = Path(tmp)
+        return results, concat_spills([Path(r.pop("items_path")) for r in results], out_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_parallel(name: str, params: dict, parallel: Any, spill_path: Path | None = None) -> CallableResult:
+    """
+    Run a callable over params["items"] in chunks on a process pool.
+
+    Args:
+        name: Callable name (as for dispatch_callable)
+        params: Callable params; params["items"] is split into chunks and
+            every other param is passed to each chunk unchanged
+        parallel: The step's `parallel:` option (see parallel_options)
+        spill_path: File for the result items of the spill transport
+            (default: a new file in spill_dir(), owned by the caller)
+
+    Returns:
+        CallableResult with the chunks' items concatenated in order (as
+        SpilledItems with the spill transport) and their stats merged
+
+    Raises:
+        ValueError: If the callable is unknown, parallel is invalid, or a
+            chunk returns items_ref
+        TransientError/PermanentError: Propagated from the callable
+    """
+    items = params.get("items") or []
+    if not isinstance(items, SpilledItems):
+        items = list(items)
+    workers, chunk_size, transport = parallel_options(parallel, len(items))
+    n_chunks = math.ceil(len(items) / chunk_size)
+
+    if n_chunks <= 1 or workers == 1:
+        fn = _resolve(name)
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = [fn({**params, "items": chunk}) for chunk in chunks or [[]]]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, n_chunks),
+            initializer=_init_worker,
+            initargs=(name,),
+        ) as pool:
+            # map() yields in submission order, so items stay in input order
+            if transport == "spill":
+                other_params = {k: v for k, v in params.items() if k != "items"}
+                spilled = _map_spilled(pool, name, other_params, items, chunk_size, spill_path)
+                if spilled is not None:
+                    results, spilled_items = spilled
+                    return CallableResult(
+                        schema_version=results[0].get("schema_version", "1.0"),
+                        items=spilled_items,
+                        stats=merge_stats([r.get("stats") or {} for r in results]),
+                    )
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+            results = list(pool.map(_run_chunk, [{**params, "items": c} for c in chunks]))
+
+    merged_items: list[dict] = []
+    chunk_results = [CallableResult(**r) for r in results]
+    for result in chunk_results:
+        if result.items is None:
+            raise _inline_items_error(name)
+        merged_items.extend(result.items)
+
+    return CallableResult(
+        schema_version=chunk_results[0].schema_version,
+        items=merged_items,
+        stats=merge_stats([r.stats for r in chunk_results]),
+    )
@@ -23,11 +23,29 @@ Template format:
 
 For batch mode, pass items=[{to, template_vars, idempotency_key}] and
 receive items=[{to, subject, body, is_html, idempotency_key}].
+
+Compiled templates are cached per process, keyed by the SHA256 of their
+source, with least-recently-used eviction beyond MAX_CACHED_TEMPLATES.
+Repeated renders of the same template (every job run in the daemon, every
+chunk of a parallel batch) compile it once. Large batches are rendered in
+parallel by the step's `parallel:` option (see lorchestra.callable.parallel);
+each pool worker compiles the template once and renders its chunk.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Any
 
 
+# Compiled templates kept per process (least recently used evicted beyond)
+MAX_CACHED_TEMPLATES = 128
+
+_ENV: Any = None
+_TEMPLATES: "OrderedDict[str, Any]" = OrderedDict()
+_TEMPLATES_LOCK = threading.Lock()
+
+
 def execute(params: dict[str, Any]) -> dict[str, Any]:
     """
     Render email template(s) via Jinja2.
@@ -44,15 +62,10 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
         Single mode: {schema_version, items, stats}
         Batch mode: {schema_version, items: [{to, subject, body, is_html, idempotency_key}], stats}
     """
-    from jinja2 import Environment, select_autoescape
-
-    template_content = params["template"]
-
-    env = Environment(autoescape=select_autoescape(["html", "htm"]))
-    template = env.from_string(template_content)
+    template = _compile(params["template"])
 
     items = params.get("items")
-    if items:
+    if items is not None:
         # Batch mode
         results = []
         for item in items:
@@ -79,6 +92,34 @@ def execute(params: dict[str, Any]) -> dict[str, Any]:
         }
 
 
+def _compile(template_content: str) -> Any:
+    """
+    Get the compiled template for a source, compiling it on first use.
+
+    Args:
+        template_content: Jinja2 template source
+
+    Returns:
+        Jinja2 template object (shared; templates are safe to render concurrently)
+    """
+    global _ENV
+    key = hashlib.sha256(template_content.encode("utf-8")).hexdigest()
+    with _TEMPLATES_LOCK:
+        template = _TEMPLATES.get(key)
+        if template is not None:
+            _TEMPLATES.move_to_end(key)
+            return template
+        if _ENV is None:
+            from jinja2 import Environment, select_autoescape
+
+            _ENV = Environment(autoescape=select_autoescape(["html", "htm"]))
+        template = _ENV.from_string(template_content)
+        _TEMPLATES[key] = template
+        if len(_TEMPLATES) > MAX_CACHED_TEMPLATES:
+            _TEMPLATES.popitem(last=False)
+        return template
+
+
 def _render_single(template: Any, template_vars: dict[str, Any]) -> dict[str, Any]:
     """
     Render a single template with the given variables.
@@ -16,6 +16,7 @@ Schema (from epic):
 Rule: Exactly one of `items` or `items_ref` must be set.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -30,12 +31,13 @@ class CallableResult:
 
     Attributes:
         schema_version: Schema version for forward compatibility
-        items: Inline items (mutually exclusive with items_ref)
+        items: Inline items, a list or SpilledItems (mutually exclusive with
+            items_ref)
         items_ref: Reference to items artifact (mutually exclusive with items)
         stats: Optional statistics from the callable execution
     """
     schema_version: str = "1.0"
-    items: list[dict] | None = None
+    items: Sequence[dict] | None = None
     items_ref: str | None = None
     stats: dict = field(default_factory=dict)
 
@@ -588,6 +588,7 @@ def run_cmd(ctx, job_id: str, ctx_json: str, payload_json: str, envelope_json: s
     """
     import json
     from lorchestra.executor import execute
+    from lorchestra.locks import target_lock
     from lorchestra.run_store import FileRunStore
 
     # Validate flag combinations
@@ -661,7 +662,8 @@ def run_cmd(ctx, job_id: str, ctx_json: str, payload_json: str, envelope_json: s
             click.echo("=== DRY RUN MODE === (no-op backends)")
             click.echo()
 
-        result = execute(envelope)
+        with target_lock(job_id):
+            result = execute(envelope)
 
         # Display results
         click.echo(f"Run ID: {result.run_id}")
@@ -853,5 +855,213 @@ def status_cmd(run_id: str, store_dir: str):
         click.echo(f"  Steps:    {len(attempt.step_outcomes)}")
 
 
+@main.command("prune-spill")
+@click.option("--store-dir", type=click.Path(exists=True), help="Run artifacts directory")
+@click.option("--older-than-hours", type=float, default=24, show_default=True,
+              help="Prune runs whose newest spill file is older than this")
+def prune_spill_cmd(store_dir: str = None, older_than_hours: float = 24):
+    """Delete the spill files of finished runs.
+
+    Step outputs above the spill threshold are written to the run store's
+    spill/ directory. Every run already prunes spill files older than a day;
+    this prunes on demand.
+
+    Example:
+
+        lorchestra prune-spill --older-than-hours 0
+    """
+    from lorchestra.run_store import FileRunStore, get_default_store
+
+    store = FileRunStore(Path(store_dir)) if store_dir else get_default_store()
+    pruned = store.prune_spill(older_than_hours * 3600)
+    click.echo(f"Pruned spill files of {len(pruned)} run(s)")
+
+
+@main.command("serve")
+@click.option("--socket", "socket_path", type=click.Path(), default=None,
+              help="Unix socket to listen on (default: ~/.local/lorchestra/lorchestra.sock)")
+@click.option("--queue-size", type=int, default=None, help="Requests allowed to wait (default: 16)")
+@click.option("--store-dir", type=click.Path(), help="Directory for run artifacts")
+@click.option("--preload", multiple=True, help="Callable to import at startup (repeatable)")
+def serve_cmd(socket_path: str = None, queue_size: int = None, store_dir: str = None,
+              preload: tuple = ()):
+    """Run a worker daemon that keeps definitions and clients warm.
+
+    Jobs and pipelines sent with `lorchestra submit` run in this process,
+    one at a time, without paying the cold start of a new process.
+
+    Examples:
+
+        lorchestra serve
+
+        lorchestra serve --preload canonizer --preload projectionist
+    """
+    import logging
+    from lorchestra.daemon import DEFAULT_QUEUE_SIZE, DEFAULT_SOCKET_PATH, DaemonError, serve
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    path = Path(socket_path) if socket_path else DEFAULT_SOCKET_PATH
+    click.echo(f"Listening on {path}")
+    try:
+        serve(
+            socket_path=path,
+            definitions_dir=DEFINITIONS_DIR,
+            store_dir=Path(store_dir) if store_dir else None,
+            queue_size=queue_size or DEFAULT_QUEUE_SIZE,
+            preload=preload,
+        )
+    except (DaemonError, ValueError) as e:
+        click.echo(f"Cannot start daemon: {e}", err=True)
+        raise SystemExit(1)
+
+
+@main.command("submit")
+@click.argument("job_id")
+@click.option("--pipeline", "is_pipeline", is_flag=True, help="JOB_ID is a pipeline (e.g. pipeline.formation)")
+@click.option("--ctx", "ctx_json", default="{}", help="Context JSON for @ctx.* resolution")
+@click.option("--payload", "payload_json", default="{}", help="Payload JSON for @payload.* resolution")
+@click.option("--smoke-namespace", type=str, default=None, help="Smoke test namespace")
+@click.option("--no-wait", is_flag=True, help="Return once queued instead of waiting for the result")
+@click.option("--socket", "socket_path", type=click.Path(), default=None, help="Daemon socket")
+def submit_cmd(job_id: str, is_pipeline: bool, ctx_json: str, payload_json: str,
+               smoke_namespace: str = None, no_wait: bool = False, socket_path: str = None):
+    """Send a job or pipeline to a running `lorchestra serve` daemon.
+
+    Examples:
+
+        lorchestra submit proj_sheets_clients
+
+        lorchestra submit pipeline.formation --pipeline
+
+        lorchestra submit pipeline.daily_all --pipeline --no-wait
+    """
+    import json
+    from lorchestra.daemon import DaemonError, submit
+
+    try:
+        compile_ctx = json.loads(ctx_json)
+        payload = json.loads(payload_json)
+    except json.JSONDecodeError as e:
+        click.echo(f"Invalid --ctx/--payload JSON: {e}", err=True)
+        raise SystemExit(1)
+
+    # Pipelines have no @ctx.* of their own; their jobs only see --payload
+    if is_pipeline and compile_ctx:
+        raise click.UsageError("--ctx cannot be used with --pipeline (use --payload)")
+
+    if is_pipeline:
+        request = {"op": "run_pipeline", "pipeline_id": job_id, "smoke_namespace": smoke_namespace,
+                   "payload": payload or None}
+    else:
+        envelope = {"job_id": job_id, "ctx": compile_ctx, "payload": payload}
+        if smoke_namespace:
+            envelope["smoke_namespace"] = smoke_namespace
+            envelope["limit"] = 10
+        request = {"op": "execute", "envelope": envelope}
+    request["wait"] = not no_wait
+
+    try:
+        result = submit(request, Path(socket_path) if socket_path else None)
+    except DaemonError as e:
+        click.echo(f"Submit failed: {e}", err=True)
+        raise SystemExit(1)
+
+    if no_wait:
+        click.echo(f"Queued {job_id} ({result['queued']} waiting)")
+        return
+
+    click.echo(json.dumps(result, indent=2, default=str))
+    if not result.get("success"):
+        raise SystemExit(1)
+
+
+@main.group("schedule")
+def schedule_group():
+    """Run pipelines and jobs on cron schedules (definitions/config/schedules.yaml)."""
+    pass
+
+
+def _make_scheduler(store_dir: str = None, via_daemon: bool = False, socket_path: str = None):
+    """Build a Scheduler running targets in-process or through a `lorchestra serve` daemon."""
+    from lorchestra.run_store import DEFAULT_RUN_PATH, FileRunStore
+    from lorchestra.scheduler import Scheduler, load_schedules
+
+    store_path = Path(store_dir) if store_dir else DEFAULT_RUN_PATH
+    try:
+        schedules = load_schedules(DEFINITIONS_DIR)
+    except ValueError as e:
+        click.echo(f"Invalid schedules: {e}", err=True)
+        raise SystemExit(1)
+
+    workers = []
+
+    def runner(request):
+        from lorchestra.daemon import Worker, submit
+
+        if via_daemon:
+            return submit(request, Path(socket_path) if socket_path else None)
+        if not workers:
+            # Warm state built on the first run, so `schedule list` stays cheap
+            workers.append(Worker(DEFINITIONS_DIR, store_path))
+        return workers[0].run(request)
+
+    return Scheduler(schedules, FileRunStore(store_path), runner)
+
+
+@schedule_group.command("list")
+@click.option("--store-dir", type=click.Path(), help="Directory for run artifacts")
+def schedule_list(store_dir: str = None):
+    """Show each schedule with its next and last run."""
+    scheduler = _make_scheduler(store_dir)
+    if not scheduler.schedules:
+        click.echo("No schedules defined.")
+        return
+    for state in scheduler.next_runs():
+        click.echo(f"{state['target']}  ({state['cron']})")
+        click.echo(f"  next run:  {state['next_run_at']}")
+        if state.get("last_run_at"):
+            click.echo(f"  last run:  {state['last_run_at']} [{state.get('last_status')}]")
+
+
+@schedule_group.command("run")
+@click.option("--once", is_flag=True, help="Run the schedules that are due, then exit")
+@click.option("--poll", "poll_seconds", type=float, default=30, help="Seconds between checks (default: 30)")
+@click.option("--store-dir", type=click.Path(), help="Directory for run artifacts")
+@click.option("--via-daemon", is_flag=True, help="Send runs to a `lorchestra serve` daemon")
+@click.option("--socket", "socket_path", type=click.Path(), default=None, help="Daemon socket")
+def schedule_run(once: bool, poll_seconds: float, store_dir: str = None,
+                 via_daemon: bool = False, socket_path: str = None):
+    """Run scheduled pipelines and jobs as they come due.
+
+    Missed ticks are coalesced into one run, a target never runs twice at
+    once, and each run is delayed by the schedule's jitter.
+
+    Examples:
+
+        lorchestra schedule run
+
+        lorchestra schedule run --via-daemon
+
+        lorchestra schedule run --once
+    """
+    import logging
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    scheduler = _make_scheduler(store_dir, via_daemon, socket_path)
+    if not scheduler.schedules:
+        click.echo("No schedules defined.")
+        return
+
+    if once:
+        for state in scheduler.tick():
+            click.echo(f"{state['target']}: {state['last_status']} (next run {state['next_run_at']})")
+        return
+
+    try:
+        scheduler.run_forever(poll_seconds)
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
     main()
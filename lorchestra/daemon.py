@@ -0,0 +1,397 @@
+"""
+Worker daemon - run jobs and pipelines in a long-lived, warm process.
+
+Every `lorchestra run` / `lorchestra pipeline` invocation pays for a cold
+start: config, job definitions, callable packages, canonizer transforms and
+storacle/BigQuery clients are loaded again before a (often short) job runs.
+`lorchestra serve` keeps one process with that state warm and accepts work
+over a local Unix socket; `lorchestra submit` sends it.
+
+Protocol: one JSON request per connection, one JSON line back.
+
+    {"op": "execute", "envelope": {"job_id": ..., "ctx": ..., "payload": ...}}
+    {"op": "run_pipeline", "pipeline_id": ..., "smoke_namespace": ..., "payload": ...}
+    {"op": "ping"}       # queue depth and pid
+    {"op": "reload"}     # drop cached job definitions
+
+execute/run_pipeline requests are queued (bounded: a full queue is rejected
+rather than growing without limit) and run one at a time by a single worker
+thread, since runs set process-wide state such as the smoke namespace. That
+state is reset after every request (see _isolated_run_mode), so a smoke run
+never leaks into the production runs queued after it. With `"wait": false`
+the reply is sent as soon as the request is queued. Each run holds its
+target's lock (see lorchestra.locks); a target already running elsewhere is
+skipped with {"success": false, "skipped": true}.
+
+Replies are {"ok": true, "result": {...}} or {"ok": false, "error": "..."}.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Default socket path, next to the run store: ~/.local/lorchestra/lorchestra.sock
+DEFAULT_SOCKET_PATH = Path.home() / ".local" / "lorchestra" / "lorchestra.sock"
+
+# Requests waiting to run before new ones are rejected
+DEFAULT_QUEUE_SIZE = 16
+
+# Largest request accepted (envelopes are small; payloads stay well below this)
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+_QUEUED_OPS = ("execute", "run_pipeline")
+
+# Environment variables runs set for their duration (see executor.execute)
+_RUN_ENV_VARS = ("STORACLE_SMOKE_NAMESPACE",)
+
+
+class DaemonError(Exception):
+    """A request could not be delivered to, or was rejected by, the daemon."""
+    pass
+
+
+@contextmanager
+def _isolated_run_mode() -> Iterator[None]:
+    """
+    Run with the default run mode, restoring process state afterwards.
+
+    execute() sets the smoke namespace globally (event_client run mode and
+    STORACLE_SMOKE_NAMESPACE) and never resets it, which is fine for a
+    one-shot CLI process but would route every later daemon request to the
+    smoke namespace.
+    """
+    from lorchestra.stack_clients.event_client import reset_run_mode
+
+    saved = {name: os.environ.get(name) for name in _RUN_ENV_VARS}
+    reset_run_mode()
+    try:
+        yield
+    finally:
+        reset_run_mode()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _execution_summary(result: Any) -> dict[str, Any]:
+    """JSON summary of an ExecutionResult."""
+    return {
+        "run_id": result.run_id,
+        "success": result.success,
+        "rows_read": result.rows_read,
+        "rows_written": result.rows_written,
+        "steps": [
+            {
+                "step_id": outcome.step_id,
+                "status": outcome.status.value,
+                "duration_ms": outcome.duration_ms,
+                "error": outcome.error,
+            }
+            for outcome in result.attempt.step_outcomes
+        ],
+    }
+
+
+class Worker:
+    """
+    Warm execution state plus the bounded queue and worker thread.
+
+    Holds the job registry, run store and watermark store used by every
+    request, and preloads config, the storacle client and the callables.
+    """
+
+    def __init__(
+        self,
+        definitions_dir: Optional[Path] = None,
+        store_dir: Optional[Path] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        preload: Iterable[str] = (),
+    ):
+        from lorchestra.pipeline import DEFINITIONS_DIR
+        from lorchestra.registry import JobRegistry
+        from lorchestra.run_store import DEFAULT_RUN_PATH, FileRunStore
+        from lorchestra.watermark_store import get_default_watermark_store
+
+        self.definitions_dir = Path(definitions_dir or DEFINITIONS_DIR)
+        self.registry = JobRegistry(self.definitions_dir)
+        self.store = FileRunStore(Path(store_dir) if store_dir else DEFAULT_RUN_PATH)
+        self.watermarks = get_default_watermark_store()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._running: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self.warm(preload)
+
+    def warm(self, preload: Iterable[str] = ()) -> None:
+        """
+        Load the state every run needs, so requests skip it.
+
+        Args:
+            preload: Callable names to import now (e.g. canonizer, injest)
+        """
+        from lorchestra.callable.dispatch import get_callables
+        import lorchestra.storacle.client  # noqa: F401 - plan submit boundary
+
+        try:
+            from lorchestra.config import load_config
+            load_config()
+        except Exception as e:
+            logger.warning(f"Config not loaded at startup: {e}")
+
+        try:
+            import storacle.rpc  # type: ignore  # noqa: F401
+        except ImportError:
+            pass
+
+        callables = get_callables()
+        for name in preload:
+            entry = callables.get(name)
+            if entry is None:
+                raise ValueError(f"Unknown callable to preload: {name}")
+            if hasattr(entry, "load"):
+                entry.load()
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread = threading.Thread(target=self._loop, name="lorchestra-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Let the queued requests finish, then stop the worker thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, request: dict) -> Future:
+        """
+        Queue an execute/run_pipeline request.
+
+        Raises:
+            DaemonError: If the queue is full
+        """
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((request, future))
+        except queue.Full:
+            raise DaemonError(f"Queue full ({self._queue.maxsize} requests waiting)")
+        return future
+
+    def status(self) -> dict[str, Any]:
+        """Current pid, queue depth and running request."""
+        return {
+            "pid": os.getpid(),
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "running": self._running,
+        }
+
+    def reload(self) -> None:
+        """Drop cached job definitions (picked up again on next load)."""
+        from lorchestra.registry import JobRegistry
+        self.registry = JobRegistry(self.definitions_dir)
+
+    def _loop(self) -> None:
+        while True:
+            work = self._queue.get()
+            if work is None:
+                return
+            request, future = work
+            if not future.set_running_or_notify_cancel():
+                continue
+            label = request.get("pipeline_id") or (request.get("envelope") or {}).get("job_id")
+            self._running = f"{request['op']}:{label}"
+            try:
+                future.set_result(self.run(request))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._running = None
+
+    def run(self, request: dict) -> dict[str, Any]:
+        """
+        Run one execute/run_pipeline request in this process.
+
+        Returns:
+            JSON summary of the run, or {"success": False, "skipped": True}
+            if the target is already running
+        """
+        from lorchestra.locks import LockHeld
+
+        try:
+            with _isolated_run_mode():
+                return self._run(request)
+        except LockHeld as e:
+            logger.warning(f"Skipped {request['op']}: {e}")
+            return {"success": False, "skipped": True, "error": str(e)}
+
+    def _run(self, request: dict) -> dict[str, Any]:
+        if request["op"] == "execute":
+            from lorchestra.executor import execute
+            from lorchestra.locks import target_lock
+
+            envelope = dict(request.get("envelope") or {})
+            if "job_id" not in envelope:
+                raise ValueError("execute request requires envelope.job_id")
+            envelope.setdefault("definitions_dir", self.definitions_dir)
+            envelope.setdefault("registry", self.registry)
+            envelope.setdefault("store", self.store)
+            envelope.setdefault("watermarks", self.watermarks)
+            with target_lock(envelope["job_id"]):
+                return _execution_summary(execute(envelope))
+
+        from lorchestra.pipeline import load_pipeline, run_pipeline
+
+        spec = load_pipeline(request["pipeline_id"], self.definitions_dir)
+        result = run_pipeline(
+            spec,
+            smoke_namespace=request.get("smoke_namespace"),
+            definitions_dir=self.definitions_dir,
+            payload=request.get("payload"),
+            watermarks=self.watermarks,
+            registry=self.registry,
+            store=self.store,
+        )
+        return result.to_dict()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request line and writes one JSON reply line."""
+
+    def handle(self) -> None:
+        worker: Worker = self.server.worker
+        try:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            request = json.loads(line)
+            op = request.get("op")
+            if op == "ping":
+                reply = {"ok": True, "result": worker.status()}
+            elif op == "reload":
+                worker.reload()
+                reply = {"ok": True, "result": worker.status()}
+            elif op in _QUEUED_OPS:
+                future = worker.submit(request)
+                if request.get("wait", True):
+                    reply = {"ok": True, "result": future.result()}
+                else:
+                    reply = {"ok": True, "result": {"queued": True, **worker.status()}}
+            else:
+                reply = {"ok": False, "error": f"Unknown op: {op!r}"}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server handing requests to a Worker."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, worker: Worker):
+        self.worker = worker
+        self.socket_path = Path(socket_path)
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _claim_socket_path(socket_path: Path) -> None:
+    """Remove a stale socket file, refusing if a daemon is listening on it."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if not socket_path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink()  # Left behind by a daemon that died
+    else:
+        raise DaemonError(f"A daemon is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def serve(
+    socket_path: Optional[Path] = None,
+    definitions_dir: Optional[Path] = None,
+    store_dir: Optional[Path] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    preload: Iterable[str] = (),
+) -> None:
+    """
+    Run the daemon until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (default: DEFAULT_SOCKET_PATH)
+        definitions_dir: Job definitions directory override
+        store_dir: Run store directory (default: ~/.local/lorchestra/runs)
+        queue_size: Requests allowed to wait before new ones are rejected
+        preload: Callable names to import at startup
+
+    Raises:
+        DaemonError: If another daemon already listens on socket_path
+    """
+    socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+    _claim_socket_path(socket_path)
+    worker = Worker(definitions_dir, store_dir, queue_size, preload)
+    worker.start()
+    with DaemonServer(socket_path, worker) as server:
+        logger.info(f"lorchestra daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.stop()
+
+
+def submit(
+    request: dict,
+    socket_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+) -> dict[str, Any]:
+    """
+    Send a request to a running daemon and return its result.
+
+    Args:
+        request: Request dict (see module docstring)
+        socket_path: Daemon socket (default: DEFAULT_SOCKET_PATH)
+        timeout: Seconds to wait for the reply (default: until the run ends)
+
+    Returns:
+        The reply's result
+
+    Raises:
+        DaemonError: If the daemon is unreachable or the request failed
+    """
+    socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(socket_path))
+        except OSError as e:
+            raise DaemonError(f"No daemon listening on {socket_path}: {e}") from e
+        sock.sendall(json.dumps(request, default=str).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise DaemonError("Daemon closed the connection without replying")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise DaemonError(reply.get("error", "unknown error"))
+    return reply["result"]
@@ -35,6 +35,8 @@ import json
 import re
 import warnings
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Optional, TYPE_CHECKING
 
@@ -52,11 +54,37 @@ from lorchestra.schemas import (
 
 from .registry import JobRegistry
 from .compiler import compile_job
+from .row_decoder import json_default
 from .run_store import RunStore, InMemoryRunStore, FileRunStore, DEFAULT_RUN_PATH
+from .spill import SpilledItems, open_items_ref, spill_items
+from .watermark_store import (
+    WatermarkStore,
+    InMemoryWatermarkStore,
+    FileWatermarkStore,
+    DEFAULT_WATERMARK_PATH,
+    ingest_watermark_key,
+    normalize_watermark,
+    query_watermark_key,
+)
 
 if TYPE_CHECKING:
     from lorchestra.handlers import HandlerRegistry
+    from lorchestra.plan_builder import StoraclePlan
+    from lorchestra.query_builder import QueryParam
+    from lorchestra.query_cache import QueryCache
+
+
+# Hours a local auto_since watermark is trusted before re-verifying it
+# against BigQuery MAX(last_seen)
+AUTO_SINCE_RECONCILE_HOURS = 24
+
+# Default concurrent shard queries for a sharded storacle.query
+DEFAULT_SHARD_WORKERS = 8
 
+# Step outputs with more items than this are spilled to an NDJSON file in the
+# run store and passed downstream as items_ref. Opt-in: steps that expect
+# lists get SpilledItems once it is set (None disables auto-spill)
+DEFAULT_SPILL_THRESHOLD: Optional[int] = None
 
 # Reference pattern for @run.* references
 # Supports: @run.step.key.subkey and @run.step.items[0].field
@@ -108,19 +136,19 @@ def _resolve_run_refs(
                     array_match = re.match(r"(\w+)\[(\d+)\]", part)
                     if array_match:
                         key, idx = array_match.groups()
-                        if isinstance(result, dict) and key in result:
+                        if isinstance(result, Mapping) and key in result:
                             result = result[key]
                         else:
                             raise ValueError(
                                 f"@run reference path not found: {value} (missing '{key}')"
                             )
-                        if isinstance(result, list) and int(idx) < len(result):
+                        if isinstance(result, (list, SpilledItems)) and int(idx) < len(result):
                             result = result[int(idx)]
                         else:
                             raise ValueError(
                                 f"@run reference index out of bounds: {value} (index {idx})"
                             )
-                    elif isinstance(result, dict) and part in result:
+                    elif isinstance(result, Mapping) and part in result:
                         result = result[part]
                     else:
                         raise ValueError(
@@ -136,6 +164,22 @@ def _resolve_run_refs(
         return value
 
 
+def _is_paginated_query(step: JobStepInstance) -> bool:
+    """Check if a step is a storacle.query with a keyset paginate spec."""
+    from lorchestra.schemas.ops import Op
+
+    return step.op == Op.STORACLE_QUERY and bool(step.params.get("paginate"))
+
+
+def _query_datasets(params: dict, resolve_dataset) -> set[str]:
+    """Get the resolved datasets a storacle.query step reads (for cache invalidation)."""
+    datasets = {resolve_dataset(params["dataset"])}
+    incremental = params.get("incremental") or {}
+    if incremental.get("target_dataset"):
+        datasets.add(resolve_dataset(incremental["target_dataset"]))
+    return datasets
+
+
 def _compute_idempotency_key(
     run_id: str,
     step_id: str,
@@ -203,7 +247,9 @@ def _compute_idempotency_key(
 
     # Optionally add payload hash
     if idempotency.include_payload_hash:
-        params_json = json.dumps(resolved_params, sort_keys=True, separators=(",", ":"))
+        params_json = json.dumps(
+            resolved_params, sort_keys=True, separators=(",", ":"), default=json_default
+        )
         params_hash = hashlib.sha256(params_json.encode()).hexdigest()[:16]
         return f"{base_key}:{params_hash}"
 
@@ -291,6 +337,79 @@ class ExecutionResult:
         return list(self.attempt.get_failed_steps())
 
 
+def run_bq_query(
+    sql: str,
+    query_params: list["QueryParam"],
+    run_id: str = "",
+    step_id: str = "",
+) -> list[dict]:
+    """
+    Submit a bq.query op to storacle and return its rows.
+
+    Temporal values are converted to ISO strings so rows are JSON-native,
+    using the result schema when storacle returns one.
+
+    Args:
+        sql: Parameterized SQL
+        query_params: Query parameters
+        run_id: Run ULID (for RPC metadata)
+        step_id: Querying step (for RPC metadata and errors)
+
+    Returns:
+        List of row dicts
+
+    Raises:
+        ExecutionError: If storacle returns a JSON-RPC error
+    """
+    from lorchestra.plan_builder import StoraclePlan, StoracleOp
+    from lorchestra.storacle.client import submit_plan, RpcMeta
+
+    # Build a single-op plan with bq.query method
+    op = StoracleOp(
+        op_id=str(__import__("uuid").uuid4()),
+        method="bq.query",
+        params={
+            "sql": sql,
+            "query_params": [
+                {"name": qp.name, "type": qp.type, "value": qp.value}
+                for qp in query_params
+            ],
+        },
+    )
+    plan = StoraclePlan(
+        correlation_id=f"{run_id}:{step_id}",
+        ops=[op],
+    )
+    meta = RpcMeta(
+        run_id=run_id,
+        step_id=step_id,
+        correlation_id=plan.correlation_id,
+    )
+
+    # Submit to storacle and extract rows from the response
+    result = submit_plan(plan, meta)
+
+    # result is a list of JSON-RPC responses (one per op)
+    from lorchestra.row_decoder import decode_rows
+
+    rows = []
+    schema = None
+    if isinstance(result, list) and len(result) > 0:
+        response = result[0]
+        if "result" in response:
+            rows = response["result"].get("rows", [])
+            schema = response["result"].get("schema")
+        elif "error" in response:
+            error_msg = response["error"].get("message", "Unknown error")
+            raise ExecutionError(step_id, f"storacle.query failed: {error_msg}")
+    elif isinstance(result, dict):
+        # noop client returns a flat dict
+        rows = result.get("rows", [])
+
+    # Convert temporal columns to ISO strings for JSON serialization
+    return decode_rows(rows, schema)
+
+
 class Executor:
     """
     Execution engine for JobInstances.
@@ -326,6 +445,9 @@ class Executor:
         handlers: Optional["HandlerRegistry"] = None,
         backends: Optional[dict[str, Backend]] = None,
         max_attempts: int = 1,
+        watermarks: Optional[WatermarkStore] = None,
+        query_cache: Optional["QueryCache"] = None,
+        spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
     ):
         """
         Initialize the executor.
@@ -336,9 +458,24 @@ class Executor:
             backends: (Deprecated) Dictionary mapping backend names to Backend implementations.
                      Use `handlers` parameter instead.
             max_attempts: Maximum number of retry attempts (default: 1, no retries)
+            watermarks: WatermarkStore for `incremental.mode: watermark` queries
+                     (defaults to InMemoryWatermarkStore)
+            query_cache: QueryCache shared across jobs in a pipeline run (optional)
+            spill_threshold: Item count above which step outputs are spilled
+                     to the run store and passed on as items_ref (None: never)
         """
         self._store = store
+        self._spill_threshold = spill_threshold
         self._max_attempts = max_attempts
+        self._watermarks = watermarks if watermarks is not None else InMemoryWatermarkStore()
+        self._query_cache = query_cache
+        self._job_id: Optional[str] = None
+        # Per-attempt watermark state: key -> value read at first use, and
+        # key -> max source_ts seen (committed only when the attempt succeeds)
+        self._watermark_reads: dict[str, Optional[str]] = {}
+        self._pending_watermarks: dict[str, str] = {}
+        # False once a storacle.submit of the attempt did not write every op
+        self._submits_written = True
 
         # Handle handlers vs backends (with backwards compatibility)
         if handlers is not None:
@@ -382,6 +519,10 @@ class Executor:
             ExecutionResult containing the run record, attempt, and status
         """
         envelope = envelope or {}
+        self._job_id = instance.job_id
+
+        # Spill files outlive their run (see RunStore.prune_spill): drop stale ones
+        self._store.prune_spill()
 
         # Create run record
         run_record = self._store.create_run(instance, envelope)
@@ -507,11 +648,15 @@ class Executor:
         had_failure = False
         rows_read = 0
         rows_written = 0
+        self._watermark_reads = {}
+        self._pending_watermarks = {}
+        self._submits_written = True
 
         # Make envelope available for @run.envelope.* resolution
         step_outputs["envelope"] = envelope
 
-        for step in instance.steps:
+        steps = list(instance.steps)
+        for index, step in enumerate(steps):
             # Check for compile-time skip
             if step.compiled_skip:
                 step_outcomes.append(StepOutcome(
@@ -520,60 +665,28 @@ class Executor:
                 ))
                 continue
 
-            step_started = _utcnow()
-            try:
-                # Execute the step
-                output, manifest_ref, output_ref = self._execute_step(
-                    step, run_record.run_id, step_outputs
+            # Keyset-paginated read: the query step and every downstream step
+            # run once per page until the source is drained.
+            if _is_paginated_query(step):
+                page_outcomes, page_read, page_written, page_status = self._execute_paginated(
+                    step, steps[index + 1:], run_record.run_id, step_outputs
                 )
+                step_outcomes.extend(page_outcomes)
+                rows_read += page_read
+                rows_written += page_written
+                if any(o.status == StepStatus.FAILED for o in page_outcomes):
+                    had_failure = True
+                overall_status = page_status
+                break
+
+            outcome, step_read, step_written = self._run_step(
+                step, run_record.run_id, step_outputs
+            )
+            step_outcomes.append(outcome)
+            rows_read += step_read
+            rows_written += step_written
 
-                step_completed = _utcnow()
-                step_outcomes.append(StepOutcome(
-                    step_id=step.step_id,
-                    status=StepStatus.COMPLETED,
-                    started_at=step_started,
-                    completed_at=step_completed,
-                    manifest_ref=manifest_ref,
-                    output_ref=output_ref,
-                ))
-
-                # Store output for subsequent @run.* resolution
-                step_outputs[step.step_id] = output
-
-                # Track row counts from output
-                if isinstance(output, dict):
-                    # call/query steps return items list
-                    items = output.get("items", [])
-                    if isinstance(items, list):
-                        rows_read += len(items)
-                    # storacle.submit returns rows_affected (actual BQ rows)
-                    if "rows_affected" in output:
-                        rows_written += output["rows_affected"]
-                # storacle.submit returns list of JSON-RPC responses
-                elif isinstance(output, list):
-                    for resp in output:
-                        if isinstance(resp, dict) and "result" in resp:
-                            result = resp["result"]
-                            if isinstance(result, dict):
-                                # bq.upsert returns rows_written
-                                if "rows_written" in result:
-                                    rows_written += result["rows_written"]
-
-            except Exception as e:
-                step_completed = _utcnow()
-                error_info = {
-                    "type": type(e).__name__,
-                    "message": str(e),
-                }
-
-                step_outcomes.append(StepOutcome(
-                    step_id=step.step_id,
-                    status=StepStatus.FAILED,
-                    started_at=step_started,
-                    completed_at=step_completed,
-                    error=error_info,
-                ))
-
+            if outcome.status == StepStatus.FAILED:
                 had_failure = True
 
                 # Check continue_on_error
@@ -587,6 +700,20 @@ class Executor:
             # Still mark as completed since we finished all steps
             pass
 
+        # Advance watermarks only when every step succeeded and every
+        # storacle.submit wrote to production; otherwise the next run re-reads
+        # the same window. Watermark keys have no namespace, so dry-run,
+        # test-table, smoke and noop runs must leave them alone.
+        if (
+            overall_status == StepStatus.COMPLETED
+            and not had_failure
+            and self._submits_written
+            and _writes_to_production()
+        ):
+            for key, value in self._pending_watermarks.items():
+                self._watermarks.advance(key, value)
+        self._pending_watermarks = {}
+
         completed_at = _utcnow()
         attempt = AttemptRecord(
             run_id=run_record.run_id,
@@ -598,11 +725,229 @@ class Executor:
         )
         return attempt, rows_read, rows_written, step_outputs
 
+    def _run_step(
+        self,
+        step: JobStepInstance,
+        run_id: str,
+        step_outputs: dict[str, Any],
+        page: Optional[int] = None,
+        param_overrides: Optional[dict[str, Any]] = None,
+    ) -> tuple[StepOutcome, int, int]:
+        """
+        Execute a single step and record its outcome.
+
+        Exceptions are captured into a FAILED StepOutcome rather than raised.
+        On success, the output is stored in step_outputs for @run.* resolution.
+
+        Args:
+            step: The step to execute
+            run_id: The run ULID
+            step_outputs: Outputs from previous steps (updated in place)
+            page: Page number when running inside a paginated read
+            param_overrides: Params to overlay on the step's params before resolution
+
+        Returns:
+            Tuple of (StepOutcome, rows_read, rows_written)
+        """
+        step_started = _utcnow()
+        rows_read = 0
+        rows_written = 0
+        try:
+            output, manifest_ref, output_ref = self._execute_step(
+                step, run_id, step_outputs, page=page, param_overrides=param_overrides
+            )
+        except Exception as e:
+            return StepOutcome(
+                step_id=step.step_id,
+                status=StepStatus.FAILED,
+                started_at=step_started,
+                completed_at=_utcnow(),
+                error={
+                    "type": type(e).__name__,
+                    "message": str(e),
+                },
+            ), 0, 0
+
+        outcome = StepOutcome(
+            step_id=step.step_id,
+            status=StepStatus.COMPLETED,
+            started_at=step_started,
+            completed_at=_utcnow(),
+            manifest_ref=manifest_ref,
+            output_ref=output_ref,
+        )
+
+        # Store output for subsequent @run.* resolution
+        step_outputs[step.step_id] = output
+
+        # Track row counts from output
+        if isinstance(output, dict):
+            # call/query steps return items list (or spilled items)
+            items = output.get("items", [])
+            if isinstance(items, (list, SpilledItems)):
+                rows_read += len(items)
+            # storacle.submit returns rows_affected (actual BQ rows)
+            if "rows_affected" in output:
+                rows_written += output["rows_affected"]
+        # storacle.submit returns list of JSON-RPC responses
+        elif isinstance(output, list):
+            for resp in output:
+                if isinstance(resp, dict) and "result" in resp:
+                    result = resp["result"]
+                    if isinstance(result, dict):
+                        # bq.upsert returns rows_written
+                        if "rows_written" in result:
+                            rows_written += result["rows_written"]
+
+        return outcome, rows_read, rows_written
+
+    def _execute_paginated(
+        self,
+        query_step: JobStepInstance,
+        downstream: list[JobStepInstance],
+        run_id: str,
+        step_outputs: dict[str, Any],
+    ) -> tuple[list[StepOutcome], int, int, StepStatus]:
+        """
+        Drain a keyset-paginated storacle.query through the downstream steps.
+
+        Each page is read with `WHERE key > @last_key ORDER BY key LIMIT page_size`
+        and fed through every downstream step before the next page is read, so
+        memory stays bounded by the page size. The source is drained when a page
+        returns fewer rows than page_size (or max_pages is reached).
+
+        Outcomes are aggregated to one StepOutcome per step (first page start to
+        last page completion). Manifests and outputs are stored per page.
+
+        With `paginate.prefetch: true` the next page is fetched and decoded in
+        a worker thread while the current page runs through the downstream
+        steps. Only use it when downstream writes cannot change what later
+        pages return.
+
+        Args:
+            query_step: The storacle.query step with a paginate spec
+            downstream: Steps following the query step
+            run_id: The run ULID
+            step_outputs: Outputs from previous steps (updated in place)
+
+        Returns:
+            Tuple of (step outcomes, rows_read, rows_written, overall status)
+        """
+        paginate = dict(query_step.params["paginate"])
+        key = paginate["key"]
+        page_size = int(paginate["page_size"])
+        max_pages = paginate.get("max_pages")
+
+        rows_read = 0
+        rows_written = 0
+        status = StepStatus.COMPLETED
+        # step_id -> (first page started_at, latest outcome); a failed outcome
+        # (continue_on_error) is kept so the failure stays visible.
+        aggregated: dict[str, tuple[datetime, StepOutcome]] = {}
+
+        def _record(outcome: StepOutcome) -> None:
+            first = aggregated.get(outcome.step_id)
+            if first is None:
+                aggregated[outcome.step_id] = (outcome.started_at, outcome)
+            elif first[1].status != StepStatus.FAILED:
+                aggregated[outcome.step_id] = (first[0], outcome)
+
+        def _fetch(page: int, after: Any) -> tuple[StepOutcome, int, Any]:
+            # Query into a copy so a prefetch never replaces the items the
+            # downstream steps of the current page are reading
+            outputs = dict(step_outputs)
+            outcome, page_read, _ = self._run_step(
+                query_step, run_id, outputs, page=page,
+                param_overrides={"paginate": {**paginate, "after": after}},
+            )
+            return outcome, page_read, outputs.get(query_step.step_id)
+
+        pool = ThreadPoolExecutor(max_workers=1) if paginate.get("prefetch") else None
+        pending: Optional[Future] = None
+
+        page = 0
+        after = paginate.get("after")
+        try:
+            while True:
+                if pending is not None:
+                    outcome, page_read, output = pending.result()
+                    pending = None
+                else:
+                    outcome, page_read, output = _fetch(page, after)
+                _record(outcome)
+                if outcome.status == StepStatus.FAILED:
+                    status = StepStatus.FAILED
+                    break
+
+                step_outputs[query_step.step_id] = output
+                items = output.get("items", [])
+                rows_read += page_read
+
+                # Empty page after the first one: nothing left to feed downstream
+                if not items and page > 0:
+                    break
+
+                is_last = len(items) < page_size or (
+                    max_pages is not None and page + 1 >= int(max_pages)
+                )
+                if pool is not None and not is_last and items[-1].get(key) is not None:
+                    pending = pool.submit(_fetch, page + 1, items[-1].get(key))
+
+                for step in downstream:
+                    if step.compiled_skip:
+                        continue
+                    outcome, step_read, step_written = self._run_step(
+                        step, run_id, step_outputs, page=page
+                    )
+                    _record(outcome)
+                    rows_read += step_read
+                    rows_written += step_written
+                    if outcome.status == StepStatus.FAILED and not step.continue_on_error:
+                        status = StepStatus.FAILED
+                        break
+                if status == StepStatus.FAILED:
+                    break
+
+                page += 1
+                if is_last:
+                    break
+                after = items[-1].get(key)
+                if after is None:
+                    raise ExecutionError(
+                        query_step.step_id,
+                        f"paginate.key '{key}' missing from page rows",
+                    )
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        outcomes: list[StepOutcome] = []
+        for step in [query_step, *downstream]:
+            if step.compiled_skip:
+                outcomes.append(StepOutcome(step_id=step.step_id, status=StepStatus.SKIPPED))
+                continue
+            entry = aggregated.get(step.step_id)
+            if entry is None:
+                continue
+            started, last = entry
+            outcomes.append(StepOutcome(
+                step_id=last.step_id,
+                status=last.status,
+                started_at=started,
+                completed_at=last.completed_at,
+                manifest_ref=last.manifest_ref,
+                output_ref=last.output_ref,
+                error=last.error,
+            ))
+        return outcomes, rows_read, rows_written, status
+
     def _execute_step(
         self,
         step: JobStepInstance,
         run_id: str,
         step_outputs: dict[str, Any],
+        page: Optional[int] = None,
+        param_overrides: Optional[dict[str, Any]] = None,
     ) -> tuple[Any, str, str]:
         """
         Execute a single step.
@@ -611,26 +956,35 @@ class Executor:
             step: The step to execute
             run_id: The run ULID
             step_outputs: Outputs from previous steps
+            page: Page number when running inside a paginated read. Manifests
+                and outputs are stored under "{step_id}[{page}]".
+            param_overrides: Params to overlay on the step's params before resolution
 
         Returns:
             Tuple of (output, manifest_ref, output_ref)
         """
+        params = step.params
+        if param_overrides:
+            params = {**params, **param_overrides}
+
         # Resolve @run.* references
-        resolved_params = _resolve_run_refs(step.params, step_outputs)
+        resolved_params = _resolve_run_refs(params, step_outputs)
 
         # Compute idempotency key
         # Note: In a real implementation, we'd get the IdempotencyConfig from the step
         # For now, use default run-scoped idempotency
         idempotency = IdempotencyConfig(scope="run")
 
+        # Pages of a paginated read are distinct executions: key them apart
+        step_id = step.step_id if page is None else f"{step.step_id}[{page}]"
         idempotency_key = _compute_idempotency_key(
-            run_id, step.step_id, step, resolved_params, idempotency
+            run_id, step_id, step, resolved_params, idempotency
         )
 
         # Create manifest
         manifest = StepManifest.from_op(
             run_id=run_id,
-            step_id=step.step_id,
+            step_id=step_id,
             op=step.op,
             resolved_params=resolved_params,
             idempotency_key=idempotency_key,
@@ -641,12 +995,42 @@ class Executor:
 
         # Dispatch to handler or backend
         output = self._dispatch_manifest(manifest, step)
+        output = self._spill_output(run_id, manifest.step_id, output)
 
         # Store output
-        output_ref = self._store.store_output(run_id, step.step_id, output)
+        output_ref = self._store.store_output(run_id, manifest.step_id, output)
 
         return output, manifest_ref, output_ref
 
+    def _spill_output(self, run_id: str, step_id: str, output: Any) -> Any:
+        """
+        Back a step output's items with a spill file when needed.
+
+        An output carrying items_ref (a callable that spilled its own items)
+        gets items opened from the ref, and SpilledItems (a parallel step's)
+        get their items_ref; inline items above the spill threshold are
+        written to the run store's spill file for the step.
+        Either way downstream steps read output["items"] as SpilledItems.
+        """
+        if not isinstance(output, dict):
+            return output
+        items = output.get("items")
+        if items is None and output.get("items_ref"):
+            return {**output, "items": open_items_ref(output["items_ref"])}
+        if isinstance(items, SpilledItems) and not output.get("items_ref"):
+            return {**output, "items_ref": items.ref}
+        if (
+            self._spill_threshold is not None
+            and isinstance(items, list)
+            and len(items) > self._spill_threshold
+        ):
+            try:
+                spilled = spill_items(items, self._store.spill_path(run_id, step_id))
+            except TypeError:
+                return output  # Not JSON-representable: keep inline
+            return {**output, "items": spilled, "items_ref": spilled.ref}
+        return output
+
     def _dispatch_manifest(
         self,
         manifest: StepManifest,
@@ -718,81 +1102,145 @@ class Executor:
         to storacle via bq.query RPC, parses JSON columns if requested, and
         surfaces rows as step output (available via @run.{step_id}.items).
 
+        When the executor has a QueryCache (pipeline runs), identical SQL +
+        params are served from the cache. Set `cache: false` to always read BQ.
+
+        With `lazy_json: true`, JSON objects in parse_json_columns become
+        LazyJson proxies parsed on first access; untouched ones are written
+        back (plan.build, run store) as their original text.
+
+        With `shard: {column, count | bucket}` the query is split into
+        disjoint ranges of the shard column, run concurrently, and the rows
+        are merged in shard order.
+
         Args:
             manifest: StepManifest with op=storacle.query
 
         Returns:
             Dict with items (list of row dicts)
         """
-        import json as _json
         from lorchestra.query_builder import build_query
-        from lorchestra.plan_builder import StoraclePlan, StoracleOp, _resolve_dataset
-        from lorchestra.storacle.client import submit_plan, RpcMeta
+        from lorchestra.plan_builder import _resolve_dataset
+        from lorchestra.row_decoder import parse_json_columns as _parse_json_columns
 
         params = dict(manifest.resolved_params)
         parse_json_columns = params.pop("parse_json_columns", None)
+        lazy_json = params.pop("lazy_json", False)
+        cache_enabled = params.pop("cache", True)
+
+        # Watermark mode: inject the persisted high-water mark into the query
+        watermark_key = None
+        incremental = params.get("incremental")
+        if incremental and incremental.get("mode") == "watermark":
+            watermark_key = self._watermark_key(manifest, incremental)
+            params["incremental"] = {
+                **incremental,
+                "watermark": self._read_watermark(watermark_key),
+            }
 
         # Build SQL from declarative params
         sql, query_params = build_query(params, resolve_dataset=_resolve_dataset)
 
-        # Build a single-op plan with bq.query method
-        op = StoracleOp(
-            op_id=str(__import__("uuid").uuid4()),
-            method="bq.query",
-            params={
-                "sql": sql,
-                "query_params": [
-                    {"name": qp.name, "type": qp.type, "value": qp.value}
-                    for qp in query_params
-                ],
-            },
-        )
-        plan = StoraclePlan(
-            correlation_id=f"{manifest.run_id}:{manifest.step_id}",
-            ops=[op],
-        )
-        meta = RpcMeta(
-            run_id=manifest.run_id,
-            step_id=manifest.step_id,
-            correlation_id=plan.correlation_id,
-        )
-
-        # Submit to storacle and extract rows from the response
-        result = submit_plan(plan, meta)
+        rows = None
+        cache_key = None
+        if self._query_cache is not None and cache_enabled:
+            cache_key = self._query_cache.make_key(sql, query_params)
+            rows = self._query_cache.get(cache_key)
 
-        # result is a list of JSON-RPC responses (one per op)
-        rows = []
-        if isinstance(result, list) and len(result) > 0:
-            response = result[0]
-            if "result" in response:
-                rows = response["result"].get("rows", [])
-            elif "error" in response:
-                error_msg = response["error"].get("message", "Unknown error")
-                raise ExecutionError(manifest.step_id, f"storacle.query failed: {error_msg}")
-        elif isinstance(result, dict):
-            # noop client returns a flat dict
-            rows = result.get("rows", [])
-
-        # Convert datetime objects to ISO strings for JSON serialization
-        from datetime import datetime as _datetime
-        if rows:
-            for row in rows:
-                for key, val in row.items():
-                    if isinstance(val, _datetime):
-                        row[key] = val.isoformat()
+        if rows is None:
+            if params.get("shard"):
+                rows = self._run_sharded_query(manifest, params)
+            else:
+                rows = run_bq_query(sql, query_params, run_id=manifest.run_id, step_id=manifest.step_id)
+            if cache_key is not None:
+                self._query_cache.put(cache_key, rows, _query_datasets(params, _resolve_dataset))
 
         # Parse JSON string columns if requested
         if parse_json_columns and rows:
-            for row in rows:
-                for col in parse_json_columns:
-                    if col in row and isinstance(row[col], str):
-                        try:
-                            row[col] = _json.loads(row[col])
-                        except (_json.JSONDecodeError, TypeError):
-                            pass  # Leave as string if not valid JSON
+            _parse_json_columns(rows, parse_json_columns, lazy=lazy_json)
+
+        if watermark_key is not None and rows:
+            self._track_watermark(
+                watermark_key, rows, params["incremental"].get("source_ts", "last_seen")
+            )
 
         return {"items": rows}
 
+    def _run_sharded_query(self, manifest: StepManifest, params: dict) -> list[dict]:
+        """
+        Run a storacle.query as concurrent range shards of its shard column.
+
+        A MIN/MAX bounds query picks the cut points; each shard is its own
+        bq.query. Rows come back in shard order regardless of completion order.
+
+        Args:
+            manifest: StepManifest of the storacle.query step
+            params: Query params (watermark already injected) with a `shard` spec
+
+        Returns:
+            Merged rows of all shards
+        """
+        from lorchestra.query_builder import (
+            build_query,
+            build_shard_bounds_query,
+            shard_boundaries,
+        )
+        from lorchestra.plan_builder import _resolve_dataset
+
+        shard = params["shard"]
+        step_id = manifest.step_id
+        try:
+            bounds_sql, bounds_params = build_shard_bounds_query(params, resolve_dataset=_resolve_dataset)
+            bounds = run_bq_query(bounds_sql, bounds_params, run_id=manifest.run_id, step_id=step_id)
+            lo, hi = (bounds[0].get("lo"), bounds[0].get("hi")) if bounds else (None, None)
+            cuts = shard_boundaries(lo, hi, shard)
+        except ValueError as e:
+            raise ExecutionError(step_id, f"Invalid shard spec: {e}") from e
+
+        edges: list[Optional[str]] = [None, *cuts, None]
+        ranges = list(zip(edges[:-1], edges[1:]))
+
+        def _fetch(index: int) -> list[dict]:
+            start, end = ranges[index]
+            sql, query_params = build_query(
+                {**params, "shard": {**shard, "start": start, "end": end}},
+                resolve_dataset=_resolve_dataset,
+            )
+            return run_bq_query(sql, query_params, run_id=manifest.run_id, step_id=f"{step_id}[shard {index}]")
+
+        if len(ranges) == 1:
+            return _fetch(0)
+
+        max_workers = min(len(ranges), int(shard.get("max_workers", DEFAULT_SHARD_WORKERS)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_fetch, range(len(ranges))))
+        return [row for shard_rows in results for row in shard_rows]
+
+    def _watermark_key(self, manifest: StepManifest, incremental: dict) -> str:
+        """Get the watermark key for a query step (page suffix stripped)."""
+        step_id = manifest.step_id.split("[", 1)[0]
+        return query_watermark_key(self._job_id, step_id, incremental)
+
+    def _read_watermark(self, key: str) -> Optional[str]:
+        """Read a watermark once per attempt.
+
+        Paginated reads query once per page; pinning the value for the whole
+        attempt keeps every page on the same window.
+        """
+        if key not in self._watermark_reads:
+            self._watermark_reads[key] = self._watermarks.get(key)
+        return self._watermark_reads[key]
+
+    def _track_watermark(self, key: str, rows: list[dict], source_ts: str) -> None:
+        """Record the max source_ts in rows as the pending watermark for key."""
+        values = [normalize_watermark(row.get(source_ts)) for row in rows]
+        values = [v for v in values if v is not None]
+        pending = self._pending_watermarks.get(key)
+        if pending is not None:
+            values.append(pending)
+        if values:
+            self._pending_watermarks[key] = max(values, key=datetime.fromisoformat)
+
     def _handle_call(self, manifest: StepManifest) -> dict[str, Any]:
         """
         Handle the generic `call` op: dispatch to callable by name.
@@ -802,38 +1250,87 @@ class Executor:
         as the step output so downstream steps can reference @run.step_id.items.
 
         Supports auto_since for incremental ingestion: if params contain
-        auto_since with source metadata, queries BQ for MAX(last_seen) and
-        injects 'since' into the callable's config.
+        auto_since with source metadata, resolves the stream's last_seen
+        watermark and injects 'since' into the callable's config.
+
+        With `parallel:` (true, a worker count, or {workers, chunk_size}) the
+        callable runs over chunks of params["items"] on a process pool (see
+        lorchestra.callable.parallel).
 
         Args:
             manifest: StepManifest with op=call
 
         Returns:
-            Dict with items, stats, schema_version from CallableResult
+            Dict with items (or items_ref), stats, schema_version from
+            CallableResult
         """
         from lorchestra.callable.dispatch import dispatch_callable
 
         callable_name = manifest.resolved_params["callable"]
-        # Forward all params except "callable" and "auto_since" to the callable
+        # Forward all params except "callable", "auto_since" and "parallel" to the callable
         params = {k: v for k, v in manifest.resolved_params.items()
-                  if k not in ("callable", "auto_since")}
+                  if k not in ("callable", "auto_since", "parallel")}
 
-        # auto_since: query BQ for last sync timestamp and inject as config.since
+        # auto_since: resolve last sync timestamp and inject as config.since
         auto_since = manifest.resolved_params.get("auto_since")
         if auto_since and isinstance(auto_since, dict):
             since = self._resolve_auto_since(auto_since)
             if since:
                 params.setdefault("config", {})["since"] = since
 
-        result = dispatch_callable(callable_name, params)
-        return {
+        parallel = manifest.resolved_params.get("parallel")
+        if parallel and "items" in params:
+            from lorchestra.callable.parallel import run_parallel
+            spill_path = self._store.spill_path(manifest.run_id, manifest.step_id)
+            result = run_parallel(callable_name, params, parallel, spill_path=spill_path)
+        else:
+            result = dispatch_callable(callable_name, params)
+        output = {
             "items": result.items,
             "stats": result.stats,
             "schema_version": result.schema_version,
         }
+        if result.items_ref is not None:
+            output["items_ref"] = result.items_ref
+        return output
 
     def _resolve_auto_since(self, auto_since: dict) -> str | None:
-        """Query BQ for MAX(last_seen) to determine incremental sync cursor.
+        """Resolve the incremental sync cursor for an ingest stream.
+
+        Reads the local watermark for (source_system, connection_name,
+        object_type), which successful raw_objects writes keep current. BQ
+        MAX(last_seen) is the authoritative fallback: it is queried when no
+        local watermark exists or the last verification is older than
+        reconcile_hours, and the result replaces the local watermark.
+
+        Args:
+            auto_since: Dict with source_system, connection_name, object_type,
+                       optional dataset (defaults to 'raw' -> config.dataset_raw),
+                       and optional reconcile_hours (default: 24).
+
+        Returns:
+            ISO timestamp string, or None if no previous sync found.
+        """
+        key = ingest_watermark_key(
+            auto_since["source_system"],
+            auto_since["connection_name"],
+            auto_since["object_type"],
+        )
+        reconcile_hours = auto_since.get("reconcile_hours", AUTO_SINCE_RECONCILE_HOURS)
+
+        local = self._watermarks.get(key)
+        verified_at = self._watermarks.get_verified_at(key)
+        if local is not None and verified_at is not None:
+            age_hours = (_utcnow() - verified_at).total_seconds() / 3600
+            if age_hours < reconcile_hours:
+                return local
+
+        since = normalize_watermark(self._query_max_last_seen(auto_since))
+        self._watermarks.reconcile(key, since)
+        return since
+
+    def _query_max_last_seen(self, auto_since: dict) -> str | None:
+        """Query BQ for MAX(last_seen) of an ingest stream in raw_objects.
 
         Args:
             auto_since: Dict with source_system, connection_name, object_type,
@@ -895,10 +1392,14 @@ class Executor:
         Args:
             manifest: StepManifest with op=plan.build
 
+        With `dedupe`, batch rows sharing key_columns values are collapsed
+        before submit; stats reports rows_in, rows and duplicates dropped.
+
         Returns:
-            Dict with plan (serialized StoraclePlan)
+            Dict with plan (PlanHandle over the live StoraclePlan; reads as
+            the serialized storacle.plan/1.0.0 dict) and stats (batch mode)
         """
-        from lorchestra.plan_builder import build_plan_from_items
+        from lorchestra.plan_builder import PlanHandle, build_plan_from_items
 
         items = manifest.resolved_params["items"]
         method = manifest.resolved_params.get("method", "wal.append")
@@ -924,6 +1425,15 @@ class Executor:
         # MERGE behavior params
         skip_update_columns = manifest.resolved_params.get("skip_update_columns")
 
+        # Process pool size for very large batches
+        build_workers = manifest.resolved_params.get("build_workers")
+
+        # Columnar row encoding (expanded back to rows at the storacle boundary)
+        columnar = manifest.resolved_params.get("columnar", False)
+
+        # In-batch deduplication on key_columns ("last" | "first" | {max_by: col})
+        dedupe = manifest.resolved_params.get("dedupe")
+
         plan = build_plan_from_items(
             items=items,
             correlation_id=correlation_id,
@@ -940,38 +1450,101 @@ class Executor:
             auto_timestamp_columns=auto_timestamp_columns,
             idem_key_suffix=idem_key_suffix,
             skip_update_columns=skip_update_columns,
+            build_workers=build_workers,
+            columnar=columnar,
+            dedupe=dedupe,
         )
-        return {"plan": plan.to_dict()}
+        return {"plan": PlanHandle(plan), "stats": plan.stats}
 
     def _handle_storacle_submit(self, manifest: StepManifest) -> dict[str, Any]:
         """
         Handle the `storacle.submit` native op: submit plan to storacle.
 
-        Reads the plan dict from params (typically @run.persist.plan resolved)
-        and submits it to storacle via the client boundary.
+        Reads the plan from params (typically @run.persist.plan resolved)
+        and submits it to storacle via the client boundary. A PlanHandle from
+        plan.build hands over its live StoraclePlan; a plan dict (e.g. from
+        a stored output) is reconstructed.
+
+        With `skip_if_unchanged: true`, the plan's content hash is compared
+        with the last successful submit of this job step (recorded in the run
+        store) and an identical plan is not submitted again.
 
         Args:
             manifest: StepManifest with op=storacle.submit
 
         Returns:
-            Dict with storacle response
+            Dict with storacle response, or {skipped, reason, content_hash}
+            when an unchanged plan was skipped
         """
         from lorchestra.storacle.client import submit_plan, RpcMeta
-        from lorchestra.plan_builder import StoraclePlan
+        from lorchestra.plan_builder import PlanHandle, StoraclePlan
 
-        plan_dict = manifest.resolved_params["plan"]
+        plan_param = manifest.resolved_params["plan"]
+
+        if isinstance(plan_param, PlanHandle):
+            plan = plan_param.plan
+        else:
+            # Serialized storacle.plan/1.0.0 contract: reconstruct StoraclePlan
+            # for submit_plan(), which calls plan.to_dict() for the RPC boundary.
+            plan = StoraclePlan._from_dict(plan_param)
+
+        content_hash = None
+        if manifest.resolved_params.get("skip_if_unchanged", False):
+            content_hash = plan.content_hash()
+            if self._store.get_submit_hash(self._job_id, manifest.step_id) == content_hash:
+                return {"skipped": True, "reason": "unchanged", "content_hash": content_hash}
 
-        # plan_dict is already the serialized storacle.plan/1.0.0 contract
-        # from the plan.build step output. Reconstruct StoraclePlan for
-        # submit_plan(), which calls plan.to_dict() for the RPC boundary.
-        correlation_id = plan_dict.get("meta", {}).get("correlation_id", "")
-        plan = StoraclePlan._from_dict(plan_dict)
         meta = RpcMeta(
             run_id=manifest.run_id,
             step_id=manifest.step_id,
-            correlation_id=correlation_id,
+            correlation_id=plan.correlation_id,
         )
-        return submit_plan(plan, meta)
+        result = submit_plan(plan, meta)
+        if not _submit_succeeded(result):
+            self._submits_written = False
+        if _submit_succeeded(result) and _writes_to_production():
+            self._advance_ingest_watermarks(plan)
+        if self._query_cache is not None:
+            self._query_cache.invalidate_plan(plan)
+        if content_hash is not None and _submit_succeeded(result):
+            self._store.record_submit_hash(self._job_id, manifest.step_id, manifest.run_id, content_hash)
+        return result
+
+    def _advance_ingest_watermarks(self, plan: "StoraclePlan") -> None:
+        """Advance auto_since watermarks from raw_objects rows that were written.
+
+        Each raw_objects op moves the watermark of every (source_system,
+        connection_name, object_type) stream it wrote to the max last_seen
+        among its rows, so the next ingest needs no BQ query.
+
+        Only called after a submit that wrote every op to production: the
+        watermark keys have no namespace, so noop, partial, dry-run,
+        test-table, and smoke submits must leave them alone.
+
+        Args:
+            plan: The submitted StoraclePlan
+        """
+        from lorchestra.plan_builder import op_rows
+
+        latest: dict[str, str] = {}
+        for op in plan.ops:
+            if op.params.get("table") != "raw_objects":
+                continue
+            for row in op_rows(op.params):
+                try:
+                    key = ingest_watermark_key(
+                        row["source_system"], row["connection_name"], row["object_type"]
+                    )
+                    last_seen = normalize_watermark(row.get("last_seen"))
+                except (KeyError, ValueError):
+                    continue
+                if last_seen is None:
+                    continue
+                if key not in latest or datetime.fromisoformat(last_seen) > datetime.fromisoformat(latest[key]):
+                    latest[key] = last_seen
+
+        for key, last_seen in latest.items():
+            self._watermarks.advance(key, last_seen)
 
     def _handle_egret_submit(self, manifest: StepManifest) -> dict[str, Any]:
         """
@@ -1010,20 +1583,48 @@ class Executor:
         """
         import json
         import sys
+        import textwrap
 
         items = manifest.resolved_params.get("items", [])
         output_file = manifest.resolved_params.get("file")
 
+        def dump(f) -> None:
+            if not isinstance(items, SpilledItems):
+                json.dump(items, f, indent=2, default=str)
+                return
+            # Spilled items: stream the rows instead of loading them all
+            f.write("[")
+            for i, item in enumerate(items):
+                f.write(",\n" if i else "\n")
+                f.write(textwrap.indent(json.dumps(item, indent=2, default=str), "  "))
+            f.write("\n]" if len(items) else "]")
+
         if output_file:
             with open(output_file, "w") as f:
-                json.dump(items, f, indent=2, default=str)
+                dump(f)
             print(f"Dumped {len(items)} items to {output_file}", file=sys.stderr)
         else:
-            print(json.dumps(items, indent=2, default=str))
+            dump(sys.stdout)
+            print()
 
         return {"items_count": len(items)}
 
 
+def _submit_succeeded(result: Any) -> bool:
+    """True if a submit_plan response wrote every op (no errors, not the noop client)."""
+    if isinstance(result, list):
+        return not any(isinstance(resp, dict) and "error" in resp for resp in result)
+    return isinstance(result, dict) and result.get("status") != "noop"
+
+
+def _writes_to_production() -> bool:
+    """True unless writes go to a smoke namespace, test tables, or nowhere (dry run)."""
+    import os
+    from lorchestra.stack_clients.event_client import writes_to_production
+
+    return writes_to_production() and not os.environ.get("STORACLE_SMOKE_NAMESPACE")
+
+
 def execute_job(
     job_def: JobDef,
     ctx: Optional[dict[str, Any]] = None,
@@ -1032,6 +1633,9 @@ def execute_job(
     store: Optional[RunStore] = None,
     handlers: Optional["HandlerRegistry"] = None,
     backends: Optional[dict[str, Backend]] = None,
+    watermarks: Optional[WatermarkStore] = None,
+    query_cache: Optional["QueryCache"] = None,
+    spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
 ) -> ExecutionResult:
     """
     Compile and execute a job from a JobDef.
@@ -1046,6 +1650,10 @@ def execute_job(
         store: Optional RunStore (defaults to InMemoryRunStore)
         handlers: Optional HandlerRegistry for step dispatch (recommended)
         backends: (Deprecated) Optional backend configurations. Use handlers instead.
+        watermarks: Optional WatermarkStore (defaults to InMemoryWatermarkStore)
+        query_cache: Optional QueryCache shared across jobs in a pipeline run
+        spill_threshold: Item count above which step outputs are spilled
+            (None: never)
 
     Returns:
         ExecutionResult with run details and status
@@ -1055,7 +1663,10 @@ def execute_job(
 
     # Execute
     store = store or InMemoryRunStore()
-    executor = Executor(store=store, handlers=handlers, backends=backends)
+    executor = Executor(
+        store=store, handlers=handlers, backends=backends, watermarks=watermarks,
+        query_cache=query_cache, spill_threshold=spill_threshold,
+    )
     return executor.execute(instance, envelope=envelope)
 
 
@@ -1092,6 +1703,8 @@ def _load_job_def(envelope: dict[str, Any]) -> tuple[JobDef, dict[str, Any], dic
                 # When limit is set, disable incremental so we get deterministic results
                 # (incremental depends on what's already in target table)
                 step.params.pop("incremental", None)
+                # A single limited read replaces draining the source page by page
+                step.params.pop("paginate", None)
 
     return job_def, ctx, payload
 
@@ -1136,6 +1749,12 @@ def execute(envelope: dict[str, Any]) -> ExecutionResult:
         definitions_dir: Path - Directory containing job definitions (optional)
         registry: JobRegistry - Registry to load job from (optional)
         store: RunStore - Store for run artifacts (optional, defaults to FileRunStore)
+        watermarks: WatermarkStore - Store for incremental watermarks (optional,
+            defaults to FileWatermarkStore)
+        query_cache: QueryCache - Query result cache shared by a pipeline run (optional)
+        spill_threshold: int | None - Item count above which step outputs are
+            spilled to the run store as items_ref (optional, default None:
+            never)
         handlers: HandlerRegistry - Handler registry for step dispatch (optional, recommended)
         backends: dict[str, Backend] - (Deprecated) Backend implementations (optional)
 
@@ -1181,6 +1800,10 @@ def execute(envelope: dict[str, Any]) -> ExecutionResult:
     if store is None:
         store = FileRunStore(DEFAULT_RUN_PATH)
 
+    watermarks = envelope.get("watermarks")
+    if watermarks is None:
+        watermarks = FileWatermarkStore(DEFAULT_WATERMARK_PATH)
+
     # Get handlers (recommended) or backends (deprecated)
     handlers = envelope.get("handlers")
     backends = envelope.get("backends")
@@ -1194,4 +1817,7 @@ def execute(envelope: dict[str, Any]) -> ExecutionResult:
         store=store,
         handlers=handlers,
         backends=backends,
+        watermarks=watermarks,
+        query_cache=envelope.get("query_cache"),
+        spill_threshold=envelope.get("spill_threshold", DEFAULT_SPILL_THRESHOLD),
     )
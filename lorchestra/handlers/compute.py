@@ -4,13 +4,23 @@ Compute Handler for external IO operations.
 Handles compute.llm operations via ComputeClient.
 
 Keeping the orchestration layer free of compute service details.
+
+Responses are cached in the inference cache (see lorchestra.inference_cache),
+keyed by model, prompt_hash and config_hash; `cache: false` in the step
+params bypasses it. result["cache_hit"] reports a hit.
+
+Calls to the model go through its rate limiter (see lorchestra.rate_limiter),
+shared by every compute step in the process.
 """
 
 import hashlib
 import json
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Optional, Protocol, runtime_checkable
 
+from lorchestra.errors import PermanentError
 from lorchestra.handlers.base import Handler
+from lorchestra.inference_cache import InferenceCache, cache_options, get_inference_cache
+from lorchestra.rate_limiter import estimate_tokens, get_limiter
 from lorchestra.schemas import StepManifest, Op
 
 
@@ -79,14 +89,16 @@ class ComputeHandler(Handler):
     Delegates to a ComputeClient implementation for actual computation.
     """
 
-    def __init__(self, client: ComputeClient):
+    def __init__(self, client: ComputeClient, cache: Optional[InferenceCache] = None):
         """
         Initialize the compute handler.
 
         Args:
             client: ComputeClient implementation for compute operations
+            cache: InferenceCache for LLM responses (default: the process-wide cache)
         """
         self._client = client
+        self._cache = cache
 
     def execute(self, manifest: StepManifest) -> dict[str, Any]:
         """
@@ -100,6 +112,7 @@ class ComputeHandler(Handler):
 
         Raises:
             ValueError: If the operation is not compute.llm
+            PermanentError: If the cache option is invalid
         """
         op = manifest.op
         params = manifest.resolved_params
@@ -120,19 +133,36 @@ class ComputeHandler(Handler):
             "max_tokens": params.get("max_tokens"),
             "system_prompt": params.get("system_prompt"),
         }
+        prompt_hash = manifest.prompt_hash or _sha256_prefixed(prompt)
+        config_hash = _sha256_prefixed(_canonical_json(config))
 
-        result = self._client.llm_invoke(
-            prompt=prompt,
-            model=config["model"],
-            temperature=config["temperature"],
-            max_tokens=config["max_tokens"],
-            system_prompt=config["system_prompt"],
+        try:
+            cache_enabled, cache_ttl = cache_options(params.get("cache"))
+        except ValueError as e:
+            raise PermanentError(str(e)) from e
+        cache = None
+        if cache_enabled:
+            cache = self._cache if self._cache is not None else get_inference_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = InferenceCache.make_key(config["model"], prompt_hash, config_hash)
+            cached = cache.get(cache_key, ttl_seconds=cache_ttl)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+
+        result = get_limiter(config["model"]).call(
+            lambda: self._client.llm_invoke(
+                prompt=prompt,
+                model=config["model"],
+                temperature=config["temperature"],
+                max_tokens=config["max_tokens"],
+                system_prompt=config["system_prompt"],
+            ),
+            tokens=estimate_tokens(prompt, config["system_prompt"]),
+            usage=_usage_tokens,
         )
 
-        prompt_hash = manifest.prompt_hash or _sha256_prefixed(prompt)
         result["prompt_hash"] = prompt_hash
-
-        config_hash = _sha256_prefixed(_canonical_json(config))
         result["config_hash"] = config_hash
 
         response_text = result.get("response")
@@ -142,9 +172,17 @@ class ComputeHandler(Handler):
             # v0: no artifact store; use a stable synthetic ref for audit parity.
             result["output_ref"] = f"artifact://inline/{output_hash}"
 
+        if cache_key is not None:
+            cache.put(cache_key, result, model=config["model"])
+        result["cache_hit"] = False
         return result
 
 
+def _usage_tokens(result: dict[str, Any]) -> int | None:
+    usage = result.get("usage")
+    return usage.get("total_tokens") if isinstance(usage, dict) else None
+
+
 def _canonical_json(data: dict[str, Any]) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
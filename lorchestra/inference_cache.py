@@ -0,0 +1,255 @@
+"""
+InferenceCache - Persistent cache of LLM inference results.
+
+compute.llm steps (ComputeHandler) and the inferometer callable hash their
+prompt and config for the audit trail. The same hashes key this cache, so
+re-running a job or pipeline after a partial failure (e.g. extract_batch
+dying half way through the transcripts) only pays for the inferences that
+did not succeed the first time:
+
+    key = sha256(model, prompt_hash, config_hash)
+
+Entries live in a SQLite database next to the run store
+(~/.local/lorchestra/inference_cache.sqlite), shared by every process:
+
+- TTL: entries older than ttl_seconds are misses (and are purged on write).
+  A step can ask for a shorter or longer TTL with `cache: {ttl_seconds: N}`.
+- Size cap: beyond max_entries, the least recently used entries are evicted.
+- Bypass: `cache: false` on a step always calls the model (and does not
+  store the result).
+
+Only successful results are cached. Steps report hits in their stats
+(`cache_hit`).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+# Default database, next to the run store: ~/.local/lorchestra/inference_cache.sqlite
+DEFAULT_INFERENCE_CACHE_PATH = Path.home() / ".local" / "lorchestra" / "inference_cache.sqlite"
+
+# Default entry lifetime (30 days)
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+# Default size cap (least recently used entries are evicted beyond it)
+DEFAULT_MAX_ENTRIES = 50_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inference_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inference_cache_last_used ON inference_cache (last_used_at);
+"""
+
+# Process-wide cache used by steps that are not given one (see get_inference_cache)
+_DEFAULT_CACHE: Optional["InferenceCache"] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def cache_options(spec: Any) -> tuple[bool, Optional[float]]:
+    """
+    Resolve a step's `cache:` param to (enabled, ttl_seconds).
+
+    Args:
+        spec: true/None (cache with the default TTL), false (bypass), or
+            {ttl_seconds: N}
+
+    Returns:
+        (enabled, ttl_seconds); ttl_seconds is None for the cache's default
+
+    Raises:
+        ValueError: If spec is not a valid cache option
+    """
+    if spec is None or spec is True:
+        return True, None
+    if spec is False:
+        return False, None
+    if isinstance(spec, dict) and set(spec) <= {"ttl_seconds"}:
+        ttl = spec.get("ttl_seconds")
+        if ttl is not None:
+            ttl = float(ttl)
+            if ttl <= 0:
+                raise ValueError(f"cache.ttl_seconds must be > 0, got {ttl}")
+        return True, ttl
+    raise ValueError(f"Invalid cache option: {spec!r}")
+
+
+def sha256_json(data: Any) -> str:
+    """Prefixed SHA256 of the canonical JSON of data (for prompt/config hashes)."""
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f"sha256:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+class InferenceCache:
+    """
+    SQLite-backed inference result cache with TTL and LRU size cap.
+
+    Safe to share between threads; each process (e.g. forked pool workers)
+    opens its own connection to the database.
+
+    Usage:
+        cache = InferenceCache()
+        key = InferenceCache.make_key(model, prompt_hash, config_hash)
+        result = cache.get(key)
+        if result is None:
+            result = call_model(...)
+            cache.put(key, result, model=model)
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_INFERENCE_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (created on first use)
+            ttl_seconds: Default entry lifetime
+            max_entries: Entries kept before the least recently used are evicted
+            clock: Returns the current time in seconds (for testing)
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: Optional[str], prompt_hash: str, config_hash: str) -> str:
+        """
+        Compute the cache key of an inference.
+
+        Args:
+            model: Model identifier
+            prompt_hash: Hash of the prompt(s) sent to the model
+            config_hash: Hash of the inference config (temperature, max_tokens, ...)
+
+        Returns:
+            SHA256 hex digest of the three
+        """
+        raw = json.dumps([model or "", prompt_hash, config_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """The connection of this process, opened (and the schema created) on demand."""
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str, ttl_seconds: Optional[float] = None) -> Optional[dict[str, Any]]:
+        """
+        Get the cached result for a key.
+
+        Args:
+            key: Cache key from make_key()
+            ttl_seconds: Maximum entry age (default: the cache's TTL)
+
+        Returns:
+            The cached result, or None on a miss (absent or expired)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM inference_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > ttl:
+                self.misses += 1
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE inference_cache SET last_used_at = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: dict[str, Any], model: Optional[str] = None) -> None:
+        """
+        Cache a result, then purge expired entries and enforce the size cap.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable result
+            model: Model identifier (recorded for inspection)
+        """
+        now = self._clock()
+        data = json.dumps(value, default=str)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO inference_cache (key, model, value, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model or "", data, now, now),
+                )
+                conn.execute(
+                    "DELETE FROM inference_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+                (count,) = conn.execute("SELECT COUNT(*) FROM inference_cache").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM inference_cache WHERE key IN ("
+                        "SELECT key FROM inference_cache ORDER BY last_used_at LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection().execute("SELECT COUNT(*) FROM inference_cache").fetchone()
+            return count
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM inference_cache")
+
+    def close(self) -> None:
+        """Close this process's connection (reopened on next use)."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def get_inference_cache() -> InferenceCache:
+    """The process-wide cache (at DEFAULT_INFERENCE_CACHE_PATH), created on first use."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = InferenceCache(DEFAULT_INFERENCE_CACHE_PATH)
+        return _DEFAULT_CACHE
+
+
+def set_inference_cache(cache: Optional[InferenceCache]) -> None:
+    """Replace the process-wide cache (None: recreate the default on next use)."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        _DEFAULT_CACHE = cache
@@ -0,0 +1,51 @@
+"""
+Per-target run locks.
+
+A pipeline or job holds the lock named after it while it runs, so two runs
+of the same target never overlap, whichever path started them: the
+scheduler, `lorchestra run`/`pipeline`, the `lorchestra serve` daemon, or a
+parent pipeline running it as a sub-pipeline. Jobs run as children of a
+pipeline are covered by the pipeline's lock and do not take their own.
+"""
+
+import fcntl
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+# Per-target lock files, next to the run store: ~/.local/lorchestra/locks/
+DEFAULT_LOCK_DIR = Path.home() / ".local" / "lorchestra" / "locks"
+
+
+class LockHeld(Exception):
+    """The target is already running under its lock."""
+    pass
+
+
+@contextmanager
+def target_lock(target: str, lock_dir: Optional[Path] = None) -> Iterator[None]:
+    """
+    Hold the run lock of a pipeline or job.
+
+    The lock is an flock on {lock_dir}/{target}.lock, released when the
+    block exits or the process dies.
+
+    Args:
+        target: Pipeline or job id
+        lock_dir: Directory of the lock files (default: DEFAULT_LOCK_DIR)
+
+    Raises:
+        LockHeld: If another run holds the lock
+    """
+    lock_dir = Path(lock_dir) if lock_dir is not None else DEFAULT_LOCK_DIR
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / f"{target}.lock", "w") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise LockHeld(f"{target} is already running")
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
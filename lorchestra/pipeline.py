@@ -7,6 +7,13 @@ Each job is executed via lorchestra.executor.execute() — the same path as
 
 This replaces CompositeProcessor.run() which called run_job() for each child.
 
+All children of one run_pipeline() (sub-pipelines included) share a QueryCache,
+so jobs reading the same table or view with the same query hit BQ once per run.
+Every pipeline run (sub-pipelines included) holds the pipeline's target lock
+(see lorchestra.locks), so a pipeline never runs twice at once.
+Sibling reads in a static stage that differ only in one equality filter are
+coalesced into a single scan (see query_coalescer).
+
 Pipeline YAML schema (static):
     pipeline_id: pipeline.formation
     description: Run measurement events and observations jobs
@@ -37,11 +44,17 @@ Pipeline YAML schema (batch with loop):
 import json
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from lorchestra.locks import target_lock
+from lorchestra.query_cache import QueryCache
+from lorchestra.registry import JobRegistry
+from lorchestra.run_store import RunStore
+from lorchestra.watermark_store import WatermarkStore, get_default_watermark_store
+
 logger = logging.getLogger(__name__)
 
 DEFINITIONS_DIR = Path(__file__).parent / "jobs" / "definitions"
@@ -207,6 +220,10 @@ def _run_child(
     smoke_namespace: str | None,
     definitions_dir: Path | None,
     payload: dict | None = None,
+    query_cache: QueryCache | None = None,
+    watermarks: WatermarkStore | None = None,
+    registry: JobRegistry | None = None,
+    store: RunStore | None = None,
 ) -> tuple[bool, str | None, Any]:
     """Run a single child — either a pipeline (recursively) or a job via execute().
 
@@ -215,13 +232,21 @@ def _run_child(
         smoke_namespace: Optional smoke test namespace
         definitions_dir: Optional definitions directory override
         payload: Optional payload dict for @payload.* resolution in the job
+        query_cache: Optional pipeline-scoped QueryCache shared with the child
+        watermarks: Optional WatermarkStore shared with the child
+        registry: Optional JobRegistry the child's job definitions load from
+        store: Optional RunStore the child's runs are recorded in
 
     Returns:
         (success, error_message_or_none, execution_result_or_none)
     """
     if _is_pipeline(job_id, definitions_dir):
         child_spec = load_pipeline(job_id, definitions_dir)
-        child_result = run_pipeline(child_spec, smoke_namespace, definitions_dir)
+        child_result = run_pipeline(
+            child_spec, smoke_namespace, definitions_dir,
+            query_cache=query_cache, watermarks=watermarks,
+            registry=registry, store=store,
+        )
         if child_result.success:
             return True, None, None
         else:
@@ -239,6 +264,14 @@ def _run_child(
             envelope["definitions_dir"] = str(definitions_dir)
         if payload:
             envelope["payload"] = payload
+        if query_cache is not None:
+            envelope["query_cache"] = query_cache
+        if watermarks is not None:
+            envelope["watermarks"] = watermarks
+        if registry is not None:
+            envelope["registry"] = registry
+        if store is not None:
+            envelope["store"] = store
 
         exec_result = execute(envelope)
         if exec_result.success:
@@ -259,6 +292,10 @@ def run_pipeline(
     definitions_dir: Path | None = None,
     progress_callback: Callable[..., Any] | None = None,
     payload: dict | None = None,
+    query_cache: QueryCache | None = None,
+    watermarks: WatermarkStore | None = None,
+    registry: JobRegistry | None = None,
+    store: RunStore | None = None,
 ) -> PipelineResult:
     """Execute a pipeline — sequential run of jobs via execute().
 
@@ -274,10 +311,40 @@ def run_pipeline(
         progress_callback: Optional callback(event, **kwargs) for progress updates.
             Events: 'stage_start', 'job_start', 'job_ok', 'job_fail'
         payload: Optional payload dict for @payload.* resolution in loop stages
+        query_cache: Optional QueryCache to share (sub-pipelines reuse the
+            parent's); a new one is created and closed per top-level run
+        watermarks: Optional WatermarkStore shared by children and read
+            coalescing (defaults to the file store used by execute())
+        registry: Optional JobRegistry shared by children and read coalescing
+            (e.g. the daemon's warm registry; defaults to one per job)
+        store: Optional RunStore for the children's runs (defaults to the
+            store used by execute())
 
     Returns:
         PipelineResult with execution summary
+
+    Raises:
+        LockHeld: If the pipeline is already running
     """
+    with target_lock(pipeline_spec.get("pipeline_id", "unknown")):
+        return _run_pipeline(
+            pipeline_spec, smoke_namespace, definitions_dir,
+            progress_callback, payload, query_cache, watermarks, registry, store,
+        )
+
+
+def _run_pipeline(
+    pipeline_spec: dict,
+    smoke_namespace: str | None,
+    definitions_dir: Path | None,
+    progress_callback: Callable[..., Any] | None,
+    payload: dict | None,
+    query_cache: QueryCache | None,
+    watermarks: WatermarkStore | None,
+    registry: JobRegistry | None,
+    store: RunStore | None,
+) -> PipelineResult:
+    """Body of run_pipeline(), run under the pipeline's lock."""
     pipeline_id = pipeline_spec.get("pipeline_id", "unknown")
     stages = pipeline_spec.get("stages", [])
     stop_on_failure = pipeline_spec.get("stop_on_failure", False)
@@ -298,29 +365,42 @@ def run_pipeline(
     start_time = time.time()
     result = PipelineResult(pipeline_id=pipeline_id, total=total_jobs)
 
+    owns_cache = query_cache is None
+    if owns_cache:
+        query_cache = QueryCache()
+    if watermarks is None:
+        watermarks = get_default_watermark_store()
+
     def _emit(event: str, **kwargs):
         if progress_callback:
             progress_callback(event, **kwargs)
 
-    for stage in stages:
-        stage_name = stage.get("name", "unnamed")
-        stage_had_failure = False
+    try:
+        for stage in stages:
+            stage_name = stage.get("name", "unnamed")
+            stage_had_failure = False
 
-        if "loop" in stage:
-            stage_had_failure = _run_loop_stage(
-                stage, context, smoke_namespace, definitions_dir,
-                result, _emit,
-            )
-        else:
-            stage_had_failure = _run_static_stage(
-                stage, context, smoke_namespace, definitions_dir,
-                result, _emit,
-            )
+            if "loop" in stage:
+                stage_had_failure = _run_loop_stage(
+                    stage, context, smoke_namespace, definitions_dir,
+                    result, _emit, query_cache, watermarks, registry, store,
+                )
+            else:
+                stage_had_failure = _run_static_stage(
+                    stage, context, smoke_namespace, definitions_dir,
+                    result, _emit, query_cache, watermarks, registry, store,
+                )
 
-        if stage_had_failure and stop_on_failure:
-            logger.error(f"  Stage {stage_name} failed, stopping pipeline")
-            result.stopped_early = True
-            break
+            if stage_had_failure and stop_on_failure:
+                logger.error(f"  Stage {stage_name} failed, stopping pipeline")
+                result.stopped_early = True
+                break
+    finally:
+        if owns_cache:
+            logger.info(
+                f"  query cache: hits={query_cache.hits}, misses={query_cache.misses}"
+            )
+            query_cache.close()
 
     result.success = result.failed == 0
     result.duration_ms = int((time.time() - start_time) * 1000)
@@ -341,6 +421,10 @@ def _run_static_stage(
     definitions_dir: Path | None,
     result: PipelineResult,
     emit: Callable,
+    query_cache: QueryCache | None = None,
+    watermarks: WatermarkStore | None = None,
+    registry: JobRegistry | None = None,
+    store: RunStore | None = None,
 ) -> bool:
     """Run a static stage (list of job_ids). Returns True if stage had a failure."""
     stage_name = stage.get("name", "unnamed")
@@ -350,6 +434,16 @@ def _run_static_stage(
     logger.info(f"  Stage: {stage_name} ({len(jobs)} jobs)")
     emit("stage_start", stage_name=stage_name, job_count=len(jobs))
 
+    # Smoke runs inject a limit (and drop incremental) per job: nothing to share
+    if query_cache is not None and not smoke_namespace and len(jobs) > 1:
+        from lorchestra.query_coalescer import prefetch_stage_reads
+
+        try:
+            prefetch_stage_reads(jobs, definitions_dir, query_cache, watermarks, registry)
+        except Exception as e:
+            # Coalescing is an optimization: each job falls back to its own query
+            logger.warning(f"    read coalescing skipped: {e}")
+
     for job_id in jobs:
         job_start = time.time()
 
@@ -358,6 +452,8 @@ def _run_static_stage(
             emit("job_start", job_id=job_id)
             success, error_msg, exec_result = _run_child(
                 job_id, smoke_namespace, definitions_dir,
+                query_cache=query_cache, watermarks=watermarks,
+                registry=registry, store=store,
             )
             job_duration = int((time.time() - job_start) * 1000)
 
@@ -392,6 +488,10 @@ def _run_loop_stage(
     definitions_dir: Path | None,
     result: PipelineResult,
     emit: Callable,
+    query_cache: QueryCache | None = None,
+    watermarks: WatermarkStore | None = None,
+    registry: JobRegistry | None = None,
+    store: RunStore | None = None,
 ) -> bool:
     """Run a loop stage — iterate over a prior job's output and run jobs per item.
 
@@ -412,7 +512,8 @@ def _run_loop_stage(
 
     # Resolve the items to iterate over
     items = _resolve_context_ref(loop_config["over"], context)
-    if not isinstance(items, list):
+    # Any sequence of items, including a spilled job output (SpilledItems)
+    if not isinstance(items, Sequence) or isinstance(items, (str, bytes)):
         logger.warning(f"  Stage: {stage_name} loop over resolved to non-list, skipping")
         items = []
 
@@ -437,7 +538,8 @@ def _run_loop_stage(
                 emit("job_start", job_id=job_id)
                 success, error_msg, exec_result = _run_child(
                     job_id, smoke_namespace, definitions_dir,
-                    payload=resolved_payload,
+                    payload=resolved_payload, query_cache=query_cache,
+                    watermarks=watermarks, registry=registry, store=store,
                 )
                 job_duration = int((time.time() - job_start) * 1000)
 
@@ -29,14 +29,23 @@ Idempotency key computation:
 import hashlib
 import json
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
 from lorchestra.callable.result import CallableResult
+from lorchestra.row_decoder import LazyJson, json_default
+from lorchestra.watermark_store import normalize_watermark
 
 
 PLAN_VERSION = "storacle.plan/1.0.0"
 
+# Batches smaller than this are always built in-process
+POOL_MIN_ROWS = 20_000
+
+# Encoder for payload_wrap; same output as json.dumps(item, default=str)
+_PAYLOAD_ENCODER = json.JSONEncoder(default=str)
+
 
 @dataclass
 class StoracleOp:
@@ -72,9 +81,22 @@ class StoraclePlan:
     """
     correlation_id: str = ""
     ops: list[StoracleOp] = field(default_factory=list)
+    # Build statistics (e.g. rows, duplicates); not part of the contract dict
+    stats: dict = field(default_factory=dict, compare=False)
+    # Row columns that change every run (auto timestamps); ignored by content_hash
+    volatile_columns: tuple[str, ...] = field(default=(), compare=False)
+    _serialized: dict | None = field(default=None, init=False, repr=False, compare=False)
+    _content_hash: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        """Convert to storacle.plan/1.0.0 contract dict."""
+        """
+        Convert to storacle.plan/1.0.0 contract dict.
+
+        The result is cached: a plan is treated as immutable once serialized,
+        so plan_id (a hash over every row) is computed once per plan.
+        """
+        if self._serialized is not None:
+            return self._serialized
         ops_list = [op.to_dict() for op in self.ops]
         plan = {
             "plan_version": PLAN_VERSION,
@@ -85,8 +107,26 @@ class StoraclePlan:
             },
             "ops": ops_list,
         }
+        self._serialized = plan
         return plan
 
+    def content_hash(self) -> str:
+        """
+        Hash of what the plan writes, stable across runs of unchanged data.
+
+        Unlike plan_id it ignores op ids, correlation ids and volatile row
+        columns (volatile_columns plus any op-level auto_timestamp_columns),
+        so two runs over the same source rows hash equal. Computed once.
+
+        Returns:
+            SHA256 hash prefixed with "sha256:"
+        """
+        if self._content_hash is None:
+            self._content_hash = _hash_canonical({
+                "ops": [_content_op(op, self.volatile_columns) for op in self.ops],
+            })
+        return self._content_hash
+
     @classmethod
     def _from_dict(cls, d: dict) -> "StoraclePlan":
         """Reconstruct from a serialized plan dict (round-trip support)."""
@@ -104,6 +144,132 @@ class StoraclePlan:
         return cls(correlation_id=correlation_id, ops=ops)
 
 
+class PlanHandle(Mapping):
+    """
+    A live StoraclePlan carried from plan.build to storacle.submit.
+
+    plan.build returns {"plan": PlanHandle(plan)} and storacle.submit takes
+    the StoraclePlan straight off the handle, so batch rows are not copied
+    through a dict round trip between the two steps. The handle reads as the
+    storacle.plan/1.0.0 dict (e.g. output["plan"]["ops"]); that dict is only
+    built when something reads it or serializes it (run store, RPC boundary).
+    """
+
+    __slots__ = ("plan",)
+
+    def __init__(self, plan: StoraclePlan):
+        self.plan = plan
+
+    def to_dict(self) -> dict:
+        """The storacle.plan/1.0.0 contract dict (built once, then cached)."""
+        return self.plan.to_dict()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"PlanHandle(correlation_id={self.plan.correlation_id!r}, ops={len(self.plan.ops)})"
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+
+def to_columnar(rows: list[dict]) -> dict | None:
+    """
+    Encode uniform rows as a columnar block.
+
+    Block format (op param `rows_columnar`):
+        {"count": n, "constants": {col: value}, "columns": {col: [v0, v1, ...]}}
+
+    Columns whose value is identical on every row are stored once under
+    constants; the rest are stored as one list per column.
+
+    Args:
+        rows: Rows to encode
+
+    Returns:
+        Columnar block, or None if the rows do not all have the same columns
+    """
+    if not rows:
+        return None
+    keys = list(rows[0])
+    key_set = rows[0].keys()
+    if any(row.keys() != key_set for row in rows):
+        return None
+
+    constants: dict[str, Any] = {}
+    columns: dict[str, list] = {}
+    for key in keys:
+        values = [row[key] for row in rows]
+        first = values[0]
+        first_type = type(first)
+        if all(type(v) is first_type and v == first for v in values):
+            constants[key] = first
+        else:
+            columns[key] = values
+    return {"count": len(rows), "constants": constants, "columns": columns}
+
+
+def expand_columnar(block: dict) -> list[dict]:
+    """
+    Decode a columnar block back to a list of row dicts.
+
+    Args:
+        block: Block from to_columnar()
+
+    Returns:
+        Rows (fresh dicts; constant values are shared, not copied)
+    """
+    constants = block.get("constants", {})
+    columns = block.get("columns", {})
+    if not columns:
+        return [dict(constants) for _ in range(block["count"])]
+    names = list(columns)
+    rows = []
+    for values in zip(*(columns[name] for name in names)):
+        row = dict(constants)
+        row.update(zip(names, values))
+        rows.append(row)
+    return rows
+
+
+def op_rows(params: dict) -> list[dict]:
+    """
+    Get the rows of a batch op, whether stored as `rows` or `rows_columnar`.
+
+    Use this instead of params["rows"] when reading batch rows.
+    """
+    if "rows_columnar" in params:
+        return expand_columnar(params["rows_columnar"])
+    return params.get("rows", [])
+
+
+def expand_plan_dict(plan: dict) -> dict:
+    """
+    Return a plan dict with every columnar op expanded to `rows`.
+
+    Used at the storacle boundary. The input dict (often the plan's cached
+    to_dict()) is not modified.
+    """
+    if not any("rows_columnar" in op.get("params", {}) for op in plan.get("ops", [])):
+        return plan
+    ops = []
+    for op in plan["ops"]:
+        params = op.get("params", {})
+        if "rows_columnar" in params:
+            params = {k: v for k, v in params.items() if k != "rows_columnar"}
+            params["rows"] = expand_columnar(op["params"]["rows_columnar"])
+            op = {**op, "params": params}
+        ops.append(op)
+    return {**plan, "ops": ops}
+
+
 def _hash_canonical(data: dict) -> str:
     """
     Compute canonical hash of a dictionary.
@@ -116,11 +282,24 @@ def _hash_canonical(data: dict) -> str:
     Returns:
         SHA256 hash prefixed with "sha256:"
     """
-    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=json_default)
     digest = hashlib.sha256(canonical.encode()).hexdigest()
     return f"sha256:{digest}"
 
 
+def _content_op(op: StoracleOp, volatile_columns: tuple[str, ...]) -> dict:
+    """An op's method and params with per-run values removed (for content_hash)."""
+    params = dict(op.params)
+    volatile = {"correlation_id", *volatile_columns, *(params.get("auto_timestamp_columns") or ())}
+    if "rows" in params or "rows_columnar" in params:
+        params.pop("rows_columnar", None)
+        params["rows"] = [
+            {k: v for k, v in row.items() if k not in volatile} if isinstance(row, Mapping) else row
+            for row in op_rows(op.params)
+        ]
+    return {"method": op.method, "params": params}
+
+
 def _compute_idempotency_key(item: dict, method: str) -> str:
     """
     Compute deterministic idempotency key from stable identity fields.
@@ -164,11 +343,8 @@ def build_plan(
     """
     Convert CallableResult to StoraclePlan.
 
-    Each item in the result becomes a storacle op.
-
-    v0 note: items_ref is allowed in CallableResult but NOT executed.
-    If items_ref is set, this function raises - caller must dereference first
-    or the callable should return items inline for now.
+    Each item in the result becomes a storacle op. With items_ref, the items
+    are read from the spill file it points at (see lorchestra.spill).
 
     Args:
         result: CallableResult from callable dispatch
@@ -179,15 +355,14 @@ def build_plan(
         StoraclePlan ready for submission to storacle
 
     Raises:
-        NotImplementedError: If items_ref is set (v0 limitation)
+        ValueError: If items_ref does not point at a spill file
     """
-    if result.items_ref is not None:
-        raise NotImplementedError(
-            "items_ref not supported in v0 - callables must return inline items"
-        )
-
     ops: list[StoracleOp] = []
-    items = result.items or []
+    if result.items_ref is not None:
+        from lorchestra.spill import open_items_ref
+        items = open_items_ref(result.items_ref)
+    else:
+        items = result.items or []
 
     for item in items:
         op = StoracleOp(
@@ -300,42 +475,6 @@ def _resolve_dataset(logical_name: str) -> str:
     return getattr(config, attr)
 
 
-def _compute_idem_key(
-    item: dict,
-    id_field: str,
-    field_defaults: dict[str, Any] | None = None,
-) -> str:
-    """
-    Compute idem_key from raw item identity field + metadata.
-
-    Pattern: {source_system}:{connection_name}:{object_type}:{item[id_field]}
-
-    Args:
-        item: Raw item dict (pre-wrapping, original callable output)
-        id_field: Key to extract the unique identifier from the raw item
-        field_defaults: Metadata dict containing source_system, connection_name, object_type
-
-    Returns:
-        Idem key string
-
-    Raises:
-        ValueError: If id_field not found in item or required metadata missing
-    """
-    defaults = field_defaults or {}
-    id_value = item.get(id_field)
-    if id_value is None:
-        raise ValueError(
-            f"id_field '{id_field}' not found in item. "
-            f"Available keys: {list(item.keys())}"
-        )
-
-    source_system = defaults.get("source_system", "")
-    connection_name = defaults.get("connection_name", "")
-    object_type = defaults.get("object_type", "")
-
-    return f"{source_system}:{connection_name}:{object_type}:{id_value}"
-
-
 def _extract_external_id(item: dict) -> str | None:
     """
     Extract natural external_id from a raw item payload.
@@ -381,6 +520,9 @@ def build_plan_from_items(
     idem_key_suffix: str | None = None,
     # MERGE behavior params
     skip_update_columns: list[str] | None = None,
+    build_workers: int | None = None,
+    columnar: bool = False,
+    dedupe: str | dict | None = None,
 ) -> StoraclePlan:
     """
     Build StoraclePlan from raw items. Used by plan.build native op.
@@ -413,9 +555,15 @@ def build_plan_from_items(
         auto_timestamp_columns: Column names to auto-fill with current UTC timestamp
         skip_update_columns: Columns to exclude from UPDATE SET in MERGE
             (still included in INSERT). For immutable columns like created_at.
+        build_workers: Process pool size for building very large batches
+        columnar: If true, batch rows are carried as a `rows_columnar` block
+            (see to_columnar) instead of `rows`
+        dedupe: Collapse batch rows sharing key_columns values before
+            submit: "last", "first", or {"max_by": column} (see _dedupe_rows)
 
     Returns:
-        StoraclePlan ready for submission to storacle
+        StoraclePlan ready for submission to storacle (batch mode records
+        rows/duplicates in plan.stats)
     """
     batch_mode = dataset is not None and table is not None and key_columns is not None
 
@@ -436,6 +584,9 @@ def build_plan_from_items(
             auto_timestamp_columns=auto_timestamp_columns,
             idem_key_suffix=idem_key_suffix,
             skip_update_columns=skip_update_columns,
+            build_workers=build_workers,
+            columnar=columnar,
+            dedupe=dedupe,
         )
 
     # Non-batch mode: one op per item (existing behavior)
@@ -457,6 +608,291 @@ def build_plan_from_items(
     )
 
 
+def _encode_payloads(items: list[dict]) -> list[str]:
+    """
+    JSON-encode raw items for payload_wrap, batched.
+
+    The text is exactly json.dumps(item, default=str): stored payloads (and
+    plan content hashes) must not depend on which libraries are installed.
+    One shared encoder saves building a JSONEncoder per item.
+    """
+    encode = _PAYLOAD_ENCODER.encode
+    return [encode(item) for item in items]
+
+
+class _RowTransformer:
+    """
+    Compiled batch row transform (steps 1-8 of _build_batch_plan).
+
+    Everything that is constant across a plan (idem_key prefix, timestamp
+    columns, defaults, allowlist) is worked out once; apply() then runs a
+    tight per-row path. Instances are picklable so chunks can be handed to
+    a process pool.
+    """
+
+    def __init__(
+        self,
+        correlation_id: str,
+        fields: list[str] | None,
+        field_map: dict[str, str] | None,
+        field_defaults: dict[str, Any] | None,
+        payload_wrap: bool,
+        id_field: str | None,
+        auto_external_id: bool,
+        auto_timestamp_columns: list[str] | None,
+        idem_key_suffix: str | None,
+        now: str,
+    ):
+        defaults = field_defaults or {}
+        self.correlation_id = correlation_id
+        self.payload_wrap = payload_wrap
+        self.auto_external_id = auto_external_id
+        self.defaults = dict(defaults)
+        self.timestamps = {col: now for col in auto_timestamp_columns or []}
+        self.id_field = id_field
+        self.idem_prefix = (
+            f"{defaults.get('source_system', '')}:"
+            f"{defaults.get('connection_name', '')}:"
+            f"{defaults.get('object_type', '')}:"
+        )
+        self.idem_key_suffix = f"#{idem_key_suffix}" if idem_key_suffix else None
+        self.field_map = list((field_map or {}).items())
+        self.fields = list(fields) if fields else None
+        self.field_set = frozenset(fields) if fields else None
+        self.template = self._compile_template()
+
+    def _compile_template(self) -> dict | None:
+        """
+        Precompute the constant part of payload_wrap rows.
+
+        A wrapped row is the payload, external_id and idem_key (per item) on
+        top of columns that are the same for every row: defaults, timestamps
+        and correlation_id. When no field_map can rename columns, that
+        constant part is built and allowlist-filtered once; each row is then
+        a copy of it plus the per-item columns.
+
+        Returns:
+            Row template, or None when rows must take the general path
+        """
+        if not self.payload_wrap or self.field_map:
+            return None
+        per_item = {"payload", "external_id"} if self.auto_external_id else {"payload"}
+        if per_item & self.timestamps.keys():
+            return None
+
+        template = {k: v for k, v in self.defaults.items() if k not in per_item}
+        template.update(self.timestamps)
+        template.setdefault("correlation_id", self.correlation_id)
+        if self.id_field:
+            per_item.add("idem_key")
+        elif self.idem_key_suffix and "idem_key" in template:
+            template["idem_key"] = f"{template['idem_key']}{self.idem_key_suffix}"
+
+        if self.field_set is not None:
+            if not self.field_set <= template.keys() | per_item:
+                return None  # General path raises the missing-field error
+            template = {k: v for k, v in template.items() if k in self.field_set}
+        return template
+
+    def _wanted(self, column: str) -> bool:
+        return self.field_set is None or column in self.field_set
+
+    def _apply_template(self, items: list[dict], payloads: list[str]) -> list[dict]:
+        """Build payload_wrap rows from the precomputed template."""
+        template = self.template
+        want_payload = self._wanted("payload")
+        want_external_id = self.auto_external_id and self._wanted("external_id")
+        id_field = self.id_field
+        want_idem_key = bool(id_field) and self._wanted("idem_key")
+        idem_prefix = self.idem_prefix
+        suffix = self.idem_key_suffix or ""
+
+        rows: list[dict] = []
+        for i, item in enumerate(items):
+            row = template.copy()
+            if want_payload:
+                row["payload"] = payloads[i]
+            if want_external_id:
+                row["external_id"] = _extract_external_id(item)
+            if id_field:
+                id_value = item.get(id_field)
+                if id_value is None:
+                    raise ValueError(
+                        f"id_field '{id_field}' not found in item. "
+                        f"Available keys: {list(item.keys())}"
+                    )
+                if want_idem_key:
+                    row["idem_key"] = f"{idem_prefix}{id_value}{suffix}"
+            rows.append(row)
+        return rows
+
+    def apply(self, items: list[dict]) -> list[dict]:
+        """Transform items into rows."""
+        payloads = _encode_payloads(items) if self.payload_wrap else None
+        if self.template is not None:
+            return self._apply_template(items, payloads)
+
+        defaults = self.defaults
+        timestamps = self.timestamps
+        correlation_id = self.correlation_id
+        id_field = self.id_field
+        idem_prefix = self.idem_prefix
+        suffix = self.idem_key_suffix
+        field_map = self.field_map
+        field_set = self.field_set
+
+        rows: list[dict] = []
+        for i, item in enumerate(items):
+            # 1. Payload wrapping
+            if payloads is not None:
+                row: dict[str, Any] = {"payload": payloads[i]}
+            else:
+                # Untouched lazy JSON cells go out as their original text
+                row = {
+                    k: v.encoded() if isinstance(v, LazyJson) else v
+                    for k, v in item.items()
+                }
+
+            # 2. Extract external_id from raw item (before payload_wrap hides fields)
+            if self.auto_external_id:
+                row["external_id"] = _extract_external_id(item)
+
+            # 3. Field defaults (metadata injection; existing keys win)
+            if defaults:
+                row = {**defaults, **row}
+
+            # 4. Auto timestamp columns (e.g. first_seen, last_seen, canonicalized_at)
+            if timestamps:
+                row.update(timestamps)
+
+            # 5. Correlation ID — inject into each row (V1 stores it per-row)
+            if "correlation_id" not in row:
+                row["correlation_id"] = correlation_id
+
+            # 6. Idem key computation (before field_map/fields, uses raw item)
+            if id_field:
+                id_value = item.get(id_field)
+                if id_value is None:
+                    raise ValueError(
+                        f"id_field '{id_field}' not found in item. "
+                        f"Available keys: {list(item.keys())}"
+                    )
+                row["idem_key"] = f"{idem_prefix}{id_value}"
+
+            # 6b. Idem key suffix: append #suffix to existing idem_key
+            if suffix and "idem_key" in row:
+                row["idem_key"] = f"{row['idem_key']}{suffix}"
+
+            # 7. Field map (rename keys)
+            for new_key, old_key in field_map:
+                if old_key in row:
+                    row[new_key] = row.pop(old_key)
+
+            # 8. Fields allowlist
+            if field_set is not None:
+                if not field_set <= row.keys():
+                    missing = [f for f in self.fields if f not in row]
+                    raise ValueError(
+                        f"Item missing required field(s): {missing}. "
+                        f"Available: {list(row.keys())}"
+                    )
+                if len(row) != len(field_set):
+                    row = {k: v for k, v in row.items() if k in field_set}
+
+            rows.append(row)
+        return rows
+
+
+def _transform_rows(
+    transformer: _RowTransformer,
+    items: list[dict],
+    workers: int | None,
+) -> list[dict]:
+    """
+    Apply a row transformer, over a process pool for very large batches.
+
+    Args:
+        transformer: Compiled transformer
+        items: Items to transform
+        workers: Process pool size (None/0/1: transform in-process). The
+            pool is only used from POOL_MIN_ROWS items, below which pickling
+            items to workers costs more than it saves.
+
+    Returns:
+        Rows in item order
+    """
+    if not workers or workers <= 1 or len(items) < POOL_MIN_ROWS:
+        return transformer.apply(items)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(items) // workers)
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [row for chunk in pool.map(transformer.apply, chunks) for row in chunk]
+
+
+def _dedupe_policy(dedupe: str | dict) -> tuple[str, str | None]:
+    """
+    Parse a dedupe spec into (policy, max_by column).
+
+    Raises:
+        ValueError: If the spec is not "last", "first" or {"max_by": column}
+    """
+    if dedupe in ("last", "first"):
+        return dedupe, None
+    if isinstance(dedupe, dict) and set(dedupe) == {"max_by"} and isinstance(dedupe["max_by"], str):
+        return "max_by", dedupe["max_by"]
+    raise ValueError(
+        f"Invalid dedupe policy {dedupe!r}: expected 'last', 'first' or {{max_by: column}}"
+    )
+
+
+def _max_by_value(value: Any) -> tuple:
+    """Sort key for max_by: None lowest, timestamps compared in UTC."""
+    if value is None:
+        return (0, None)
+    if isinstance(value, str):
+        try:
+            return (1, normalize_watermark(value))
+        except ValueError:
+            pass
+    return (1, value)
+
+
+def _dedupe_rows(
+    rows: list[dict],
+    key_columns: list[str],
+    dedupe: str | dict,
+) -> tuple[list[dict], int]:
+    """
+    Collapse rows that share the same key_columns values.
+
+    BigQuery MERGE rejects a source with several rows per key, and
+    overlapping ingest windows or paginated APIs can yield the same object
+    twice in one batch. Policies:
+    - "last": the last row for a key wins
+    - "first": the first row for a key wins
+    - {"max_by": column}: the row with the greatest column value wins
+      (ISO timestamps compared in UTC, nulls lowest, ties go to the later row)
+
+    Kept rows stay in the order their key first appeared.
+
+    Returns:
+        (deduplicated rows, number of rows dropped)
+    """
+    policy, column = _dedupe_policy(dedupe)
+    kept: dict[tuple, dict] = {}
+    for row in rows:
+        key = tuple(row.get(k) for k in key_columns)
+        current = kept.get(key)
+        if current is None or policy == "last":
+            kept[key] = row
+        elif policy == "max_by" and _max_by_value(row.get(column)) >= _max_by_value(current.get(column)):
+            kept[key] = row
+    return list(kept.values()), len(rows) - len(kept)
+
+
 def _build_batch_plan(
     items: list[dict],
     correlation_id: str,
@@ -473,6 +909,9 @@ def _build_batch_plan(
     auto_timestamp_columns: list[str] | None = None,
     idem_key_suffix: str | None = None,
     skip_update_columns: list[str] | None = None,
+    build_workers: int | None = None,
+    columnar: bool = False,
+    dedupe: str | dict | None = None,
 ) -> StoraclePlan:
     """
     Build a batch StoraclePlan: all rows bundled into a single op.
@@ -486,67 +925,33 @@ def _build_batch_plan(
     6. id_field: compute idem_key
     7. field_map: rename keys
     8. fields: column allowlist
-    9. Bundle into single {dataset, table, key_columns, rows} op
+    9. dedupe: collapse rows sharing key_columns values
+    10. Bundle into single {dataset, table, key_columns, rows} op
+       (rows_columnar instead of rows when columnar and the rows are uniform)
+
+    Steps 1-8 are compiled once into a _RowTransformer and applied across
+    all items (optionally over build_workers processes).
     """
     from datetime import datetime, timezone
 
     now = datetime.now(timezone.utc).isoformat()
-    rows: list[dict] = []
-
-    for item in items:
-        row: dict[str, Any] = {}
-
-        # 1. Payload wrapping
-        if payload_wrap:
-            row["payload"] = json.dumps(item, default=str)
-        else:
-            row = dict(item)
-
-        # 2. Extract external_id from raw item (before payload_wrap hides fields)
-        if auto_external_id:
-            row["external_id"] = _extract_external_id(item)
-
-        # 3. Field defaults (metadata injection)
-        if field_defaults:
-            for key, default in field_defaults.items():
-                if key not in row:
-                    row[key] = default
-
-        # 4. Auto timestamp columns (e.g. first_seen, last_seen, canonicalized_at)
-        if auto_timestamp_columns:
-            for col in auto_timestamp_columns:
-                row[col] = now
-
-        # 5. Correlation ID — inject into each row (V1 stores it per-row)
-        if "correlation_id" not in row:
-            row["correlation_id"] = correlation_id
-
-        # 6. Idem key computation (before field_map/fields, uses raw item)
-        if id_field:
-            row["idem_key"] = _compute_idem_key(item, id_field, field_defaults)
-
-        # 6b. Idem key suffix: append #suffix to existing idem_key
-        if idem_key_suffix and "idem_key" in row:
-            raw_key = row["idem_key"]
-            row["idem_key"] = f"{raw_key}#{idem_key_suffix}"
-
-        # 7. Field map (rename keys)
-        if field_map:
-            for new_key, old_key in field_map.items():
-                if old_key in row:
-                    row[new_key] = row.pop(old_key)
-
-        # 8. Fields allowlist
-        if fields:
-            missing = [f for f in fields if f not in row]
-            if missing:
-                raise ValueError(
-                    f"Item missing required field(s): {missing}. "
-                    f"Available: {list(row.keys())}"
-                )
-            row = {k: v for k, v in row.items() if k in fields}
-
-        rows.append(row)
+    transformer = _RowTransformer(
+        correlation_id=correlation_id,
+        fields=fields,
+        field_map=field_map,
+        field_defaults=field_defaults,
+        payload_wrap=payload_wrap,
+        id_field=id_field,
+        auto_external_id=auto_external_id,
+        auto_timestamp_columns=auto_timestamp_columns,
+        idem_key_suffix=idem_key_suffix,
+        now=now,
+    )
+    rows = _transform_rows(transformer, items, build_workers)
+    rows_in = len(rows)
+    duplicates = 0
+    if dedupe:
+        rows, duplicates = _dedupe_rows(rows, key_columns, dedupe)
 
     # Resolve logical dataset name
     resolved_dataset = _resolve_dataset(dataset)
@@ -558,6 +963,11 @@ def _build_batch_plan(
         "key_columns": key_columns,
         "rows": rows,
     }
+    if columnar:
+        block = to_columnar(rows)
+        if block is not None:
+            del op_params["rows"]
+            op_params["rows_columnar"] = block
     if skip_update_columns:
         op_params["skip_update_columns"] = skip_update_columns
 
@@ -570,4 +980,6 @@ def _build_batch_plan(
     return StoraclePlan(
         correlation_id=correlation_id,
         ops=[op],
+        stats={"rows_in": rows_in, "rows": len(rows), "duplicates": duplicates},
+        volatile_columns=tuple(auto_timestamp_columns or ()),
     )
@@ -5,19 +5,34 @@ Used by the storacle.query native op in the executor. SQL construction
 lives in lorchestra (here); storacle just executes it (bq.query RPC).
 
 Supports:
-- Simple queries with equality filters (dict format: {column: value})
+- Simple queries with equality filters (dict format: {column: value}),
+  where a list value becomes an IN filter ({column: [v1, v2]})
 - Extended filters with operators (list format: [{column, op, value}])
 - Incremental queries (left_anti, not_exists) with optional join_key_suffix
+- Watermark queries (mode: watermark) filtering on a persisted high-water mark
+- Keyset pagination (paginate: {key, page_size, after})
+- Range sharding (shard: {column, count | bucket}) for parallel reads
 - Parameterized queries (no string interpolation of filter values)
 """
 
 from dataclasses import dataclass
-from typing import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
 
 
 # Allowed comparison operators (SQL-safe)
 ALLOWED_OPS = {"=", "!=", "<", ">", "<=", ">="}
 
+# Time buckets for `shard.bucket` (TIMESTAMP shard columns)
+SHARD_BUCKETS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+# Upper bound on shards per query (guards against tiny buckets over long ranges)
+MAX_SHARDS = 256
+
 
 @dataclass
 class QueryParam:
@@ -35,7 +50,8 @@ def _build_where_clauses(
     """Build WHERE clauses from filters.
 
     Supports two filter formats:
-    1. Dict format (legacy): {column: value} - equality only
+    1. Dict format (legacy): {column: value} - equality only; a list value
+       becomes `column IN (@column_0, @column_1, ...)`
     2. List format (extended): [{column, op, value}] - with operators
 
     Args:
@@ -51,6 +67,17 @@ def _build_where_clauses(
     if isinstance(filters, dict):
         # Legacy dict format: {column: value}
         for col, val in filters.items():
+            if isinstance(val, (list, tuple)):
+                if not val:
+                    where_clauses.append("FALSE")
+                    continue
+                names = [f"{col}_{i}" for i in range(len(val))]
+                where_clauses.append(
+                    f"{prefix}{col} IN ({', '.join(f'@{n}' for n in names)})"
+                )
+                for name, v in zip(names, val):
+                    query_params.append(QueryParam(name=name, type="STRING", value=str(v)))
+                continue
             where_clauses.append(f"{prefix}{col} = @{col}")
             query_params.append(QueryParam(name=col, type="STRING", value=str(val)))
     elif isinstance(filters, list):
@@ -72,6 +99,197 @@ def _build_where_clauses(
     return where_clauses
 
 
+def _build_page_clauses(
+    paginate: dict,
+    columns: list[str],
+    query_params: list[QueryParam],
+    prefix: str = "",
+) -> tuple[list[str], str, str]:
+    """Build keyset pagination clauses.
+
+    Each page is `WHERE key > @_page_after ORDER BY key LIMIT page_size`.
+    The first page has no `after` value and therefore no key predicate.
+
+    Args:
+        paginate: Pagination spec {key, page_size, after (optional), key_type (optional)}.
+        columns: Selected columns (the key must be selected to advance the cursor).
+        query_params: List to append the cursor QueryParam to.
+        prefix: Column prefix (e.g., "s." for incremental queries).
+
+    Returns:
+        Tuple of (extra WHERE clauses, ORDER BY clause, LIMIT clause).
+
+    Raises:
+        ValueError: If the key is missing from the selection or page_size is invalid.
+    """
+    key = paginate["key"]
+    page_size = int(paginate["page_size"])
+    if page_size <= 0:
+        raise ValueError(f"paginate.page_size must be positive, got {page_size}")
+    if "*" not in columns and key not in columns:
+        raise ValueError(
+            f"paginate.key '{key}' must be one of the selected columns: {columns}"
+        )
+
+    where_clauses: list[str] = []
+    after = paginate.get("after")
+    if after is not None:
+        where_clauses.append(f"{prefix}{key} > @_page_after")
+        query_params.append(QueryParam(
+            name="_page_after",
+            type=paginate.get("key_type", "STRING"),
+            value=str(after),
+        ))
+    return where_clauses, f" ORDER BY {prefix}{key}", f" LIMIT {page_size}"
+
+
+def _build_shard_clauses(
+    shard: dict,
+    query_params: list[QueryParam],
+    prefix: str = "",
+) -> list[str]:
+    """Build the range predicate for one shard.
+
+    A shard covers `start <= column < end`. The first shard has no start and
+    also takes NULLs; the last shard has no end. A shard spec without start
+    and end (the unsharded query) adds no predicate.
+
+    Args:
+        shard: Shard spec {column, type (optional), start, end}.
+        query_params: List to append the bound QueryParams to.
+        prefix: Column prefix (e.g., "s." for incremental queries).
+
+    Returns:
+        List of WHERE clause strings.
+    """
+    col = f"{prefix}{shard['column']}"
+    col_type = shard.get("type", "TIMESTAMP")
+    start = shard.get("start")
+    end = shard.get("end")
+
+    where_clauses: list[str] = []
+    if start is not None:
+        where_clauses.append(f"{col} >= @_shard_start")
+        query_params.append(QueryParam(name="_shard_start", type=col_type, value=str(start)))
+    if end is not None:
+        if start is None:
+            where_clauses.append(f"({col} < @_shard_end OR {col} IS NULL)")
+        else:
+            where_clauses.append(f"{col} < @_shard_end")
+        query_params.append(QueryParam(name="_shard_end", type=col_type, value=str(end)))
+    return where_clauses
+
+
+def build_shard_bounds_query(
+    params: dict,
+    *,
+    resolve_dataset: Callable[[str], str],
+) -> tuple[str, list[QueryParam]]:
+    """Build the MIN/MAX query used to split a sharded query into ranges.
+
+    Reads the source table with the query's filters (and watermark, in
+    watermark mode). Incremental joins are not applied, so the bounds may be
+    wider than the query's result; shards are still disjoint and complete.
+
+    Args:
+        params: Declarative query params with a `shard` spec.
+        resolve_dataset: Resolves logical dataset names to BQ dataset names.
+
+    Returns:
+        Tuple of (SQL string returning one row {lo, hi}, list of QueryParam).
+    """
+    dataset = resolve_dataset(params["dataset"])
+    column = params["shard"]["column"]
+    incremental = params.get("incremental") or {}
+
+    query_params: list[QueryParam] = []
+    where_clauses = _build_where_clauses(params.get("filters", {}), query_params, "s.")
+    watermark = incremental.get("watermark") if incremental.get("mode") == "watermark" else None
+    if watermark is not None:
+        source_ts = incremental.get("source_ts", "last_seen")
+        where_clauses.append(f"s.{source_ts} > @_watermark")
+        query_params.append(QueryParam(name="_watermark", type="TIMESTAMP", value=str(watermark)))
+    where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
+    return (
+        f"SELECT MIN(s.{column}) AS lo, MAX(s.{column}) AS hi "
+        f"FROM `{dataset}.{params['table']}` s WHERE {where_sql}",
+        query_params,
+    )
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    """Parse a BQ timestamp (datetime or ISO string) as an aware UTC datetime."""
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def shard_boundaries(lo: Any, hi: Any, shard: dict) -> list[str]:
+    """Compute the interior cut points splitting [lo, hi] into shards.
+
+    `count` splits the range into that many equal-width shards; `bucket`
+    (hour, day, week) cuts at every bucket boundary inside the range.
+    N cut points give N + 1 shards.
+
+    Args:
+        lo: Minimum shard column value (from build_shard_bounds_query).
+        hi: Maximum shard column value.
+        shard: Shard spec {column, count | bucket, type (optional)}.
+
+    Returns:
+        Sorted, distinct cut points as strings (empty: run unsharded).
+
+    Raises:
+        ValueError: If the spec is invalid or yields more than MAX_SHARDS shards.
+    """
+    if lo is None or hi is None:
+        return []
+    col_type = shard.get("type", "TIMESTAMP")
+    bucket = shard.get("bucket")
+    count = shard.get("count")
+    if (bucket is None) == (count is None):
+        raise ValueError("shard requires exactly one of 'count' or 'bucket'")
+
+    if col_type == "INT64":
+        if bucket is not None:
+            raise ValueError("shard.bucket requires a TIMESTAMP column")
+        lo, hi, count = int(lo), int(hi), int(count)
+        if count <= 0:
+            raise ValueError(f"shard.count must be positive, got {count}")
+        cuts = sorted({lo + (hi - lo) * i // count for i in range(1, count)} - {lo})
+        return [str(c) for c in cuts]
+
+    if col_type != "TIMESTAMP":
+        raise ValueError(f"Unsupported shard type '{col_type}'. Allowed: TIMESTAMP, INT64")
+
+    lo, hi = _parse_timestamp(lo), _parse_timestamp(hi)
+    if bucket is not None:
+        if bucket not in SHARD_BUCKETS:
+            raise ValueError(f"Invalid shard.bucket '{bucket}'. Allowed: {set(SHARD_BUCKETS)}")
+        width = SHARD_BUCKETS[bucket]
+        epoch = datetime(1970, 1, 5, tzinfo=timezone.utc)  # a Monday, so weeks align
+        cut = epoch + ((lo - epoch) // width + 1) * width
+        cuts = []
+        while cut <= hi:
+            cuts.append(cut)
+            if len(cuts) >= MAX_SHARDS:
+                raise ValueError(
+                    f"shard.bucket '{bucket}' yields more than {MAX_SHARDS} shards"
+                )
+            cut += width
+    else:
+        count = int(count)
+        if count <= 0:
+            raise ValueError(f"shard.count must be positive, got {count}")
+        step = (hi - lo) / count
+        cuts = sorted({lo + step * i for i in range(1, count)} - {lo})
+    if len(cuts) >= MAX_SHARDS:
+        raise ValueError(f"shard yields more than {MAX_SHARDS} shards")
+    return [c.isoformat() for c in cuts]
+
+
 def build_query(
     params: dict,
     *,
@@ -96,22 +314,45 @@ def build_query(
     limit = params.get("limit")
     incremental = params.get("incremental")
     order_by = params.get("order_by")
+    paginate = params.get("paginate")
+    shard = params.get("shard")
+
+    if shard and (limit or paginate):
+        raise ValueError("shard cannot be combined with limit or paginate")
+    # The watermark advances to the newest source_ts read: rows a truncated
+    # read leaves behind would fall below it and never be read
+    if incremental and incremental.get("mode") == "watermark" and (
+        limit or (paginate or {}).get("max_pages")
+    ):
+        raise ValueError("watermark mode cannot be combined with limit or paginate.max_pages")
 
     query_params: list[QueryParam] = []
 
     # Build WHERE from filters (parameterized)
     prefix = "s." if incremental else ""
     where_clauses = _build_where_clauses(filters, query_params, prefix)
+    if shard:
+        where_clauses.extend(_build_shard_clauses(shard, query_params, prefix))
 
     source = f"`{dataset}.{table}`"
 
     limit_clause = f" LIMIT {int(limit)}" if limit else ""
 
+    # Keyset pagination: key cursor + ORDER BY key + LIMIT page_size
+    page_order_clause = ""
+    if paginate:
+        page_where, page_order_clause, limit_clause = _build_page_clauses(
+            paginate, columns, query_params, prefix
+        )
+        where_clauses.extend(page_where)
+
     if not incremental:
         col_list = ", ".join(columns)
         where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
         # Use custom order_by if provided, else fallback to idem_key when limit is set
-        if order_by:
+        if paginate:
+            order_clause = page_order_clause
+        elif order_by:
             order_clause = f" ORDER BY {order_by}"
         elif limit:
             order_clause = " ORDER BY idem_key"
@@ -119,6 +360,27 @@ def build_query(
             order_clause = ""
         return f"SELECT {col_list} FROM {source} WHERE {where_sql}{order_clause}{limit_clause}", query_params
 
+    mode = incremental["mode"]
+
+    # Watermark: filter on the source timestamp only; the target is never read
+    if mode == "watermark":
+        source_ts = incremental.get("source_ts", "last_seen")
+        select_cols = list(columns)
+        # The executor advances the watermark from source_ts, so it must be selected
+        if "*" not in select_cols and source_ts not in select_cols:
+            select_cols.append(source_ts)
+        col_list = ", ".join(f"s.{c}" for c in select_cols)
+        watermark = incremental.get("watermark")
+        if watermark is not None:
+            where_clauses.append(f"s.{source_ts} > @_watermark")
+            query_params.append(QueryParam(name="_watermark", type="TIMESTAMP", value=str(watermark)))
+        where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
+        order_clause = page_order_clause or f" ORDER BY s.{source_ts}"
+        return (
+            f"SELECT {col_list} FROM {source} s WHERE {where_sql}{order_clause}{limit_clause}",
+            query_params,
+        )
+
     # Incremental: LEFT JOIN or NOT EXISTS against target
     col_list = ", ".join(f"s.{c}" for c in columns)
 
@@ -127,7 +389,6 @@ def build_query(
     source_key = incremental["source_key"]
     target_key = incremental["target_key"]
     suffix = incremental.get("join_key_suffix")
-    mode = incremental["mode"]
     target = f"`{target_dataset}.{target_table}`"
 
     # JOIN condition
@@ -145,11 +406,12 @@ def build_query(
             f"(t.{target_key} IS NULL OR s.{source_ts} > t.{target_ts})"
         )
         where_sql = " AND ".join(where_clauses)
+        order_clause = page_order_clause or f" ORDER BY s.{source_key}"
         return (
             f"SELECT {col_list} FROM {source} s "
             f"LEFT JOIN {target} t ON {join_cond} "
-            f"WHERE {where_sql} "
-            f"ORDER BY s.{source_key}{limit_clause}",
+            f"WHERE {where_sql}"
+            f"{order_clause}{limit_clause}",
             query_params,
         )
 
@@ -157,7 +419,7 @@ def build_query(
         where_clauses.append(f"NOT EXISTS (SELECT 1 FROM {target} t WHERE {join_cond})")
         where_sql = " AND ".join(where_clauses)
         return (
-            f"SELECT {col_list} FROM {source} s WHERE {where_sql}{limit_clause}",
+            f"SELECT {col_list} FROM {source} s WHERE {where_sql}{page_order_clause}{limit_clause}",
             query_params,
         )
 
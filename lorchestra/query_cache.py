@@ -0,0 +1,253 @@
+"""
+QueryCache - Pipeline-scoped cache of storacle.query results.
+
+Several jobs in one pipeline often read the same BQ table or view (e.g. the
+proj_clients view read by sync_proj_clients, proj_sheets_clients, and
+proj_sheets_proj_clients). run_pipeline creates one QueryCache and threads it
+through every child execute(), so each distinct query hits BQ once per run.
+
+Entries are keyed by the generated SQL plus its QueryParam list, so any
+difference in filters, watermark, or page cursor is a different entry.
+
+Invalidation is by dataset: each entry records the resolved datasets its query
+reads, and a storacle.submit that writes to a dataset drops every entry reading
+from it. Dataset granularity covers views that live alongside their base
+tables; queries on views over other datasets should opt out with `cache: false`.
+Entries seeded with explicit tables (coalesced stage reads) are only dropped by
+writes to those tables. Writes whose target dataset is unknown (e.g.
+bq.execute) clear the cache.
+
+Rows are cached after timestamp normalization (JSON-native values) and handed
+out as shallow copies, so per-job processing (parse_json_columns, callables
+mutating rows) never leaks into the cache. Entries beyond max_memory_rows are
+spilled to JSON files in a temporary directory removed by close(). All
+operations take a lock, so prefetching and sharding threads can share a cache.
+"""
+
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+# Default number of rows held in memory before entries spill to disk
+DEFAULT_MAX_MEMORY_ROWS = 50_000
+
+# Plan methods that never write to BigQuery (no invalidation needed)
+NON_BQ_METHOD_PREFIXES = ("sqlite.", "sheets.", "file.", "msg.")
+
+
+@dataclass
+class _Entry:
+    """A cached result: rows in memory or a spill file, plus datasets/tables read."""
+    datasets: frozenset[str]
+    row_count: int
+    tables: Optional[frozenset[tuple[str, str]]] = None
+    rows: Optional[list[dict]] = None
+    spill_path: Optional[Path] = None
+
+
+class QueryCache:
+    """
+    In-memory query result cache with disk spill and dataset invalidation.
+
+    Usage:
+        cache = QueryCache()
+        key = QueryCache.make_key(sql, query_params)
+        rows = cache.get(key)
+        if rows is None:
+            rows = run_query(sql, query_params)
+            cache.put(key, rows, datasets={"prod_canonical"})
+        ...
+        cache.invalidate_plan(plan)   # after storacle.submit
+        cache.close()
+    """
+
+    def __init__(
+        self,
+        max_memory_rows: int = DEFAULT_MAX_MEMORY_ROWS,
+        spill_dir: Path | str | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_memory_rows: Rows held in memory before new entries spill to disk
+            spill_dir: Directory for spill files (default: a temp dir created on
+                first spill and removed by close())
+        """
+        self._max_memory_rows = max_memory_rows
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        self._owns_spill_dir = spill_dir is None
+        self._entries: dict[str, _Entry] = {}
+        self._memory_rows = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(sql: str, query_params: Iterable[Any]) -> str:
+        """
+        Compute the cache key for a query.
+
+        Args:
+            sql: Generated SQL string
+            query_params: QueryParam objects (or dicts with name/type/value)
+
+        Returns:
+            SHA256 hex digest of the SQL and parameters
+        """
+        params = []
+        for qp in query_params:
+            if isinstance(qp, dict):
+                params.append([qp["name"], qp["type"], qp["value"]])
+            else:
+                params.append([qp.name, qp.type, qp.value])
+        raw = json.dumps({"sql": sql, "params": params}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        """
+        Get cached rows for a key.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Shallow copies of the cached rows, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if entry.rows is not None:
+                return [dict(row) for row in entry.rows]
+            with open(entry.spill_path) as f:
+                return json.load(f)
+
+    def put(
+        self,
+        key: str,
+        rows: list[dict],
+        datasets: Iterable[str],
+        tables: Optional[Iterable[tuple[str, str]]] = None,
+    ) -> None:
+        """
+        Cache rows for a key.
+
+        Args:
+            key: Cache key from make_key()
+            rows: Result rows (JSON-native values)
+            datasets: Resolved datasets the query reads (for invalidation)
+            tables: Optional (dataset, table) pairs the query reads; when given,
+                only writes to these tables invalidate the entry
+        """
+        entry = _Entry(
+            datasets=frozenset(datasets),
+            row_count=len(rows),
+            tables=frozenset(tables) if tables is not None else None,
+        )
+        with self._lock:
+            self._drop(key)
+            if self._memory_rows + len(rows) <= self._max_memory_rows:
+                entry.rows = [dict(row) for row in rows]
+                self._memory_rows += len(rows)
+            else:
+                entry.spill_path = self._spill_path(key)
+                with open(entry.spill_path, "w") as f:
+                    json.dump(rows, f, default=str)
+            self._entries[key] = entry
+
+    def invalidate_dataset(self, dataset: str, table: Optional[str] = None) -> int:
+        """
+        Drop every entry whose query reads from a dataset.
+
+        Args:
+            dataset: Resolved dataset name
+            table: Table written, if known (entries with explicit tables are
+                only dropped when it is one of theirs)
+
+        Returns:
+            Number of entries dropped
+        """
+        def _reads(entry: _Entry) -> bool:
+            if dataset not in entry.datasets:
+                return False
+            if entry.tables is None or table is None:
+                return True
+            return (dataset, table) in entry.tables
+
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if _reads(e)]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def invalidate_plan(self, plan: Any) -> int:
+        """
+        Invalidate entries affected by a submitted StoraclePlan.
+
+        bq.* ops with a dataset invalidate that dataset; ops that write to BQ
+        without a known dataset clear the whole cache.
+
+        Args:
+            plan: The submitted StoraclePlan
+
+        Returns:
+            Number of entries dropped
+        """
+        dropped = 0
+        with self._lock:
+            for op in plan.ops:
+                if op.method.startswith(NON_BQ_METHOD_PREFIXES):
+                    continue
+                dataset = op.params.get("dataset") if op.method.startswith("bq.") else None
+                if dataset:
+                    dropped += self.invalidate_dataset(dataset, op.params.get("table"))
+                else:
+                    dropped += len(self._entries)
+                    self.clear()
+        return dropped
+
+    def clear(self) -> None:
+        """Drop all entries (spill files included)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def close(self) -> None:
+        """Drop all entries and remove the spill directory if this cache created it."""
+        self.clear()
+        if self._owns_spill_dir and self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry and release its memory or spill file."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.rows is not None:
+            self._memory_rows -= entry.row_count
+        elif entry.spill_path is not None:
+            entry.spill_path.unlink(missing_ok=True)
+
+    def _spill_path(self, key: str) -> Path:
+        """Get the spill file path for a key, creating the spill dir on demand."""
+        if self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="lorchestra-query-cache-"))
+        else:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+        return self._spill_dir / f"{key}.json"
@@ -0,0 +1,254 @@
+"""
+Query coalescing - one BQ scan serving sibling storacle.query reads in a stage.
+
+Jobs in a pipeline stage often read the same table with the same shape and
+differ only in one equality filter, e.g. the form_me_* jobs each read
+canonical_objects filtered on a different connection_name. Before such a
+stage runs, the pipeline runner:
+
+1. Loads each job and takes its leading storacle.query step.
+2. Groups reads on the same dataset/table/incremental/order_by whose equality
+   filters differ in exactly one column (the demux column).
+3. Issues one query per group with `demux_col IN (...)` and the union of the
+   selected columns.
+4. Splits the rows back per job (by demux value, and by each job's own
+   watermark in watermark mode), projects them to the job's columns, and
+   seeds the pipeline QueryCache under the exact SQL key the job will build.
+
+Each job's storacle.query then hits the cache instead of BigQuery. Anything
+not eligible (paginated, limited, sharded, non-identifier columns, @-refs, list
+filters, `cache: false`) simply runs its own query as before.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from lorchestra.query_cache import QueryCache
+from lorchestra.registry import JobRegistry
+from lorchestra.watermark_store import (
+    WatermarkStore,
+    normalize_watermark,
+    query_watermark_key,
+)
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass
+class _Read:
+    """A coalescable storacle.query step of one job."""
+    job_id: str
+    step_id: str
+    params: dict
+
+
+def _leading_read(job_id: str, registry: JobRegistry) -> Optional[_Read]:
+    """Get a job's leading storacle.query step if it can be coalesced."""
+    from lorchestra.compiler import compile_job
+    from lorchestra.schemas.ops import Op
+
+    instance = compile_job(registry.load(job_id))
+    steps = [s for s in instance.steps if not s.compiled_skip]
+    if not steps or steps[0].op != Op.STORACLE_QUERY:
+        return None
+
+    step = steps[0]
+    params = {
+        k: v for k, v in step.params.items()
+        if k not in ("parse_json_columns", "lazy_json", "cache")
+    }
+    if step.params.get("cache", True) is False:
+        return None
+    if params.get("paginate") or params.get("limit") or params.get("shard"):
+        return None
+    if '"@' in json.dumps(params, default=str):
+        return None
+    filters = params.get("filters", {})
+    if not isinstance(filters, dict) or not filters:
+        return None
+    if any(isinstance(v, (list, tuple, dict)) for v in filters.values()):
+        return None
+    columns = params.get("columns", ["*"])
+    if not all(c == "*" or _IDENTIFIER.match(c) for c in columns):
+        return None
+    return _Read(job_id=job_id, step_id=step.step_id, params=params)
+
+
+def _signature(read: _Read) -> str:
+    """Group key: reads with equal signatures differ only in filter values."""
+    incremental = dict(read.params.get("incremental") or {})
+    incremental.pop("watermark_key", None)
+    return json.dumps({
+        "dataset": read.params["dataset"],
+        "table": read.params["table"],
+        "incremental": incremental,
+        "order_by": read.params.get("order_by"),
+        "filter_keys": sorted(read.params["filters"]),
+    }, sort_keys=True, default=str)
+
+
+def _group_reads(reads: list[_Read]) -> list[tuple[list[_Read], str]]:
+    """Group reads by signature and find each group's single demux column."""
+    by_signature: dict[str, list[_Read]] = {}
+    for read in reads:
+        by_signature.setdefault(_signature(read), []).append(read)
+
+    groups: list[tuple[list[_Read], str]] = []
+    for members in by_signature.values():
+        if len(members) < 2:
+            continue
+        keys = members[0].params["filters"].keys()
+        differing = [
+            k for k in keys
+            if len({str(m.params["filters"][k]) for m in members}) > 1
+        ]
+        if len(differing) == 1:
+            groups.append((members, differing[0]))
+    return groups
+
+
+def _union_columns(members: list[_Read], demux_col: str) -> list[str]:
+    """Union of selected columns (order preserved), including the demux column."""
+    columns: list[str] = []
+    for member in members:
+        for col in member.params.get("columns", ["*"]):
+            if col == "*":
+                return ["*"]
+            if col not in columns:
+                columns.append(col)
+    if demux_col not in columns:
+        columns.append(demux_col)
+    return columns
+
+
+def _run_group(
+    members: list[_Read],
+    demux_col: str,
+    query_cache: QueryCache,
+    watermarks: Optional[WatermarkStore],
+) -> int:
+    """Run one combined query for a group and seed the cache per member."""
+    from lorchestra.executor import _query_datasets, run_bq_query
+    from lorchestra.plan_builder import _resolve_dataset
+    from lorchestra.query_builder import build_query
+
+    first = members[0].params
+    incremental = first.get("incremental")
+    is_watermark = bool(incremental) and incremental.get("mode") == "watermark"
+    source_ts = (incremental or {}).get("source_ts", "last_seen")
+
+    # Per-member watermark; the combined query reads from the lowest one
+    member_watermarks: dict[str, Optional[str]] = {}
+    if is_watermark:
+        for m in members:
+            key = query_watermark_key(m.job_id, m.step_id, m.params["incremental"])
+            member_watermarks[m.job_id] = watermarks.get(key) if watermarks is not None else None
+
+    combined_filters = dict(first["filters"])
+    combined_filters[demux_col] = sorted({str(m.params["filters"][demux_col]) for m in members})
+    combined = {
+        **first,
+        "columns": _union_columns(members, demux_col),
+        "filters": combined_filters,
+    }
+    if is_watermark:
+        values = list(member_watermarks.values())
+        lowest = None if any(v is None for v in values) else min(values, key=datetime.fromisoformat)
+        combined["incremental"] = {**incremental, "watermark": lowest}
+
+    sql, query_params = build_query(combined, resolve_dataset=_resolve_dataset)
+    rows = run_bq_query(sql, query_params, step_id=f"coalesce:{first['dataset']}.{first['table']}")
+
+    dataset = _resolve_dataset(first["dataset"])
+    tables = {(dataset, first["table"])}
+    if incremental and incremental.get("target_dataset"):
+        tables.add((_resolve_dataset(incremental["target_dataset"]), incremental["target_table"]))
+
+    for m in members:
+        params = m.params
+        if is_watermark:
+            params = {
+                **params,
+                "incremental": {**params["incremental"], "watermark": member_watermarks[m.job_id]},
+            }
+        columns = params.get("columns", ["*"])
+        keep = None
+        if "*" not in columns:
+            keep = list(columns)
+            if is_watermark and source_ts not in keep:
+                keep.append(source_ts)
+
+        value = str(params["filters"][demux_col])
+        watermark = member_watermarks.get(m.job_id)
+        after = datetime.fromisoformat(watermark) if watermark is not None else None
+        member_rows = []
+        for row in rows:
+            if str(row.get(demux_col)) != value:
+                continue
+            if after is not None:
+                row_ts = normalize_watermark(row.get(source_ts))
+                if row_ts is None or datetime.fromisoformat(row_ts) <= after:
+                    continue
+            member_rows.append(dict(row) if keep is None else {c: row.get(c) for c in keep})
+
+        member_sql, member_params = build_query(params, resolve_dataset=_resolve_dataset)
+        query_cache.put(
+            QueryCache.make_key(member_sql, member_params),
+            member_rows,
+            datasets=_query_datasets(params, _resolve_dataset),
+            tables=tables,
+        )
+    return len(members)
+
+
+def prefetch_stage_reads(
+    job_ids: list[str],
+    definitions_dir: Optional[Path],
+    query_cache: QueryCache,
+    watermarks: Optional[WatermarkStore] = None,
+    registry: Optional[JobRegistry] = None,
+) -> int:
+    """
+    Coalesce sibling storacle.query reads of a stage into shared scans.
+
+    Args:
+        job_ids: Jobs in the stage (pipelines and unloadable jobs are skipped)
+        definitions_dir: Definitions directory override
+        query_cache: Pipeline QueryCache to seed
+        watermarks: WatermarkStore the child executors use (watermark mode)
+        registry: JobRegistry the children load from (default: a new one
+            for definitions_dir)
+
+    Returns:
+        Number of jobs whose read was served by a coalesced query
+    """
+    if registry is None:
+        from lorchestra.pipeline import DEFINITIONS_DIR
+
+        registry = JobRegistry(definitions_dir or DEFINITIONS_DIR)
+
+    reads: list[_Read] = []
+    for job_id in job_ids:
+        try:
+            read = _leading_read(job_id, registry)
+        except Exception as e:
+            logger.debug(f"    coalesce: skipping {job_id}: {e}")
+            continue
+        if read is not None:
+            reads.append(read)
+
+    served = 0
+    for members, demux_col in _group_reads(reads):
+        served += _run_group(members, demux_col, query_cache, watermarks)
+        logger.info(
+            f"    coalesced {len(members)} reads of "
+            f"{members[0].params['dataset']}.{members[0].params['table']} on {demux_col}"
+        )
+    return served
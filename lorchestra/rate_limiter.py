@@ -0,0 +1,354 @@
+"""
+Rate limiting for LLM calls - per-model token buckets, adaptive backoff and
+a bounded concurrent dispatcher.
+
+Every compute.llm step (ComputeHandler) and inferometer callable invocation
+in a process goes through the limiter of its model, so concurrent steps
+share one quota. Limits are declared in definitions/config/rate_limits.yaml:
+
+    max_concurrency: 8                 # dispatch_concurrent default
+    default:                           # models not listed below
+      rpm: 50                          # requests per minute
+      tpm: 40000                       # tokens per minute
+    models:
+      claude-3-5-sonnet:
+        rpm: 50
+        tpm: 40000
+
+Each limiter holds two token buckets (requests and tokens) refilled
+continuously at rpm/60 and tpm/60 per second, with a minute's worth of
+burst. A call reserves one request and its estimated tokens before it
+starts, and waits until both are available; once the call returns, the
+estimate can be corrected with the actual usage.
+
+Backoff is adaptive (AIMD): a TransientError (rate limit, overload) pauses
+the model for an exponentially growing cooldown and halves its rates;
+each success restores a tenth of the configured rate. Rate limit errors
+therefore slow every caller of the model down, instead of each retrying
+at full speed.
+
+dispatch_concurrent() runs many calls on a thread pool, bounded by
+max_concurrency and by the limiters, retrying transient failures and
+returning one result or exception per call.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from lorchestra.errors import TransientError
+
+logger = logging.getLogger(__name__)
+
+
+# Rate limits file, relative to the definitions directory
+RATE_LIMITS_FILE = Path("config") / "rate_limits.yaml"
+
+# Concurrent calls in dispatch_concurrent when the limits file sets none
+DEFAULT_MAX_CONCURRENCY = 4
+
+# First cooldown after a TransientError; doubled per consecutive failure
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# Rates never drop below this fraction of the configured limit
+MIN_RATE_FACTOR = 0.1
+
+# Retries of a transient failure per call in dispatch_concurrent
+DEFAULT_MAX_RETRIES = 3
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token count of prompt text (~4 characters per token)."""
+    return sum(len(t) for t in texts if t) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Continuously refilled token bucket.
+
+    Reservations may take the bucket below zero: the caller is told how long
+    to wait for its share, so concurrent callers queue up in reservation
+    order instead of racing for tokens.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError(f"Rate must be > 0 per minute, got {per_minute}")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.factor = 1.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate * self.factor)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount tokens (at most the bucket capacity).
+
+        Returns:
+            Seconds to wait before the reservation is covered
+        """
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / (self.rate * self.factor)
+
+    def debit(self, amount: float) -> None:
+        """Adjust the level by a correction (positive takes, negative returns)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class ModelLimiter:
+    """
+    Requests/min and tokens/min limits of one model, with adaptive backoff.
+
+    Args:
+        model: Model identifier (for logging)
+        rpm: Requests per minute (None: unlimited)
+        tpm: Tokens per minute (None: unlimited)
+        backoff_seconds: First cooldown after a TransientError
+        clock: Monotonic clock (for testing)
+        sleep: Sleep function (for testing)
+    """
+
+    def __init__(
+        self,
+        model: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.model = model
+        self.requests = TokenBucket(rpm, clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock) if tpm else None
+        self.backoff_seconds = backoff_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._backoff = backoff_seconds
+        self._cooldown_until = 0.0
+        self.rate_factor = 1.0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request and tokens are available.
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            wait = max(0.0, self._cooldown_until - self._clock())
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """Correct a call's token reservation with its actual usage."""
+        if self.tokens is not None and actual != estimated:
+            with self._lock:
+                self.tokens.debit(actual - estimated)
+
+    def _set_factor(self, factor: float) -> None:
+        self.rate_factor = factor
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.factor = factor
+
+    def on_success(self) -> None:
+        """Additive increase: restore part of the configured rate."""
+        with self._lock:
+            self._backoff = self.backoff_seconds
+            if self.rate_factor < 1.0:
+                self._set_factor(min(1.0, self.rate_factor + MIN_RATE_FACTOR))
+
+    def on_transient(self) -> None:
+        """Multiplicative decrease: halve the rates and pause the model."""
+        with self._lock:
+            self._set_factor(max(MIN_RATE_FACTOR, self.rate_factor / 2))
+            self._cooldown_until = max(self._cooldown_until, self._clock() + self._backoff)
+            logger.warning(
+                f"{self.model}: transient failure, backing off {self._backoff:.1f}s "
+                f"(rate at {self.rate_factor:.0%})"
+            )
+            self._backoff = min(MAX_BACKOFF_SECONDS, self._backoff * 2)
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        tokens: int = 0,
+        max_retries: int = 0,
+        usage: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> Any:
+        """
+        Run fn under the limits, retrying TransientError with backoff.
+
+        Args:
+            fn: The model call
+            tokens: Estimated tokens of the call
+            max_retries: Retries after a TransientError (0: raise it)
+            usage: Returns the actual tokens used from fn's result (optional)
+
+        Returns:
+            fn's result
+
+        Raises:
+            TransientError: If the call still fails after max_retries
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                result = fn()
+            except TransientError:
+                self.on_transient()
+                if attempt >= max_retries:
+                    raise
+                attempt += 1
+                continue
+            self.on_success()
+            if usage is not None:
+                actual = usage(result)
+                if actual is not None:
+                    self.record_usage(tokens, actual)
+            return result
+
+
+class LimiterRegistry:
+    """
+    Model limiters built from a rate limits config (see module docstring).
+
+    Args:
+        limits: Parsed rate_limits.yaml ({max_concurrency, default, models})
+        backoff_seconds: First cooldown after a TransientError
+    """
+
+    def __init__(self, limits: Optional[dict] = None, backoff_seconds: float = DEFAULT_BACKOFF_SECONDS):
+        limits = limits or {}
+        self.default = limits.get("default") or {}
+        self.models = limits.get("models") or {}
+        self.max_concurrency = int(limits.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)
+        if self.max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {self.max_concurrency}")
+        self.backoff_seconds = backoff_seconds
+        self._limiters: dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: Optional[str]) -> ModelLimiter:
+        """The limiter of a model, created on first use."""
+        model = model or ""
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                spec = self.models.get(model, self.default)
+                limiter = ModelLimiter(
+                    model, spec.get("rpm"), spec.get("tpm"), backoff_seconds=self.backoff_seconds,
+                )
+                self._limiters[model] = limiter
+            return limiter
+
+
+def load_rate_limits(definitions_dir: Path) -> dict:
+    """
+    Load definitions/config/rate_limits.yaml.
+
+    Returns:
+        The limits config (empty if the file does not exist)
+    """
+    path = Path(definitions_dir) / RATE_LIMITS_FILE
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+# Process-wide registry (see get_limiter)
+_REGISTRY: Optional[LimiterRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> LimiterRegistry:
+    """The process-wide registry, loaded from the bundled definitions on first use."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            from lorchestra.pipeline import DEFINITIONS_DIR
+
+            _REGISTRY = LimiterRegistry(load_rate_limits(DEFINITIONS_DIR))
+        return _REGISTRY
+
+
+def set_registry(registry: Optional[LimiterRegistry]) -> None:
+    """Replace the process-wide registry (None: reload on next use)."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        _REGISTRY = registry
+
+
+def get_limiter(model: Optional[str]) -> ModelLimiter:
+    """The process-wide limiter of a model."""
+    return get_registry().get(model)
+
+
+@dataclass
+class LLMCall:
+    """One model call for dispatch_concurrent."""
+    model: Optional[str]
+    fn: Callable[[], Any]
+    tokens: int = 0
+    usage: Optional[Callable[[Any], Optional[int]]] = None
+
+
+def dispatch_concurrent(
+    calls: list[LLMCall],
+    max_concurrency: Optional[int] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    registry: Optional[LimiterRegistry] = None,
+) -> list[Any]:
+    """
+    Run model calls concurrently under their models' limits.
+
+    Args:
+        calls: Calls to run
+        max_concurrency: Calls in flight at once (default: the registry's)
+        max_retries: Retries of a TransientError per call
+        registry: Limiter registry (default: the process-wide one)
+
+    Returns:
+        One entry per call, in order: its result, or the exception it
+        raised (failures are isolated; nothing is raised)
+    """
+    registry = registry or get_registry()
+    workers = min(max_concurrency or registry.max_concurrency, len(calls))
+
+    def _run(call: LLMCall) -> Any:
+        try:
+            return registry.get(call.model).call(
+                call.fn, tokens=call.tokens, max_retries=max_retries, usage=call.usage,
+            )
+        except Exception as e:
+            return e
+
+    if workers <= 1:
+        return [_run(call) for call in calls]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run, calls))
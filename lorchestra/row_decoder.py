@@ -0,0 +1,245 @@
+"""
+Row decoding for storacle.query results.
+
+BigQuery rows come back from storacle with TIMESTAMP/DATETIME/DATE/TIME
+values as Python datetime objects and JSON payloads as strings. Rows must be
+JSON-native before they are cached, stored as step output, or fed to
+callables, so:
+
+- decode_rows() converts temporal columns to ISO strings. When storacle returns
+  the result schema, only the columns it types as temporal are touched;
+  otherwise the temporal columns are found from the first non-null value of
+  each column (BQ columns are uniformly typed).
+- parse_json_columns() parses the `parse_json_columns` of a storacle.query,
+  or with `lazy_json: true` wraps JSON objects in LazyJson proxies that parse
+  on first access.
+
+Both work column by column over the requested columns only, rather than
+visiting every cell of every row. JSON parsing uses orjson when it is
+installed and falls back to the standard library.
+"""
+
+import json
+import re
+from collections.abc import Mapping, MutableMapping
+from datetime import date, datetime, time
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
+    HAS_ORJSON = False
+
+
+# BQ field types decoded to ISO strings
+TEMPORAL_TYPES = {"TIMESTAMP", "DATETIME", "DATE", "TIME"}
+
+_TEMPORAL_VALUES = (datetime, date, time)
+
+# Digit runs that may not fit orjson's 64-bit integers
+_LONG_DIGITS = re.compile(r"\d{19}")
+
+
+def loads_json(text: str) -> Any:
+    """
+    Parse a JSON document, using orjson when available.
+
+    orjson rejects NaN and reads integers wider than 64 bits as floats, so
+    documents with a long digit run, or that orjson rejects, go through
+    json.loads to keep large ids exact.
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if HAS_ORJSON and not _LONG_DIGITS.search(text):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def temporal_columns(rows: list[dict], schema: Optional[list[dict]] = None) -> list[str]:
+    """
+    Find the columns holding temporal values.
+
+    Args:
+        rows: Result rows
+        schema: Optional result schema, a list of {name, type} fields
+
+    Returns:
+        Names of the TIMESTAMP/DATETIME/DATE/TIME columns
+    """
+    if schema:
+        return [
+            field["name"] for field in schema
+            if str(field.get("type", "")).upper() in TEMPORAL_TYPES
+        ]
+
+    # No schema: classify each column by its first non-null value
+    found: list[str] = []
+    unresolved = set(rows[0]) if rows else set()
+    for row in rows:
+        if not unresolved:
+            break
+        for col in [c for c in unresolved if row.get(c) is not None]:
+            unresolved.discard(col)
+            if isinstance(row[col], _TEMPORAL_VALUES):
+                found.append(col)
+    return found
+
+
+def decode_rows(rows: list[dict], schema: Optional[list[dict]] = None) -> list[dict]:
+    """
+    Convert temporal values to ISO strings in place.
+
+    Args:
+        rows: Result rows (modified in place)
+        schema: Optional result schema, a list of {name, type} fields
+
+    Returns:
+        The same rows, for chaining
+    """
+    for col in temporal_columns(rows, schema):
+        for row in rows:
+            value = row.get(col)
+            if isinstance(value, _TEMPORAL_VALUES):
+                row[col] = value.isoformat()
+    return rows
+
+
+_UNPARSED = object()
+
+
+class LazyJson(MutableMapping):
+    """
+    A JSON object cell that is parsed on first access.
+
+    Behaves as a mutable mapping over the parsed object. Until a key is
+    accessed it only holds the original JSON text, and encoded() (used by
+    plan building and the run store) hands that text back without a
+    parse/serialize round trip. Once accessed it may have been mutated, so
+    encoded() returns the parsed object.
+
+    Callables receiving lazy payloads must treat them as Mappings: they are
+    not dict instances. Accessing a payload that is not valid JSON raises
+    ValueError.
+    """
+
+    __slots__ = ("raw", "_value")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self._value: Any = _UNPARSED
+
+    @property
+    def parsed(self) -> bool:
+        """True once the JSON text has been parsed."""
+        return self._value is not _UNPARSED
+
+    @property
+    def value(self) -> dict:
+        """The parsed object (parsed on first use)."""
+        if self._value is _UNPARSED:
+            self._value = loads_json(self.raw)
+        return self._value
+
+    def encoded(self) -> Any:
+        """The original JSON text if never accessed, else the parsed object."""
+        return self.raw if self._value is _UNPARSED else self._value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.value[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.value[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.value[key]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyJson):
+            other = other.value
+        return self.value == other
+
+    def copy(self) -> dict:
+        """Shallow copy of the parsed object, as a dict."""
+        return dict(self.value)
+
+    def __str__(self) -> str:
+        return self.raw if self._value is _UNPARSED else json.dumps(self._value, default=str)
+
+    def __repr__(self) -> str:
+        if self._value is _UNPARSED:
+            return f"LazyJson({self.raw!r})"
+        return repr(self._value)
+
+    def __reduce__(self):
+        if self._value is _UNPARSED:
+            return (LazyJson, (self.raw,))
+        return (dict, (self._value,))
+
+
+def json_default(obj: Any) -> Any:
+    """
+    `default=` hook for json.dump(s) of rows that may hold LazyJson cells.
+
+    Untouched cells are written as their original JSON text (a string), so
+    they are never parsed just to be stored. Other mappings (e.g. a
+    plan_builder.PlanHandle) are written as dicts, and spilled step items
+    (spill.SpilledItems) as their items_ref.
+
+    Raises:
+        TypeError: For any other non-serializable object
+    """
+    from lorchestra.spill import SpilledItems
+
+    if isinstance(obj, LazyJson):
+        return obj.encoded()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, SpilledItems):
+        return obj.ref
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def parse_json_columns(
+    rows: list[dict],
+    columns: Iterable[str],
+    lazy: bool = False,
+) -> list[dict]:
+    """
+    Parse JSON string columns in place.
+
+    Values that are not strings or not valid JSON are left unchanged.
+
+    Args:
+        rows: Result rows (modified in place)
+        columns: Columns holding JSON strings
+        lazy: Wrap JSON objects in LazyJson instead of parsing them now
+            (arrays and scalars are still parsed eagerly)
+
+    Returns:
+        The same rows, for chaining
+    """
+    for col in columns:
+        for row in rows:
+            value = row.get(col)
+            if not isinstance(value, str):
+                continue
+            if lazy and value.lstrip().startswith("{"):
+                row[col] = LazyJson(value)
+                continue
+            try:
+                row[col] = loads_json(value)
+            except ValueError:
+                pass  # Leave as string if not valid JSON
+    return rows
@@ -6,6 +6,12 @@ The RunStore manages:
 - StepManifests (created for each step execution)
 - AttemptRecords (tracking execution attempts and outcomes)
 - Step outputs (results from backend execution)
+- Submit hashes (content hash of the last successful storacle.submit per
+  job/step, for `skip_if_unchanged`)
+- Schedule state (next run time and last run of each scheduled target, for
+  the scheduler)
+- Spill files (step items written to NDJSON, referenced by items_ref;
+  pruned once their run has been idle for SPILL_RETENTION_SECONDS)
 
 Storage backends:
 - In-memory (for testing)
@@ -14,6 +20,8 @@ Storage backends:
 """
 
 import json
+import shutil
+import tempfile
 import time
 import random
 from abc import ABC, abstractmethod
@@ -21,6 +29,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
+from lorchestra.row_decoder import json_default
 from lorchestra.schemas import (
     RunRecord,
     StepManifest,
@@ -32,6 +41,9 @@ from lorchestra.schemas import (
 # Default storage path per spec: ~/.local/lorchestra/runs/
 DEFAULT_RUN_PATH = Path.home() / ".local" / "lorchestra" / "runs"
 
+# Spill files of runs idle for longer than this are pruned (see RunStore.prune_spill)
+SPILL_RETENTION_SECONDS = 24 * 3600
+
 
 def get_default_store() -> "FileRunStore":
     """
@@ -80,6 +92,8 @@ class RunStore(ABC):
     - Store and retrieve StepManifests
     - Store and retrieve AttemptRecords
     - Store and retrieve step outputs
+    - Record and look up the last successful submit hash per job/step
+    - Record and look up schedule state per scheduled target
     """
 
     @abstractmethod
@@ -224,6 +238,111 @@ class RunStore(ABC):
         """
         pass
 
+    def get_submit_hash(self, job_id: str, step_id: str) -> Optional[str]:
+        """
+        Get the content hash of the last successful submit of a job step.
+
+        Stores that do not record hashes return None, so every submit runs.
+
+        Args:
+            job_id: The job identifier
+            step_id: The storacle.submit step identifier
+
+        Returns:
+            The recorded content hash, or None if none is recorded
+        """
+        return None
+
+    def record_submit_hash(self, job_id: str, step_id: str, run_id: str, content_hash: str) -> None:
+        """
+        Record the content hash of a successful submit of a job step.
+
+        A no-op unless the store overrides it (see get_submit_hash).
+
+        Args:
+            job_id: The job identifier
+            step_id: The storacle.submit step identifier
+            run_id: The run that submitted the plan
+            content_hash: StoraclePlan.content_hash() of the submitted plan
+        """
+        return None
+
+    def get_schedule_state(self, target: str) -> Optional[dict[str, Any]]:
+        """
+        Get the schedule state of a scheduled pipeline or job.
+
+        Only needed by stores backing a Scheduler.
+
+        Args:
+            target: The scheduled pipeline or job identifier
+
+        Returns:
+            The recorded state (next_run_at, last_run_at, ...), or None
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not store schedule state")
+
+    def record_schedule_state(self, target: str, state: dict[str, Any]) -> None:
+        """
+        Record the schedule state of a scheduled pipeline or job.
+
+        Args:
+            target: The scheduled pipeline or job identifier
+            state: JSON-serializable state, replacing any recorded before
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not store schedule state")
+
+    def _spill_root(self) -> Path:
+        """Directory holding the spill directory of each run."""
+        return Path(tempfile.gettempdir()) / "lorchestra-spill"
+
+    def spill_path(self, run_id: str, step_id: str) -> Path:
+        """
+        Path for a step's spilled items (see lorchestra.spill).
+
+        Stores without a directory of their own spill to the temp directory.
+
+        Args:
+            run_id: The run ULID
+            step_id: The step whose output is spilled
+
+        Returns:
+            Path of the NDJSON spill file (parent may not exist yet)
+        """
+        return self._spill_root() / run_id / f"{step_id}.ndjson"
+
+    def prune_spill(self, max_age_seconds: float = SPILL_RETENTION_SECONDS) -> list[str]:
+        """
+        Delete the spill files of runs idle for longer than max_age_seconds.
+
+        Spill files outlive their run: a pipeline hands a job's output (and
+        its items_ref) to later jobs through @run. The executor prunes at the
+        start of every run; `lorchestra prune-spill` prunes on demand.
+
+        Args:
+            max_age_seconds: Age of a run's newest spill file beyond which
+                the run's spill directory is deleted
+
+        Returns:
+            The run IDs whose spill files were deleted
+        """
+        root = self._spill_root()
+        if not root.is_dir():
+            return []
+        cutoff = time.time() - max_age_seconds
+        pruned = []
+        for run_dir in root.iterdir():
+            try:
+                last_written = max(
+                    (p.stat().st_mtime for p in run_dir.iterdir()),
+                    default=run_dir.stat().st_mtime,
+                )
+            except OSError:
+                continue  # Removed concurrently, or not a run directory
+            if last_written < cutoff:
+                shutil.rmtree(run_dir, ignore_errors=True)
+                pruned.append(run_dir.name)
+        return pruned
+
 
 class InMemoryRunStore(RunStore):
     """
@@ -237,6 +356,8 @@ class InMemoryRunStore(RunStore):
         self._manifests: dict[str, StepManifest] = {}
         self._outputs: dict[str, Any] = {}
         self._attempts: dict[str, dict[int, AttemptRecord]] = {}  # run_id -> attempt_n -> record
+        self._submit_hashes: dict[tuple[str, str], str] = {}  # (job_id, step_id) -> content hash
+        self._schedules: dict[str, dict[str, Any]] = {}  # target -> schedule state
 
     def create_run(self, instance: JobInstance, envelope: dict[str, Any]) -> RunRecord:
         run_id = generate_ulid()
@@ -311,12 +432,27 @@ class InMemoryRunStore(RunStore):
 
         return run
 
+    def get_submit_hash(self, job_id: str, step_id: str) -> Optional[str]:
+        return self._submit_hashes.get((job_id, step_id))
+
+    def record_submit_hash(self, job_id: str, step_id: str, run_id: str, content_hash: str) -> None:
+        self._submit_hashes[(job_id, step_id)] = content_hash
+
+    def get_schedule_state(self, target: str) -> Optional[dict[str, Any]]:
+        state = self._schedules.get(target)
+        return dict(state) if state is not None else None
+
+    def record_schedule_state(self, target: str, state: dict[str, Any]) -> None:
+        self._schedules[target] = dict(state)
+
     def clear(self) -> None:
         """Clear all stored data (for testing)."""
         self._runs.clear()
         self._manifests.clear()
         self._outputs.clear()
         self._attempts.clear()
+        self._submit_hashes.clear()
+        self._schedules.clear()
 
 
 class FileRunStore(RunStore):
@@ -339,6 +475,15 @@ class FileRunStore(RunStore):
             attempts/
                 {run_id}/
                     {attempt_n}.json
+            submits/
+                {job_id}/
+                    {step_id}.json    # last successful submit: content_hash, run_id
+            schedules/
+                {target}.json         # scheduler state: next_run_at, last_run_at, ...
+            spill/
+                {run_id}/
+                    {step_id}.ndjson  # step items above the spill threshold (items_ref),
+                                      # pruned SPILL_RETENTION_SECONDS after the run
 
     Run JSON includes completion info:
         - run_id, job_id, job_def_sha256, envelope, started_at (initial)
@@ -355,7 +500,7 @@ class FileRunStore(RunStore):
 
     def _ensure_dirs(self) -> None:
         """Create the directory structure if needed."""
-        for subdir in ["runs", "manifests", "outputs", "attempts"]:
+        for subdir in ["runs", "manifests", "outputs", "attempts", "submits", "schedules"]:
             (self._store_dir / subdir).mkdir(parents=True, exist_ok=True)
 
     def _get_run_dir(self, job_id: str, started_at: datetime) -> Path:
@@ -377,7 +522,7 @@ class FileRunStore(RunStore):
         serializable_envelope = {}
         for k, v in envelope.items():
             # Skip non-serializable items
-            if k in ("store", "handlers", "backends"):
+            if k in ("store", "handlers", "backends", "watermarks", "query_cache"):
                 continue
             # Convert Path to string
             if isinstance(v, Path):
@@ -505,7 +650,7 @@ class FileRunStore(RunStore):
 
         manifest_path = manifest_dir / f"{manifest.step_id}.json"
         with open(manifest_path, "w") as f:
-            json.dump(manifest.to_dict(), f, indent=2)
+            json.dump(manifest.to_dict(), f, indent=2, default=json_default)
 
         return f"file://{manifest_path}"
 
@@ -528,7 +673,7 @@ class FileRunStore(RunStore):
 
         output_path = output_dir / f"{step_id}.json"
         with open(output_path, "w") as f:
-            json.dump(output, f, indent=2)
+            json.dump(output, f, indent=2, default=json_default)
 
         return f"file://{output_path}"
 
@@ -572,3 +717,43 @@ class FileRunStore(RunStore):
         # Parse attempt numbers from filenames
         max_n = max(int(f.stem) for f in attempt_files)
         return self.get_attempt(run_id, max_n)
+
+    def get_submit_hash(self, job_id: str, step_id: str) -> Optional[str]:
+        submit_path = self._store_dir / "submits" / job_id / f"{step_id}.json"
+        if not submit_path.exists():
+            return None
+        with open(submit_path) as f:
+            return json.load(f).get("content_hash")
+
+    def record_submit_hash(self, job_id: str, step_id: str, run_id: str, content_hash: str) -> None:
+        submit_dir = self._store_dir / "submits" / job_id
+        submit_dir.mkdir(parents=True, exist_ok=True)
+
+        record = {
+            "job_id": job_id,
+            "step_id": step_id,
+            "run_id": run_id,
+            "content_hash": content_hash,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(submit_dir / f"{step_id}.json", "w") as f:
+            json.dump(record, f, indent=2)
+
+    def _spill_root(self) -> Path:
+        return self._store_dir / "spill"
+
+    def get_schedule_state(self, target: str) -> Optional[dict[str, Any]]:
+        schedule_path = self._store_dir / "schedules" / f"{target}.json"
+        if not schedule_path.exists():
+            return None
+        with open(schedule_path) as f:
+            return json.load(f)
+
+    def record_schedule_state(self, target: str, state: dict[str, Any]) -> None:
+        schedule_dir = self._store_dir / "schedules"
+        schedule_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a crash never leaves a truncated state file
+        tmp_path = schedule_dir / f".{target}.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(schedule_dir / f"{target}.json")
@@ -0,0 +1,330 @@
+"""
+Scheduler - cron-style triggers for pipelines and jobs.
+
+Replaces the cron + scripts/daily_*.sh setup. Schedules are declared in
+definitions/config/schedules.yaml:
+
+    schedules:
+      - target: pipeline.ingest        # pipeline.* runs a pipeline, else a job
+        cron: "0 6 * * *"              # minute hour day-of-month month day-of-week
+        jitter_seconds: 300            # optional: delay each run by 0..300s
+      - target: pipeline.project
+        cron: "@hourly"
+
+Each schedule's state (next run time, last run and its status) is kept in
+the run store, so a restarted scheduler picks up where it left off:
+
+- Coalescing: ticks missed while the scheduler was down, or while a long run
+  was still going, trigger a single run; the next run is always the first
+  tick after the current time, never a backlog of catch-up runs.
+- Overlap: every run path takes the target's lock (see lorchestra.locks),
+  so if the target is already running (another scheduler, `lorchestra run`
+  or `pipeline`, a daemon request, or a parent pipeline) the tick is skipped.
+- Jitter: each run is delayed by a random 0..jitter_seconds so schedules on
+  the same tick do not all hit BigQuery at once.
+
+Cron fields support `*`, lists (`1,15`), ranges (`1-5`) and steps (`*/15`,
+`0-30/10`), plus @hourly, @daily, @weekly and @monthly. Times are local, as
+with cron.
+"""
+
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from lorchestra.run_store import RunStore
+
+logger = logging.getLogger(__name__)
+
+
+# Schedules file, relative to the definitions directory
+SCHEDULES_FILE = Path("config") / "schedules.yaml"
+
+# Missed ticks counted at most (a scheduler down for months still runs once)
+MAX_COALESCED = 10_000
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (name, min, max) of the five cron fields
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+_FIELD_PART = re.compile(r"^(\*|\d+)(?:-(\d+))?(?:/(\d+))?$")
+
+
+def _parse_field(spec: str, name: str, low: int, high: int) -> frozenset[int]:
+    """Parse one cron field into the set of values it matches."""
+    values: set[int] = set()
+    for part in spec.split(","):
+        match = _FIELD_PART.match(part)
+        if not match:
+            raise ValueError(f"Invalid cron {name} field: {spec!r}")
+        start, end, step = match.groups()
+        if start == "*":
+            if end is not None:
+                raise ValueError(f"Invalid cron {name} field: {spec!r}")
+            first, last = low, high
+        else:
+            first = int(start)
+            # "5/15" means 5-max every 15, as in cron
+            last = int(end) if end is not None else (high if step else first)
+        if not (low <= first <= last <= high):
+            raise ValueError(f"Cron {name} field out of range {low}-{high}: {spec!r}")
+        values.update(range(first, last + 1, int(step) if step else 1))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    A parsed five-field cron expression.
+
+    As in cron, when both day of month and day of week are restricted a day
+    matches if either does.
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        fields = _ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expr!r}")
+        parsed = [_parse_field(f, *spec) for f, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(d % 7 for d in weekdays)  # 7 is Sunday too
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        First matching minute strictly after dt.
+
+        Raises:
+            ValueError: If the expression never matches (e.g. "0 0 31 2 *")
+        """
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never matches: {self.expr!r}")
+
+    def count_between(self, start: datetime, end: datetime, limit: int = MAX_COALESCED) -> int:
+        """Number of ticks in (start, end], counting at most limit."""
+        count = 0
+        t = start
+        while count < limit:
+            t = self.next_after(t)
+            if t > end:
+                break
+            count += 1
+        return count
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """A cron trigger for one pipeline or job."""
+    target: str
+    cron: str
+    jitter_seconds: float = 0
+
+    @property
+    def is_pipeline(self) -> bool:
+        return self.target.startswith("pipeline.")
+
+    @property
+    def cron_schedule(self) -> CronSchedule:
+        return CronSchedule(self.cron)
+
+
+def load_schedules(definitions_dir: Path) -> list[Schedule]:
+    """
+    Load schedules from definitions/config/schedules.yaml.
+
+    Returns:
+        Schedules in file order (empty if the file does not exist)
+
+    Raises:
+        ValueError: If an entry is invalid or a target is scheduled twice
+    """
+    path = Path(definitions_dir) / SCHEDULES_FILE
+    if not path.exists():
+        return []
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+
+    schedules: list[Schedule] = []
+    for entry in data.get("schedules") or []:
+        if not entry.get("target") or not entry.get("cron"):
+            raise ValueError(f"Schedule requires target and cron: {entry}")
+        schedule = Schedule(
+            target=entry["target"],
+            cron=str(entry["cron"]),
+            jitter_seconds=float(entry.get("jitter_seconds", 0)),
+        )
+        schedule.cron_schedule  # Validate the expression now
+        if any(s.target == schedule.target for s in schedules):
+            raise ValueError(f"Target scheduled twice: {schedule.target}")
+        schedules.append(schedule)
+    return schedules
+
+
+def _request_for(schedule: Schedule) -> dict[str, Any]:
+    """Daemon-style request (see lorchestra.daemon) running a schedule's target."""
+    if schedule.is_pipeline:
+        return {"op": "run_pipeline", "pipeline_id": schedule.target}
+    return {"op": "execute", "envelope": {"job_id": schedule.target}}
+
+
+class Scheduler:
+    """
+    Runs due schedules, one at a time, recording their state in a RunStore.
+
+    Args:
+        schedules: Schedules to run
+        store: RunStore holding each schedule's state
+        runner: Runs a request (as accepted by lorchestra.daemon) under the
+            target's lock and returns a summary with "success", or "skipped"
+            if the lock was held; e.g. daemon.Worker.run
+        clock: Returns the current local time (for testing)
+        rng: Random source for jitter (for testing)
+    """
+
+    def __init__(
+        self,
+        schedules: list[Schedule],
+        store: RunStore,
+        runner: Callable[[dict], dict],
+        clock: Callable[[], datetime] = lambda: datetime.now().astimezone(),
+        rng: Optional[random.Random] = None,
+    ):
+        self.schedules = schedules
+        self.store = store
+        self.runner = runner
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    def _plan(self, schedule: Schedule, after: datetime, state: Optional[dict]) -> dict:
+        """State with the next tick after `after`, jittered, merged over state."""
+        tick = schedule.cron_schedule.next_after(after)
+        jitter = self.rng.uniform(0, schedule.jitter_seconds) if schedule.jitter_seconds else 0
+        new_state = dict(state or {})
+        new_state.update({
+            "target": schedule.target,
+            "cron": schedule.cron,
+            "next_tick_at": tick.isoformat(),
+            "next_run_at": (tick + timedelta(seconds=jitter)).isoformat(),
+        })
+        return new_state
+
+    def next_runs(self) -> list[dict]:
+        """
+        Current state of every schedule, scheduling any that has none yet.
+
+        Returns:
+            State dicts (target, cron, next_run_at, last_run_at, ...)
+        """
+        now = self.clock()
+        states = []
+        for schedule in self.schedules:
+            state = self.store.get_schedule_state(schedule.target)
+            if state is None or state.get("cron") != schedule.cron:
+                state = self._plan(schedule, now, state)
+                self.store.record_schedule_state(schedule.target, state)
+            states.append(state)
+        return states
+
+    def tick(self) -> list[dict]:
+        """
+        Run every schedule that is due.
+
+        A schedule without state (new, or whose cron changed) is scheduled
+        from now rather than run.
+
+        Returns:
+            States of the schedules that were due, after their run
+        """
+        ran = []
+        for schedule in self.schedules:
+            state = self.store.get_schedule_state(schedule.target)
+            now = self.clock()
+            if state is None or state.get("cron") != schedule.cron:
+                self.store.record_schedule_state(schedule.target, self._plan(schedule, now, state))
+                continue
+            if now < datetime.fromisoformat(state["next_run_at"]):
+                continue
+            ran.append(self._run(schedule, state, now))
+        return ran
+
+    def _run(self, schedule: Schedule, state: dict, now: datetime) -> dict:
+        """Run a due schedule and record its outcome and next run."""
+        missed = schedule.cron_schedule.count_between(
+            datetime.fromisoformat(state["next_tick_at"]), now
+        )
+        state = {**state, "last_tick_at": state["next_tick_at"], "coalesced": missed}
+        if missed:
+            logger.info(f"{schedule.target}: {missed} missed tick(s) coalesced into one run")
+
+        started = time.monotonic()
+        try:
+            result = self.runner(_request_for(schedule))
+            if result.get("skipped"):
+                logger.warning(f"Skipping {schedule.target}: {result.get('error')}")
+                status = "skipped"
+            else:
+                status = "success" if result.get("success") else "failed"
+                state["last_run_id"] = result.get("run_id")
+                state.pop("last_error", None)
+        except Exception as e:
+            logger.error(f"{schedule.target} failed: {e}")
+            status = "failed"
+            state["last_error"] = f"{type(e).__name__}: {e}"
+
+        finished = self.clock()
+        state.update({
+            "last_run_at": now.isoformat(),
+            "last_status": status,
+            "last_duration_ms": int((time.monotonic() - started) * 1000),
+        })
+        # Next tick after the run ended: ticks passed during the run coalesce too
+        state = self._plan(schedule, finished, state)
+        self.store.record_schedule_state(schedule.target, state)
+        return state
+
+    def run_forever(self, poll_seconds: float = 30) -> None:
+        """Tick every poll_seconds until interrupted."""
+        self.next_runs()
+        while True:
+            self.tick()
+            time.sleep(poll_seconds)
@@ -0,0 +1,235 @@
+"""
+Spill files - rows written once as NDJSON and read back through mmap.
+
+Used to move large item lists between processes without pickling them:
+the parallel callable transport (lorchestra.callable.parallel) writes the
+items once, and each pool worker maps the file and parses only its own
+byte range.
+
+Spill files also back CallableResult.items_ref. A callable (or the executor,
+for outputs above its spill threshold) writes its items with spill_items()
+and returns the ref, "file:///path/to/items.ndjson". Downstream steps see a
+SpilledItems sequence that parses rows from the mapped file as they are
+iterated, so a step output never has to be held in memory as a whole.
+
+Rows are encoded one per line. Untouched LazyJson cells (see row_decoder)
+are written as their original JSON text, so payloads are never parsed just
+to be spilled; a reader gets them back as parsed objects.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from lorchestra.row_decoder import LazyJson, json_default, loads_json
+
+
+# Preferred spill location: tmpfs, so spill files stay in shared memory
+SHM_DIR = Path("/dev/shm")
+
+# Scheme of items_ref values pointing at spill files
+ITEMS_REF_SCHEME = "file://"
+
+
+def spill_dir() -> Path:
+    """Directory for temporary spill files: /dev/shm if usable, else the temp dir."""
+    if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK):
+        return SHM_DIR
+    return Path(tempfile.gettempdir())
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, LazyJson):
+        if not value.parsed and "\n" not in value.raw:
+            return value.raw
+        # Multi-line JSON text would break the one-row-per-line framing
+        value = value.value
+    return json.dumps(value, default=json_default, separators=(",", ":"))
+
+
+def encode_row(row: dict) -> bytes:
+    """
+    Encode a row as one NDJSON line (with its trailing newline).
+
+    Raises:
+        TypeError: If the row holds a value JSON cannot represent
+    """
+    if not any(isinstance(v, LazyJson) for v in row.values()):
+        text = json.dumps(row, default=json_default, separators=(",", ":"))
+    else:
+        text = "{" + ",".join(
+            f"{json.dumps(str(k))}:{_encode_value(v)}" for k, v in row.items()
+        ) + "}"
+    return text.encode("utf-8") + b"\n"
+
+
+def write_rows(rows: Iterable[dict], path: Path) -> list[int]:
+    """
+    Write rows to an NDJSON spill file.
+
+    Args:
+        rows: Rows to write
+        path: File to create (overwritten if it exists)
+
+    Returns:
+        Byte offset of the start of each row, followed by the file size, so
+        rows[i:j] occupy bytes offsets[i]:offsets[j]
+
+    Raises:
+        TypeError: If a row holds a value JSON cannot represent
+    """
+    offsets = [0]
+    with open(path, "wb") as f:
+        for row in rows:
+            line = encode_row(row)
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def read_rows(path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[dict]:
+    """
+    Iterate the rows of an NDJSON spill file through a memory map.
+
+    Args:
+        path: Spill file
+        start: Byte offset of the first row to read
+        end: Byte offset after the last row to read (default: end of file)
+
+    Yields:
+        Parsed rows, in file order
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm) if end is None else end
+            pos = start
+            while pos < end:
+                nl = mm.find(b"\n", pos, end)
+                line_end = end if nl == -1 else nl
+                if line_end > pos:
+                    yield loads_json(mm[pos:line_end].decode("utf-8"))
+                pos = line_end + 1
+
+
+def _index(path: Path) -> array:
+    """Row offsets of a spill file (as returned by write_rows)."""
+    offsets = array("q", [0])
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return offsets
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(b"\n")
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = mm.find(b"\n", pos + 1)
+            if offsets[-1] != len(mm):
+                offsets.append(len(mm))  # Last row without a trailing newline
+    return offsets
+
+
+class SpilledItems(Sequence):
+    """
+    Read-only sequence over the rows of a spill file.
+
+    Rows are parsed from the memory-mapped file on access; only the row
+    offsets are held in memory. Indexing returns a row, slicing a list.
+    Serialized (run store outputs, pickling) as the file reference.
+    """
+
+    def __init__(self, path: Path | str, offsets: Optional[array] = None):
+        self.path = Path(path)
+        self.offsets = offsets if offsets is not None else _index(self.path)
+
+    @property
+    def ref(self) -> str:
+        """items_ref value for this file."""
+        return f"{ITEMS_REF_SCHEME}{self.path}"
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[dict]:
+        return read_rows(self.path, 0, self.offsets[-1])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return list(read_rows(self.path, self.offsets[start], self.offsets[stop]))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SpilledItems index out of range")
+        return next(read_rows(self.path, self.offsets[index], self.offsets[index + 1]))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SpilledItems) and other.path == self.path:
+            return True
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        return (SpilledItems, (str(self.path),))
+
+    def __repr__(self) -> str:
+        return f"SpilledItems({self.ref!r}, {len(self)} rows)"
+
+
+def spill_items(rows: Iterable[dict], path: Path) -> SpilledItems:
+    """
+    Write rows to a spill file and return them as SpilledItems.
+
+    Args:
+        rows: Rows to write (any iterable; consumed once)
+        path: Spill file (parent directories are created)
+
+    Raises:
+        TypeError: If a row holds a value JSON cannot represent
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return SpilledItems(path, array("q", write_rows(rows, path)))
+
+
+def concat_spills(paths: Iterable[Path], path: Path) -> SpilledItems:
+    """
+    Concatenate spill files, in order, into one (rows are copied, not parsed).
+
+    Args:
+        paths: Spill files to concatenate
+        path: Spill file to create (parent directories are created)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as out:
+        for part in paths:
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out)
+    return SpilledItems(path)
+
+
+def open_items_ref(items_ref: str) -> SpilledItems:
+    """
+    Open the spill file an items_ref points at.
+
+    Raises:
+        ValueError: If the ref is not a file:// ref to an existing file
+    """
+    if not items_ref.startswith(ITEMS_REF_SCHEME):
+        raise ValueError(f"Unsupported items_ref (expected {ITEMS_REF_SCHEME}...): {items_ref}")
+    path = Path(items_ref[len(ITEMS_REF_SCHEME):])
+    if not path.is_file():
+        raise ValueError(f"items_ref file not found: {path}")
+    return SpilledItems(path)
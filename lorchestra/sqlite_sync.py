@@ -0,0 +1,215 @@
+"""
+Diff-based sqlite.sync - apply only the rows that changed to a local table.
+
+A sqlite.sync item carries every row of a projection (bq_reader and the
+projection/bq_rows_to_sqlite_sync transform package the whole view). With
+`mode: diff` the storacle client applies the item here instead of replacing
+the table wholesale:
+
+1. Each row is hashed over its columns, excluding the item's
+   auto_timestamp_columns (e.g. projected_at changes every run).
+2. The hashes are compared with the HASH_COLUMN of the local table.
+3. Only inserts, updates and deletes are applied, with executemany, in one
+   transaction.
+
+Without key_columns rows are matched by hash alone, so a changed row is a
+delete plus an insert. With key_columns a changed row is updated in place.
+
+A table that is missing, or whose columns differ from the item's, is
+(re)created; a table without the hash column gets one, and its rows are
+replaced on that first diff sync.
+
+An item without rows would delete every row of the table. That is refused
+(a failed or empty upstream read must not wipe the local copy) unless the
+item sets `allow_empty: true`.
+"""
+
+import hashlib
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+# Column holding each row's content hash in diff-synced tables
+HASH_COLUMN = "_row_hash"
+
+_SQLITE_VALUES = (str, int, float, bytes, type(None))
+
+
+def _quote(name: str) -> str:
+    """Quote an SQLite identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sqlite_value(value: Any) -> Any:
+    """Convert a row value to an SQLite-storable value (objects as JSON)."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, _SQLITE_VALUES):
+        return value
+    return json.dumps(value, default=str, sort_keys=True)
+
+
+def row_hash(row: dict, columns: list[str]) -> str:
+    """
+    Hash a row's values over the given columns.
+
+    Args:
+        row: Row dict
+        columns: Columns to hash (volatile columns already excluded)
+
+    Returns:
+        SHA256 hex digest
+    """
+    values = [_sqlite_value(row.get(c)) for c in columns]
+    raw = json.dumps(values, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _key_value(value: Any) -> Any:
+    """A key value as stored in a TEXT column."""
+    value = _sqlite_value(value)
+    return value if value is None or isinstance(value, bytes) else str(value)
+
+
+def _item_columns(item: dict) -> list[str]:
+    """Columns of a sync item: its `columns`, else the row keys in first-seen order."""
+    columns = list(item.get("columns") or [])
+    if not columns:
+        seen: dict[str, None] = {}
+        for row in item.get("rows", []):
+            seen.update(dict.fromkeys(row))
+        columns = list(seen)
+    for col in item.get("auto_timestamp_columns") or []:
+        if col not in columns:
+            columns.append(col)
+    return columns
+
+
+def _prepare_table(conn: sqlite3.Connection, table: str, columns: list[str]) -> None:
+    """Create the table, or add/rebuild it so it has exactly columns + HASH_COLUMN."""
+    existing = [r[1] for r in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+    wanted = set(columns) | {HASH_COLUMN}
+    if existing and set(existing) == wanted:
+        return
+    if existing and set(existing) == set(columns):
+        conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(HASH_COLUMN)} TEXT")
+        return
+    if existing:
+        conn.execute(f"DROP TABLE {_quote(table)}")
+    column_defs = ", ".join(f"{_quote(c)} TEXT" for c in [*columns, HASH_COLUMN])
+    conn.execute(f"CREATE TABLE {_quote(table)} ({column_defs})")
+
+
+def diff_sync(params: dict) -> dict:
+    """
+    Apply a sqlite.sync item to its table as a diff.
+
+    Args:
+        params: sqlite.sync op params: sqlite_path, table, rows, and optional
+            columns, auto_timestamp_columns, key_columns and allow_empty
+
+    Returns:
+        Counts: {inserted, updated, deleted, unchanged}
+
+    Raises:
+        ValueError: If sqlite_path or table is missing, or rows is empty
+            while the table has rows and allow_empty is not set
+        sqlite3.Error: If the database cannot be written
+    """
+    sqlite_path = params.get("sqlite_path")
+    table = params.get("table")
+    if not sqlite_path or not table:
+        raise ValueError("sqlite.sync diff requires sqlite_path and table")
+
+    rows = params.get("rows") or []
+    volatile = set(params.get("auto_timestamp_columns") or [])
+    key_columns = list(params.get("key_columns") or [])
+    columns = _item_columns(params)
+    hashed_columns = [c for c in columns if c not in volatile]
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    now = datetime.now(timezone.utc).isoformat()
+    path = Path(sqlite_path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _values(row: dict, digest: str) -> tuple:
+        stamped = {c: now for c in volatile if row.get(c) is None}
+        return tuple(
+            _sqlite_value(stamped[c] if c in stamped else row.get(c)) for c in columns
+        ) + (digest,)
+
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            if not rows:
+                # Empty projection: the table keeps no rows, if the item allows it
+                if not conn.execute(f"PRAGMA table_info({_quote(table)})").fetchone():
+                    return counts
+                if not params.get("allow_empty"):
+                    (existing,) = conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()
+                    if existing:
+                        raise ValueError(
+                            f"sqlite.sync diff of {table} has no rows; refusing to delete "
+                            f"{existing} existing rows (set allow_empty: true to allow)"
+                        )
+                counts["deleted"] = conn.execute(f"DELETE FROM {_quote(table)}").rowcount
+                return counts
+
+            _prepare_table(conn, table, columns)
+            quoted = _quote(table)
+            insert_sql = (
+                f"INSERT INTO {quoted} ({', '.join(_quote(c) for c in [*columns, HASH_COLUMN])}) "
+                f"VALUES ({', '.join('?' for _ in range(len(columns) + 1))})"
+            )
+            inserts: list[tuple] = []
+            updates: list[tuple] = []
+            deletes: list[tuple] = []
+
+            if key_columns:
+                key_sql = ", ".join(_quote(c) for c in key_columns)
+                current = {
+                    tuple(_key_value(v) for v in r[:-1]): r[-1]
+                    for r in conn.execute(f"SELECT {key_sql}, {_quote(HASH_COLUMN)} FROM {quoted}")
+                }
+                seen: set[tuple] = set()
+                for row in rows:
+                    key = tuple(_key_value(row.get(c)) for c in key_columns)
+                    seen.add(key)
+                    digest = row_hash(row, hashed_columns)
+                    if key not in current:
+                        inserts.append(_values(row, digest))
+                    elif current[key] != digest:
+                        updates.append(_values(row, digest) + key)
+                    else:
+                        counts["unchanged"] += 1
+                deletes = [key for key in current if key not in seen]
+                where = " AND ".join(f"{_quote(c)} IS ?" for c in key_columns)
+                set_sql = ", ".join(f"{_quote(c)} = ?" for c in [*columns, HASH_COLUMN])
+                conn.executemany(f"UPDATE {quoted} SET {set_sql} WHERE {where}", updates)
+                conn.executemany(f"DELETE FROM {quoted} WHERE {where}", deletes)
+            else:
+                # Match by hash; duplicate rows are matched one for one
+                by_hash: dict[str, list[int]] = defaultdict(list)
+                for rowid, digest in conn.execute(f"SELECT rowid, {_quote(HASH_COLUMN)} FROM {quoted}"):
+                    by_hash[digest].append(rowid)
+                for row in rows:
+                    digest = row_hash(row, hashed_columns)
+                    if by_hash.get(digest):
+                        by_hash[digest].pop()
+                        counts["unchanged"] += 1
+                    else:
+                        inserts.append(_values(row, digest))
+                deletes = [(rowid,) for rowids in by_hash.values() for rowid in rowids]
+                conn.executemany(f"DELETE FROM {quoted} WHERE rowid = ?", deletes)
+
+            conn.executemany(insert_sql, inserts)
+            counts["inserted"] = len(inserts)
+            counts["updated"] = len(updates)
+            counts["deleted"] = len(deletes)
+    finally:
+        conn.close()
+    return counts
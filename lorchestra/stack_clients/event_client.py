@@ -128,6 +128,11 @@ def get_smoke_namespace() -> str | None:
     return _SMOKE_NAMESPACE
 
 
+def writes_to_production() -> bool:
+    """Return True unless dry-run, test-table, or smoke mode is set."""
+    return not (_DRY_RUN_MODE or _TEST_TABLE_MODE or _SMOKE_NAMESPACE)
+
+
 # ============================================================================
 # log_event - Event Logging
 # ============================================================================
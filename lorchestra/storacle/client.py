@@ -7,18 +7,28 @@ Currently implements in-proc v0; RPC transport to follow.
 v0: Direct in-proc call to storacle.execute_plan(plan)
 Later: Wrap in JSON-RPC envelope and send over transport
 
+Two kinds of ops only touch local files and are applied here rather than sent
+to storacle: sqlite.sync ops with `mode: diff` (lorchestra.sqlite_sync applies
+only changed rows) and file.write deletions (`delete: true`, emitted by the
+file_renderer manifest for files whose rows vanished). They are applied only
+on the path that executes the plan: with storacle not installed the whole
+plan is a noop, local ops included.
+
 Error classification:
 - TransientError/PermanentError propagated unchanged from storacle
 - Builtin TimeoutError -> TransientError (safe to retry)
 - Unknown exceptions -> PermanentError (fail fast, no string matching)
 """
 
+import sqlite3
 import uuid
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
+from pathlib import Path
 
 from lorchestra.errors import TransientError, PermanentError
-from lorchestra.plan_builder import StoraclePlan
+from lorchestra.plan_builder import StoracleOp, StoraclePlan, expand_plan_dict
+from lorchestra.sqlite_sync import diff_sync
 
 
 @dataclass
@@ -70,6 +80,53 @@ def submit_plan(plan: StoraclePlan, meta: RpcMeta) -> dict:
         return _submit_rpc(plan, meta)
 
 
+def _is_local(op: StoracleOp) -> bool:
+    """True for ops lorchestra applies locally instead of sending to storacle."""
+    if op.method == "sqlite.sync":
+        return op.params.get("mode") == "diff"
+    if op.method == "file.write":
+        return op.params.get("delete") is True
+    return False
+
+
+def _apply_local(op: StoracleOp) -> dict:
+    """
+    Apply a local op and wrap its result as a JSON-RPC response.
+
+    Error classification:
+    - sqlite3.OperationalError (e.g. database is locked): transient
+    - Other failures: permanent
+    """
+    try:
+        if op.method == "sqlite.sync":
+            result = diff_sync(op.params)
+        else:
+            path = _deletable_path(op.params)
+            result = {"deleted": path.exists()}
+            path.unlink(missing_ok=True)
+    except sqlite3.OperationalError as e:
+        raise TransientError(str(e)) from e
+    except Exception as e:
+        raise PermanentError(str(e)) from e
+    return {"jsonrpc": "2.0", "id": op.op_id, "result": result}
+
+
+def _deletable_path(params: dict) -> Path:
+    """
+    The file a file.write deletion removes.
+
+    Raises:
+        ValueError: If the op has no base_path, or its path is not under it
+    """
+    if not params.get("base_path"):
+        raise ValueError("file.write delete requires base_path")
+    base = Path(params["base_path"]).expanduser().resolve()
+    path = Path(params["path"]).expanduser().resolve()
+    if path == base or not path.is_relative_to(base):
+        raise ValueError(f"Refusing to delete {path}: not under base_path {base}")
+    return path
+
+
 def _submit_inproc(plan: StoraclePlan, meta: RpcMeta) -> dict:
     """
     In-proc path: call storacle directly with plan object.
@@ -79,17 +136,28 @@ def _submit_inproc(plan: StoraclePlan, meta: RpcMeta) -> dict:
     - PermanentError: Already classified, propagate
     - TimeoutError: Builtin timeout is transient
     - Exception: Unknown = permanent (fail fast)
+
+    Local ops (diff sqlite.sync, file deletions) are applied first, once
+    storacle is known to be installed; their JSON-RPC style responses
+    precede storacle's (or sit under "local" if storacle returns a dict).
     """
     try:
         # Try to import storacle - it may not be installed
         from storacle.rpc import execute_plan  # type: ignore
     except ImportError:
-        # Storacle not installed - use noop implementation
+        # Storacle not installed - use noop implementation (local ops too)
         return _noop_execute_plan(plan, meta)
 
+    local_results = [_apply_local(op) for op in plan.ops if _is_local(op)]
+    if local_results:
+        remote_ops = [op for op in plan.ops if not _is_local(op)]
+        if not remote_ops:
+            return local_results
+        plan = StoraclePlan(correlation_id=plan.correlation_id, ops=remote_ops)
+
     try:
-        result = execute_plan(plan.to_dict())
-        return result
+        # Columnar ops (rows_columnar) are expanded to rows for storacle
+        result = execute_plan(expand_plan_dict(plan.to_dict()))
     except TransientError:
         raise  # Already classified, propagate
     except PermanentError:
@@ -98,6 +166,11 @@ def _submit_inproc(plan: StoraclePlan, meta: RpcMeta) -> dict:
         raise TransientError(str(e)) from e  # Builtin timeout is transient
     except Exception as e:
         raise PermanentError(str(e)) from e  # Unknown = permanent (fail fast)
+    if not local_results:
+        return result
+    if isinstance(result, list):
+        return local_results + result
+    return {**result, "local": local_results}
 
 
 def _noop_execute_plan(plan: StoraclePlan, meta: RpcMeta) -> dict:
@@ -125,7 +198,7 @@ def _submit_rpc(plan: StoraclePlan, meta: RpcMeta) -> dict:
         "method": "storacle.execute_plan",
         "params": {
             "_meta": asdict(meta),
-            "payload": plan.to_dict(),
+            "payload": expand_plan_dict(plan.to_dict()),
         },
     }
 
@@ -0,0 +1,257 @@
+"""
+WatermarkStore - Persist per-job high-water marks for incremental reads.
+
+A watermark is the max source timestamp a job has successfully processed.
+storacle.query steps with `incremental.mode: watermark` read it to emit a
+partition-prunable `WHERE s.{source_ts} > @_watermark` filter, and the
+executor advances it only after the job's writes (storacle.submit) succeed.
+
+Ingest jobs keep a watermark per (source_system, connection_name, object_type)
+for `auto_since`: the max last_seen of the raw_objects rows they wrote. BigQuery
+stays authoritative; `reconcile` replaces a local watermark with the BQ value
+and stamps when it was last verified.
+
+Watermarks only move forward via `advance`: advancing to an older value is a
+no-op, so a late or replayed run can never rewind a job into re-processing
+old rows.
+
+Storage backends:
+- In-memory (for testing)
+- File-based (default, one JSON file per watermark key)
+"""
+
+import json
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+
+# Default storage path, next to the run store: ~/.local/lorchestra/watermarks/
+DEFAULT_WATERMARK_PATH = Path.home() / ".local" / "lorchestra" / "watermarks"
+
+
+def normalize_watermark(value: Any) -> Optional[str]:
+    """Normalize a timestamp value to a UTC ISO-8601 string.
+
+    BQ rows surface timestamps as datetimes or ISO strings (with either a
+    "+00:00" or "Z" suffix). Normalizing to UTC makes watermarks comparable.
+    Naive timestamps are assumed to be UTC.
+
+    Args:
+        value: datetime, ISO string, or None.
+
+    Returns:
+        UTC ISO string, or None if value is None/empty.
+
+    Raises:
+        ValueError: If value is not a parseable timestamp.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def query_watermark_key(job_id: str, step_id: str, incremental: dict) -> str:
+    """Get the watermark key for a watermark-mode storacle.query step.
+
+    Defaults to "{job_id}:{step_id}"; jobs sharing a watermark can set
+    incremental.watermark_key explicitly.
+    """
+    return incremental.get("watermark_key") or f"{job_id}:{step_id}"
+
+
+def ingest_watermark_key(source_system: str, connection_name: str, object_type: str) -> str:
+    """Get the watermark key for an ingest stream in raw_objects."""
+    return f"raw_objects:{source_system}:{connection_name}:{object_type}"
+
+
+def _is_newer(candidate: str, current: Optional[str]) -> bool:
+    """True if candidate is strictly after current (None is before everything)."""
+    if current is None:
+        return True
+    return datetime.fromisoformat(candidate) > datetime.fromisoformat(current)
+
+
+class WatermarkStore(ABC):
+    """
+    Abstract base class for watermark storage.
+
+    Implementations must provide methods to:
+    - Read the current watermark for a key
+    - Advance the watermark for a key (forward only)
+    - Reconcile a key against an authoritative value (may move backward)
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get the current watermark for a key.
+
+        Args:
+            key: Watermark key (e.g., "form_me_followup:read")
+
+        Returns:
+            UTC ISO timestamp string, or None if no watermark is recorded
+        """
+        pass
+
+    @abstractmethod
+    def advance(self, key: str, value: Any) -> bool:
+        """
+        Advance the watermark for a key.
+
+        Args:
+            key: Watermark key
+            value: New high-water mark (datetime or ISO string)
+
+        Returns:
+            True if the watermark moved forward, False if value was not newer
+        """
+        pass
+
+    @abstractmethod
+    def reconcile(self, key: str, value: Any) -> None:
+        """
+        Replace the watermark with an authoritative value and mark it verified.
+
+        Args:
+            key: Watermark key
+            value: Authoritative high-water mark (e.g., BQ MAX(last_seen))
+        """
+        pass
+
+    @abstractmethod
+    def get_verified_at(self, key: str) -> Optional[datetime]:
+        """
+        Get when a key was last reconciled against its authoritative source.
+
+        Args:
+            key: Watermark key
+
+        Returns:
+            UTC datetime of the last reconcile, or None if never verified
+        """
+        pass
+
+
+class InMemoryWatermarkStore(WatermarkStore):
+    """
+    In-memory implementation of WatermarkStore for testing.
+
+    Watermarks are lost when the process exits.
+    """
+
+    def __init__(self):
+        self._watermarks: dict[str, str] = {}
+        self._verified_at: dict[str, datetime] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._watermarks.get(key)
+
+    def advance(self, key: str, value: Any) -> bool:
+        value = normalize_watermark(value)
+        if value is None or not _is_newer(value, self._watermarks.get(key)):
+            return False
+        self._watermarks[key] = value
+        return True
+
+    def reconcile(self, key: str, value: Any) -> None:
+        value = normalize_watermark(value)
+        if value is None:
+            self._watermarks.pop(key, None)
+        else:
+            self._watermarks[key] = value
+        self._verified_at[key] = datetime.now(timezone.utc)
+
+    def get_verified_at(self, key: str) -> Optional[datetime]:
+        return self._verified_at.get(key)
+
+    def clear(self) -> None:
+        """Clear all stored watermarks."""
+        self._watermarks.clear()
+        self._verified_at.clear()
+
+
+class FileWatermarkStore(WatermarkStore):
+    """
+    File-based implementation of WatermarkStore.
+
+    Stores one JSON file per key:
+        store_dir/
+            {key}.json   # {"key", "watermark", "updated_at", "verified_at"}
+
+    Writes go to a temp file in the same directory followed by os.replace,
+    so a crash mid-write never leaves a truncated watermark behind.
+    """
+
+    def __init__(self, store_dir: Path | str):
+        self._store_dir = Path(store_dir)
+        self._store_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a key (unsafe filename characters replaced)."""
+        return self._store_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}.json"
+
+    def _read(self, key: str) -> dict[str, Any]:
+        """Read the stored record for a key (empty dict if none)."""
+        path = self._path(key)
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._read(key).get("watermark")
+
+    def advance(self, key: str, value: Any) -> bool:
+        value = normalize_watermark(value)
+        record = self._read(key)
+        if value is None or not _is_newer(value, record.get("watermark")):
+            return False
+        self._write(key, value, record.get("verified_at"))
+        return True
+
+    def reconcile(self, key: str, value: Any) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        self._write(key, normalize_watermark(value), now)
+
+    def get_verified_at(self, key: str) -> Optional[datetime]:
+        verified_at = self._read(key).get("verified_at")
+        return datetime.fromisoformat(verified_at) if verified_at else None
+
+    def _write(self, key: str, value: Optional[str], verified_at: Optional[str]) -> None:
+        """Atomically replace the record for a key."""
+        record = {
+            "key": key,
+            "watermark": value,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "verified_at": verified_at,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self._store_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f, indent=2)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def get_default_watermark_store() -> FileWatermarkStore:
+    """
+    Get a FileWatermarkStore with the default path.
+
+    Returns:
+        FileWatermarkStore configured to use ~/.local/lorchestra/watermarks/
+    """
+    return FileWatermarkStore(DEFAULT_WATERMARK_PATH)
@@ -40,7 +40,8 @@ print('Deleted canonical sessions')
 # Step 2: Re-run canonization
 echo ""
 echo "--- Re-canonizing sessions ---"
-python -c "from lorchestra.job_runner import run_job; run_job('canonize_dataverse_sessions')"
+# Full-source read (no limit), fetched as parallel last_seen shards
+lorchestra run canonize_dataverse_sessions_full
 
 echo ""
 echo "=== Recanonization Complete ==="
@@ -128,3 +128,64 @@ class TestStubCallables:
 
         with pytest.raises(NotImplementedError, match="not installed"):
             dispatch_callable("injest", {})
+
+
+class TestLazyLoading:
+    """Callable modules are imported on first dispatch of their name only."""
+
+    @pytest.fixture
+    def fresh_registry(self, monkeypatch, tmp_path):
+        import sys
+        import lorchestra.callable.dispatch as dispatch
+
+        (tmp_path / "lazy_probe_callable.py").write_text(
+            "def execute(params):\n"
+            "    return {'items': [params], 'stats': {}}\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.setitem(dispatch.CALLABLE_MODULES, "lazy_probe", ("lazy_probe_callable",))
+        monkeypatch.setattr(dispatch, "_CALLABLES", None)
+        monkeypatch.setattr(dispatch, "_PLUGINS", None)
+        sys.modules.pop("lazy_probe_callable", None)
+        yield dispatch
+        sys.modules.pop("lazy_probe_callable", None)
+
+    def test_module_imported_on_first_dispatch(self, fresh_registry):
+        import sys
+
+        callables = get_callables()
+        assert "lazy_probe" in callables
+        assert "lazy_probe_callable" not in sys.modules
+
+        result = dispatch_callable("lazy_probe", {"x": 1})
+
+        assert result.items == [{"x": 1}]
+        assert "lazy_probe_callable" in sys.modules
+
+    def test_first_importable_module_wins(self, fresh_registry, monkeypatch):
+        monkeypatch.setitem(
+            fresh_registry.CALLABLE_MODULES, "lazy_probe", ("not_installed_pkg", "lazy_probe_callable")
+        )
+        assert dispatch_callable("lazy_probe", {"y": 2}).items == [{"y": 2}]
+
+    def test_missing_module_behaves_as_stub(self, fresh_registry, monkeypatch):
+        monkeypatch.setitem(fresh_registry.CALLABLE_MODULES, "absent", ("not_installed_pkg",))
+
+        with pytest.raises(NotImplementedError, match="not installed"):
+            dispatch_callable("absent", {})
+
+    def test_entry_point_plugin(self, fresh_registry, monkeypatch):
+        from importlib.metadata import EntryPoint
+
+        ep = EntryPoint(name="probe_plugin", value="lazy_probe_callable", group="lorchestra.callables")
+        scans = []
+        monkeypatch.setattr(
+            fresh_registry, "entry_points", lambda group: scans.append(group) or [ep]
+        )
+
+        assert dispatch_callable("probe_plugin", {"z": 3}).items == [{"z": 3}]
+        assert dispatch_callable("probe_plugin", {"z": 4}).items == [{"z": 4}]
+        assert scans == ["lorchestra.callables"]
+
+        with pytest.raises(ValueError, match="Unknown callable"):
+            dispatch_callable("no_such_plugin", {})
@@ -0,0 +1,163 @@
+"""Tests for parallel (process pool) callable execution."""
+
+import os
+from datetime import date
+
+import pytest
+
+import lorchestra.callable.dispatch as dispatch
+from lorchestra.callable.parallel import merge_stats, parallel_options, run_parallel
+from lorchestra.row_decoder import LazyJson
+
+
+def _double(params: dict) -> dict:
+    items = [{"n": item["n"] * 2, "pid": os.getpid()} for item in params["items"]]
+    return {"items": items, "stats": {"processed": len(items), "errors": [], "source": params["tag"]}}
+
+
+def _describe(params: dict) -> dict:
+    items = [{"types": sorted(type(v).__name__ for v in item.values()), **item} for item in params["items"]]
+    return {"items": items, "stats": {}}
+
+
+def _fail(params: dict) -> dict:
+    raise RuntimeError("transform failed")
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    from lorchestra.callable import parallel
+
+    monkeypatch.setattr(parallel, "spill_dir", lambda: tmp_path)
+    monkeypatch.setattr(dispatch, "_CALLABLES", None)
+    dispatch.register_callable("double", _double)
+    dispatch.register_callable("describe", _describe)
+    dispatch.register_callable("fail", _fail)
+    yield
+
+
+class TestParallelOptions:
+    """Tests for parallel_options."""
+
+    def test_true_uses_cpu_count(self):
+        workers, chunk_size, transport = parallel_options(True, 10_000)
+        assert workers == (os.cpu_count() or 1)
+        assert chunk_size >= 50
+        assert transport == "spill"
+
+    def test_worker_count_and_dict(self):
+        assert parallel_options(2, 800) == (2, 100, "spill")
+        assert parallel_options({"workers": 3, "chunk_size": 7, "transport": "pickle"}, 100) == (3, 7, "pickle")
+
+    @pytest.mark.parametrize("spec", ["yes", {"workers": 0}, {"chunk_size": 0}, {"transport": "shm"}])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parallel_options(spec, 10)
+
+
+class TestMergeStats:
+    """Tests for merge_stats."""
+
+    def test_merge(self):
+        merged = merge_stats([
+            {"processed": 2, "errors": ["a"], "by_type": {"x": 1}, "ok": True, "model": "m"},
+            {"processed": 3, "errors": ["b"], "by_type": {"x": 1, "y": 2}, "ok": False, "model": "m"},
+        ])
+        assert merged == {
+            "processed": 5, "errors": ["a", "b"], "by_type": {"x": 2, "y": 2}, "ok": False, "model": "m",
+        }
+
+
+class TestRunParallel:
+    """Tests for run_parallel."""
+
+    def test_items_in_order_across_workers(self, registry):
+        items = [{"n": i} for i in range(200)]
+
+        result = run_parallel("double", {"items": items, "tag": "t"}, {"workers": 2, "chunk_size": 25})
+
+        assert [item["n"] for item in result.items] == [i * 2 for i in range(200)]
+        assert result.stats == {"processed": 200, "errors": [], "source": "t"}
+        # Ran in worker processes
+        assert os.getpid() not in {item["pid"] for item in result.items}
+
+    def test_single_chunk_runs_in_process(self, registry):
+        result = run_parallel("double", {"items": [{"n": 1}], "tag": "t"}, True)
+
+        assert result.items[0]["pid"] == os.getpid()
+
+    def test_empty_items(self, registry):
+        result = run_parallel("double", {"items": [], "tag": "t"}, True)
+
+        assert result.items == []
+        assert result.stats["processed"] == 0
+
+    def test_errors_propagate(self, registry):
+        items = [{"n": i} for i in range(10)]
+        with pytest.raises(RuntimeError, match="transform failed"):
+            run_parallel("fail", {"items": items}, {"workers": 2, "chunk_size": 5})
+
+    def test_unknown_callable(self, registry):
+        with pytest.raises(ValueError, match="Unknown callable"):
+            run_parallel("nope", {"items": [{"n": 1}]}, True)
+
+    @pytest.mark.parametrize("transport", ["spill", "pickle"])
+    def test_transports_agree(self, registry, transport):
+        items = [{"n": i} for i in range(30)]
+        spec = {"workers": 2, "chunk_size": 7, "transport": transport}
+
+        result = run_parallel("double", {"items": items, "tag": "t"}, spec)
+
+        assert [item["n"] for item in result.items] == [i * 2 for i in range(30)]
+        assert result.stats["processed"] == 30
+
+    def test_spill_passes_lazy_payloads_parsed(self, registry):
+        items = [{"id": i, "payload": LazyJson('{"a": %d}' % i)} for i in range(6)]
+
+        result = run_parallel("describe", {"items": items}, {"workers": 2, "chunk_size": 3})
+
+        assert result.items[0]["types"] == ["dict", "int"]
+        assert [item["payload"]["a"] for item in result.items] == list(range(6))
+
+    def test_unspillable_items_fall_back_to_pickle(self, registry):
+        items = [{"day": date(2026, 1, i + 1)} for i in range(6)]
+
+        result = run_parallel("describe", {"items": items}, {"workers": 2, "chunk_size": 3})
+
+        assert result.items[5]["day"] == date(2026, 1, 6)
+
+    def test_spilled_items_are_not_rewritten(self, registry, tmp_path, monkeypatch):
+        from lorchestra.callable import parallel
+        from lorchestra.spill import spill_items
+
+        items = spill_items([{"n": i} for i in range(12)], tmp_path / "items.ndjson")
+        writes = []  # Parent-process writes only (workers append to their own copy)
+        write_rows = parallel.write_rows
+        monkeypatch.setattr(parallel, "write_rows", lambda rows, path: writes.append(path) or write_rows(rows, path))
+
+        result = run_parallel("double", {"items": items, "tag": "t"}, {"workers": 2, "chunk_size": 5})
+
+        assert writes == []
+        assert [item["n"] for item in result.items] == [i * 2 for i in range(12)]
+
+    def test_spill_results_stay_spilled(self, registry, tmp_path):
+        from lorchestra.spill import SpilledItems
+
+        out = tmp_path / "result.ndjson"
+        items = [{"n": i} for i in range(12)]
+
+        result = run_parallel("double", {"items": items, "tag": "t"}, {"workers": 2, "chunk_size": 5}, spill_path=out)
+
+        assert isinstance(result.items, SpilledItems)
+        assert result.items.path == out
+        assert [item["n"] for item in result.items] == [i * 2 for i in range(12)]
+        assert result.stats["processed"] == 12
+
+    def test_spill_results_default_to_spill_dir(self, registry, tmp_path):
+        items = [{"n": i} for i in range(12)]
+
+        result = run_parallel("double", {"items": items, "tag": "t"}, {"workers": 2, "chunk_size": 5})
+
+        # Only the result file is left; the workers' files are removed
+        assert list(tmp_path.iterdir()) == [result.items.path]
+        assert len(result.items) == 12
@@ -0,0 +1,76 @@
+"""Tests for the render callable."""
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+import lorchestra.callable.dispatch as dispatch
+from lorchestra.callable import render
+from lorchestra.callable.parallel import run_parallel
+
+TEMPLATE = "Subject: Hi {{ name }}\n\nHello {{ name }}."
+
+
+@pytest.fixture(autouse=True)
+def _empty_template_cache(monkeypatch):
+    monkeypatch.setattr(render, "_TEMPLATES", type(render._TEMPLATES)())
+
+
+class TestRender:
+    """Tests for render.execute."""
+
+    def test_single(self):
+        result = render.execute({"template": TEMPLATE, "template_vars": {"name": "Ada"}})
+
+        assert result["items"] == [{"subject": "Hi Ada", "body": "Hello Ada.", "is_html": False}]
+
+    def test_batch(self):
+        items = [
+            {"to": f"u{i}@example.com", "template_vars": {"name": f"U{i}"}, "idempotency_key": f"k{i}"}
+            for i in range(3)
+        ]
+
+        result = render.execute({"template": TEMPLATE, "items": items})
+
+        assert [item["subject"] for item in result["items"]] == ["Hi U0", "Hi U1", "Hi U2"]
+        assert result["items"][2]["idempotency_key"] == "k2"
+        assert result["stats"] == {"count": 3}
+
+    def test_empty_batch(self):
+        assert render.execute({"template": TEMPLATE, "items": []})["items"] == []
+
+
+class TestTemplateCache:
+    """Tests for the compiled template cache."""
+
+    def test_compiles_once_per_source(self):
+        first = render._compile(TEMPLATE)
+
+        assert render._compile(TEMPLATE) is first
+        assert render._compile(TEMPLATE + "!") is not first
+        assert len(render._TEMPLATES) == 2
+
+    def test_least_recently_used_evicted(self, monkeypatch):
+        monkeypatch.setattr(render, "MAX_CACHED_TEMPLATES", 2)
+        a = render._compile("a")
+        render._compile("b")
+        render._compile("a")
+        render._compile("c")  # Evicts "b"
+
+        assert render._compile("a") is a
+        assert len(render._TEMPLATES) == 2
+        assert all(t.render() in ("a", "c") for t in render._TEMPLATES.values())
+
+
+def test_parallel_batch_render(monkeypatch):
+    """A large batch renders in chunks across workers, in order."""
+    monkeypatch.setattr(dispatch, "_CALLABLES", None)
+    items = [
+        {"to": f"u{i}@example.com", "template_vars": {"name": f"U{i}"}, "idempotency_key": f"k{i}"}
+        for i in range(120)
+    ]
+
+    result = run_parallel("render", {"template": TEMPLATE, "items": items}, {"workers": 2, "chunk_size": 50})
+
+    assert [item["subject"] for item in result.items] == [f"Hi U{i}" for i in range(120)]
+    assert result.stats == {"count": 120}
@@ -49,6 +49,13 @@ def _prefer_sibling_repo_dependencies():
 
     yield
 
+
+@pytest.fixture(autouse=True)
+def _lock_dir(tmp_path, monkeypatch):
+    """Keep target locks (taken by every pipeline and job run) out of ~/.local."""
+    monkeypatch.setattr("lorchestra.locks.DEFAULT_LOCK_DIR", tmp_path / "locks")
+    return tmp_path / "locks"
+
 @pytest.fixture
 def test_config():
     return LorchestraConfig(
@@ -71,3 +78,22 @@ def mock_load_config(request, test_config):
 
     with patch("lorchestra.config.load_config", return_value=test_config):
         yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_inference_cache(tmp_path, monkeypatch):
+    """Keep LLM steps from reading or writing the user's inference cache."""
+    from lorchestra import inference_cache
+
+    monkeypatch.setattr(inference_cache, "DEFAULT_INFERENCE_CACHE_PATH", tmp_path / "inference_cache.sqlite")
+    monkeypatch.setattr(inference_cache, "_DEFAULT_CACHE", None)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_rate_limits(monkeypatch):
+    """Give each test fresh, unlimited LLM rate limiters without backoff sleeps."""
+    from lorchestra import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "_REGISTRY", rate_limiter.LimiterRegistry({}, backoff_seconds=0))
+    yield
@@ -281,3 +281,105 @@ class TestPipelineIntegration:
         assert plan.ops[0].params["content"] == "# Alice"
         assert plan.ops[1].params["path"].endswith("Bob.md")
         assert plan.ops[0].idempotency_key is None
+
+
+# ============================================================================
+# Incremental projection (manifest)
+# ============================================================================
+
+
+class TestIncrementalManifest:
+    """file_renderer with manifest_path emits only changed files and deletions."""
+
+    def _db(self, tmp_path, names):
+        db_path = str(tmp_path / "test.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE IF EXISTS t")
+        conn.execute("CREATE TABLE t (name TEXT, body TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", names.items())
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def _render(self, tmp_path, names, **extra):
+        from lorchestra.callable.file_renderer import execute
+
+        return execute({
+            "sqlite_path": self._db(tmp_path, names),
+            "query": "SELECT name, body FROM t ORDER BY name",
+            "base_path": str(tmp_path / "out"),
+            "path_template": "{name}.md",
+            "content_template": "{body}",
+            "front_matter": {"projected_at": "{_projected_at}"},
+            "manifest_path": str(tmp_path / "manifest.json"),
+            **extra,
+        })
+
+    def _write(self, result):
+        for item in result["items"]:
+            if not item.get("delete"):
+                path = Path(item["path"])
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(item["content"])
+
+    def test_unchanged_rows_are_skipped(self, tmp_path):
+        first = self._render(tmp_path, {"a": "one", "b": "two"})
+        self._write(first)
+
+        second = self._render(tmp_path, {"a": "one", "b": "TWO"})
+
+        assert [Path(i["path"]).name for i in second["items"]] == ["b.md"]
+        assert second["stats"]["skipped"] == 1
+        assert second["stats"]["input"] == 2
+
+    def test_unwritten_files_are_emitted_again(self, tmp_path):
+        self._render(tmp_path, {"a": "one"})  # never written
+
+        again = self._render(tmp_path, {"a": "one"})
+
+        assert len(again["items"]) == 1
+
+    def test_vanished_rows_are_deleted(self, tmp_path):
+        self._write(self._render(tmp_path, {"a": "one", "b": "two"}))
+
+        result = self._render(tmp_path, {"a": "one"})
+
+        assert result["items"] == [
+            {"path": str(tmp_path / "out" / "b.md"), "delete": True, "base_path": str(tmp_path / "out")},
+        ]
+        assert result["stats"]["deleted"] == 1
+
+        # Once the file is gone the manifest forgets it
+        (tmp_path / "out" / "b.md").unlink()
+        assert self._render(tmp_path, {"a": "one"})["items"] == []
+
+    def test_empty_query_deletes_nothing(self, tmp_path):
+        self._write(self._render(tmp_path, {"a": "one", "b": "two"}))
+
+        result = self._render(tmp_path, {})
+
+        assert result["items"] == []
+        assert result["stats"]["deleted"] == 0
+        # The manifest is kept: the rows coming back changes nothing
+        assert self._render(tmp_path, {"a": "one", "b": "two"})["items"] == []
+
+    def test_empty_query_deletes_with_allow_empty(self, tmp_path):
+        self._write(self._render(tmp_path, {"a": "one", "b": "two"}))
+
+        result = self._render(tmp_path, {}, allow_empty=True)
+
+        assert result["stats"]["deleted"] == 2
+
+    def test_paths_outside_base_path_are_not_deleted(self, tmp_path):
+        import json
+
+        self._write(self._render(tmp_path, {"a": "one", "b": "two"}))
+        outside = tmp_path / "elsewhere.md"
+        outside.write_text("keep")
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        manifest["files"][str(outside)] = ["0" * 64, 0]
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+        result = self._render(tmp_path, {"a": "one", "b": "two"})
+
+        assert result["items"] == []
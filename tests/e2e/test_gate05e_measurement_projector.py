@@ -155,13 +155,8 @@ class TestIncrementalConfig:
         job_def = registry.load(job_id)
 
         incremental = job_def.steps[0].params["incremental"]
-        assert incremental["target_dataset"] == "derived"
-        assert incremental["target_table"] == "measurement_events"
-        assert incremental["source_key"] == "idem_key"
-        assert incremental["target_key"] == "canonical_object_id"
-        assert incremental["mode"] == "left_anti"
+        assert incremental["mode"] == "watermark"
         assert incremental["source_ts"] == "canonicalized_at"
-        assert incremental["target_ts"] == "processed_at"
 
 
 # ============================================================================
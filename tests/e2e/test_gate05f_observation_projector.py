@@ -180,11 +180,8 @@ class TestIncrementalConfig:
         job_def = registry.load(job_id)
 
         incremental = job_def.steps[0].params["incremental"]
-        assert incremental["target_dataset"] == "derived"
-        assert incremental["target_table"] == "observations"
-        assert incremental["source_key"] == "measurement_event_id"
-        assert incremental["target_key"] == "measurement_event_id"
-        assert incremental["mode"] == "left_anti"
+        assert incremental["mode"] == "watermark"
+        assert incremental["source_ts"] == "processed_at"
 
 
 # ============================================================================
@@ -390,6 +390,33 @@ class TestRunPipeline:
         for c in mock_execute.call_args_list:
             assert c.args[0]["smoke_namespace"] == "test_ns"
 
+    @patch("lorchestra.pipeline.load_pipeline")
+    @patch("lorchestra.executor.execute", side_effect=_mock_execute_success)
+    def test_query_cache_shared_across_children(self, mock_execute, mock_load):
+        """Every child envelope carries the same pipeline-scoped QueryCache."""
+        from lorchestra.query_cache import QueryCache
+
+        spec = load_pipeline("pipeline.formation")
+        run_pipeline(spec)
+
+        caches = {id(c.args[0]["query_cache"]) for c in mock_execute.call_args_list}
+        assert len(caches) == 1
+        assert isinstance(mock_execute.call_args_list[0].args[0]["query_cache"], QueryCache)
+
+    @patch("lorchestra.executor.execute", side_effect=_mock_execute_success)
+    def test_registry_and_store_passed_to_children(self, mock_execute):
+        """A caller's registry and run store reach every child, sub-pipelines included."""
+        from lorchestra.registry import JobRegistry
+        from lorchestra.run_store import InMemoryRunStore
+
+        registry = JobRegistry(DEFINITIONS_DIR)
+        store = InMemoryRunStore()
+        run_pipeline(load_pipeline("pipeline.daily_all"), registry=registry, store=store)
+
+        envelopes = [c.args[0] for c in mock_execute.call_args_list]
+        assert len(envelopes) == 51
+        assert all(e["registry"] is registry and e["store"] is store for e in envelopes)
+
     @patch("lorchestra.pipeline.load_pipeline")
     @patch("lorchestra.executor.execute")
     def test_exception_in_execute_counted_as_failure(self, mock_execute, mock_load):
@@ -406,6 +433,19 @@ class TestRunPipeline:
         assert result.success is False
         assert "connection lost" in result.failures[0]["error"]
 
+    @patch("lorchestra.pipeline.load_pipeline")
+    @patch("lorchestra.executor.execute", side_effect=_mock_execute_success)
+    def test_running_pipeline_raises_lock_held(self, mock_execute, mock_load):
+        """A pipeline already running (e.g. under the scheduler) is not run again."""
+        from lorchestra.locks import LockHeld, target_lock
+
+        spec = load_pipeline("pipeline.formation")
+        with target_lock("pipeline.formation"):
+            with pytest.raises(LockHeld):
+                run_pipeline(spec)
+
+        assert mock_execute.call_count == 0
+
 
 # ---------------------------------------------------------------------------
 # stop_on_failure semantics
@@ -500,6 +540,20 @@ class TestRecursivePipeline:
         assert result.succeeded == 0
         assert result.failures[0]["job_id"] == "pipeline.ingest"
 
+    @patch("lorchestra.executor.execute", side_effect=_mock_execute_success)
+    def test_running_sub_pipeline_is_not_rerun(self, mock_execute):
+        """A sub-pipeline already running elsewhere fails under its lock."""
+        from lorchestra.locks import target_lock
+
+        spec = load_pipeline("pipeline.daily_all")
+        with target_lock("pipeline.ingest"):
+            result = run_pipeline(spec)
+
+        assert mock_execute.call_count == 0
+        assert result.stopped_early is True
+        assert result.failures[0]["job_id"] == "pipeline.ingest"
+        assert "already running" in result.failures[0]["error"]
+
 
 # ---------------------------------------------------------------------------
 # Job output capture (@run context)
@@ -692,6 +746,42 @@ class TestLoopDirective:
         assert result.succeeded == 1
         assert mock_execute.call_count == 1  # only peek called
 
+    @patch("lorchestra.executor.execute")
+    def test_loop_over_spilled_items(self, mock_execute, tmp_path):
+        """Loop iterates a spilled job output (SpilledItems) like a list."""
+        from lorchestra.spill import spill_items
+
+        spilled = spill_items([{"session_id": "sess_001"}, {"session_id": "sess_002"}], tmp_path / "peek.ndjson")
+
+        def mock_fn(envelope):
+            result = MagicMock()
+            result.success = True
+            result.error = None
+            result.run_id = "01MOCK000000000000000000000"
+            result.step_outputs = {"read": {"items": spilled}} if envelope["job_id"] == "peek" else {}
+            return result
+
+        mock_execute.side_effect = mock_fn
+
+        spec = {
+            "pipeline_id": "test_spilled_loop",
+            "stages": [
+                {"name": "query", "jobs": ["peek"]},
+                {
+                    "name": "extract",
+                    "loop": {
+                        "over": "@run.peek.items",
+                        "payload": {"session_id": "@item.session_id"},
+                        "jobs": ["extract_job"],
+                    },
+                },
+            ],
+        }
+        result = run_pipeline(spec)
+
+        assert result.success is True
+        assert result.total == 1 + 2
+
     @patch("lorchestra.executor.execute")
     def test_loop_missing_run_ref_skips(self, mock_execute):
         """Loop referencing a non-existent @run entry runs no loop jobs."""
@@ -190,3 +190,144 @@ class TestStoraclePlanSerialization:
         assert op["params"]["id"] == 1
         assert op["params"]["data"] == "test"
         assert op["params"]["idempotency_key"] == "sha256:abc123"
+
+
+class TestColumnarBoundary:
+    """Columnar ops are expanded to rows before reaching storacle."""
+
+    def test_inproc_expands_rows_columnar(self, sample_meta, monkeypatch):
+        import sys
+        import types
+        from lorchestra.plan_builder import to_columnar
+
+        received = []
+        rpc = types.ModuleType("storacle.rpc")
+        rpc.execute_plan = lambda plan: received.append(plan) or []
+        monkeypatch.setitem(sys.modules, "storacle", types.ModuleType("storacle"))
+        monkeypatch.setitem(sys.modules, "storacle.rpc", rpc)
+
+        rows = [{"idem_key": "a", "object_type": "email"}, {"idem_key": "b", "object_type": "email"}]
+        plan = StoraclePlan(
+            correlation_id="c",
+            ops=[StoracleOp(
+                op_id="op-1",
+                method="bq.upsert",
+                params={"dataset": "raw", "table": "raw_objects", "rows_columnar": to_columnar(rows)},
+            )],
+        )
+        submit_plan(plan, sample_meta)
+
+        params = received[0]["ops"][0]["params"]
+        assert params["rows"] == rows
+        assert "rows_columnar" not in params
+        # The plan's own serialization keeps the columnar form
+        assert "rows_columnar" in plan.to_dict()["ops"][0]["params"]
+
+
+class TestLocalOps:
+    """Diff sqlite.sync ops and file deletions are applied locally."""
+
+    @pytest.fixture
+    def storacle(self, monkeypatch):
+        """Install a fake storacle.rpc; returns the plans it received."""
+        import sys
+        import types
+
+        received = []
+        rpc = types.ModuleType("storacle.rpc")
+        rpc.execute_plan = lambda plan: received.append(plan) or {"status": "ok", "ops": len(plan["ops"])}
+        monkeypatch.setitem(sys.modules, "storacle", types.ModuleType("storacle"))
+        monkeypatch.setitem(sys.modules, "storacle.rpc", rpc)
+        return received
+
+    @pytest.fixture
+    def no_storacle(self, monkeypatch):
+        import sys
+
+        monkeypatch.setitem(sys.modules, "storacle.rpc", None)  # import raises ImportError
+
+    def _sync_op(self, tmp_path) -> StoracleOp:
+        return StoracleOp(
+            op_id="sync-1",
+            method="sqlite.sync",
+            params={
+                "sqlite_path": str(tmp_path / "local.db"),
+                "table": "clients",
+                "columns": ["id"],
+                "rows": [{"id": "1"}],
+                "mode": "diff",
+            },
+        )
+
+    def test_diff_op_not_sent_to_storacle(self, tmp_path, sample_meta, storacle):
+        plan = StoraclePlan(correlation_id="c", ops=[self._sync_op(tmp_path)])
+
+        result = submit_plan(plan, sample_meta)
+
+        assert result == [{
+            "jsonrpc": "2.0",
+            "id": "sync-1",
+            "result": {"inserted": 1, "updated": 0, "deleted": 0, "unchanged": 0},
+        }]
+        assert storacle == []
+
+    def test_other_ops_still_submitted(self, tmp_path, sample_plan, sample_meta, storacle):
+        plan = StoraclePlan(correlation_id="c", ops=[self._sync_op(tmp_path), *sample_plan.ops])
+
+        result = submit_plan(plan, sample_meta)
+
+        # storacle saw only the remote ops
+        assert result["status"] == "ok"
+        assert result["ops"] == 2
+        assert result["local"][0]["id"] == "sync-1"
+
+    def test_noop_leaves_local_files_alone(self, tmp_path, sample_meta, no_storacle):
+        target = tmp_path / "keep.md"
+        target.write_text("x")
+        plan = StoraclePlan(correlation_id="c", ops=[
+            self._sync_op(tmp_path),
+            StoracleOp(
+                op_id="del-1",
+                method="file.write",
+                params={"path": str(target), "delete": True, "base_path": str(tmp_path)},
+            ),
+        ])
+
+        result = submit_plan(plan, sample_meta)
+
+        assert result["status"] == "noop"
+        assert result["ops_executed"] == 2
+        assert not (tmp_path / "local.db").exists()
+        assert target.exists()
+
+    def test_file_deletion_applied_locally(self, tmp_path, sample_meta, storacle):
+        target = tmp_path / "vault" / "gone.md"
+        target.parent.mkdir()
+        target.write_text("x")
+        plan = StoraclePlan(correlation_id="c", ops=[
+            StoracleOp(
+                op_id="del-1",
+                method="file.write",
+                params={"path": str(target), "delete": True, "base_path": str(tmp_path / "vault")},
+            ),
+        ])
+
+        result = submit_plan(plan, sample_meta)
+
+        assert result == [{"jsonrpc": "2.0", "id": "del-1", "result": {"deleted": True}}]
+        assert not target.exists()
+
+    @pytest.mark.parametrize("base_path", [None, "vault"])
+    def test_file_deletion_outside_base_path_refused(self, tmp_path, sample_meta, storacle, base_path):
+        target = tmp_path / "vault" / ".." / "keep.md"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "keep.md").write_text("x")
+        params = {"path": str(target), "delete": True}
+        if base_path:
+            params["base_path"] = str(tmp_path / base_path)
+        plan = StoraclePlan(correlation_id="c", ops=[StoracleOp(op_id="del-1", method="file.write", params=params)])
+
+        with pytest.raises(PermanentError):
+            submit_plan(plan, sample_meta)
+
+        assert (tmp_path / "keep.md").exists()
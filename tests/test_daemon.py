@@ -0,0 +1,186 @@
+"""Tests for the lorchestra serve daemon and submit client."""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from lorchestra import daemon
+from lorchestra.daemon import DaemonError, submit
+
+
+@pytest.fixture
+def socket_dir(monkeypatch):
+    # Short path: Unix socket paths are limited to ~100 bytes
+    path = Path(tempfile.mkdtemp(prefix="lo", dir="/tmp"))
+    monkeypatch.setattr("lorchestra.watermark_store.DEFAULT_WATERMARK_PATH", path / "wm")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def running(socket_dir):
+    """Start a daemon server in a thread; yields its socket path."""
+    sock = socket_dir / "d.sock"
+    worker = daemon.Worker(store_dir=socket_dir / "runs", queue_size=2)
+    worker.start()
+    server = daemon.DaemonServer(sock, worker)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield sock
+    finally:
+        server.shutdown()
+        server.server_close()
+        worker.stop()
+
+
+def _result(job_id, success=True):
+    outcome = SimpleNamespace(
+        step_id="s1", status=SimpleNamespace(value="completed"), duration_ms=5, error=None
+    )
+    return SimpleNamespace(
+        run_id=f"run-{job_id}", success=success, rows_read=0, rows_written=3,
+        attempt=SimpleNamespace(step_outcomes=[outcome]),
+    )
+
+
+class TestDaemon:
+    """Tests for the daemon server and submit()."""
+
+    def test_ping(self, running):
+        status = submit({"op": "ping"}, running)
+        assert status["queued"] == 0 and status["queue_size"] == 2
+
+    def test_execute_uses_warm_state(self, running, monkeypatch):
+        envelopes = []
+
+        def fake_execute(envelope):
+            envelopes.append(envelope)
+            return _result(envelope["job_id"])
+
+        monkeypatch.setattr("lorchestra.executor.execute", fake_execute)
+
+        for _ in range(2):
+            result = submit({"op": "execute", "envelope": {"job_id": "j1"}}, running)
+
+        assert result["run_id"] == "run-j1"
+        assert result["success"] is True
+        assert result["steps"] == [
+            {"step_id": "s1", "status": "completed", "duration_ms": 5, "error": None}
+        ]
+        # Same registry and run store across requests
+        assert envelopes[0]["registry"] is envelopes[1]["registry"]
+        assert envelopes[0]["store"] is envelopes[1]["store"]
+
+    def test_run_pipeline(self, running, monkeypatch):
+        calls = []
+
+        def fake_run_pipeline(spec, **kwargs):
+            calls.append((spec, kwargs))
+            return SimpleNamespace(to_dict=lambda: {"success": True, "total": 1})
+
+        monkeypatch.setattr("lorchestra.pipeline.load_pipeline", lambda pid, d: {"pipeline_id": pid})
+        monkeypatch.setattr("lorchestra.pipeline.run_pipeline", fake_run_pipeline)
+
+        result = submit({"op": "run_pipeline", "pipeline_id": "pipeline.x", "smoke_namespace": "t"}, running)
+
+        assert result == {"success": True, "total": 1}
+        assert calls[0][0] == {"pipeline_id": "pipeline.x"}
+        assert calls[0][1]["smoke_namespace"] == "t"
+
+        # Children use the warm registry and run store, like execute requests
+        envelopes = []
+        monkeypatch.setattr("lorchestra.executor.execute", lambda env: envelopes.append(env) or _result("j1"))
+        submit({"op": "execute", "envelope": {"job_id": "j1"}}, running)
+        assert calls[0][1]["registry"] is envelopes[0]["registry"]
+        assert calls[0][1]["store"] is envelopes[0]["store"]
+
+    def test_smoke_request_does_not_leak_into_next_request(self, running, monkeypatch):
+        import os
+
+        from lorchestra.stack_clients.event_client import get_smoke_namespace
+
+        seen = []
+
+        def fake_execute_job(job_def, envelope, **kwargs):
+            seen.append((get_smoke_namespace(), os.environ.get("STORACLE_SMOKE_NAMESPACE")))
+            return _result(job_def)
+
+        # Real execute(), which sets the smoke namespace process-wide
+        monkeypatch.setattr("lorchestra.executor._load_job_def", lambda env: (env["job_id"], {}, {}))
+        monkeypatch.setattr("lorchestra.executor.execute_job", fake_execute_job)
+        monkeypatch.delenv("STORACLE_SMOKE_NAMESPACE", raising=False)
+
+        submit({"op": "execute", "envelope": {"job_id": "j1", "smoke_namespace": "ci"}}, running)
+        submit({"op": "execute", "envelope": {"job_id": "j1"}}, running)
+
+        assert seen == [("ci", "ci"), (None, None)]
+        assert get_smoke_namespace() is None
+        assert "STORACLE_SMOKE_NAMESPACE" not in os.environ
+
+    def test_job_error_is_reported(self, running, monkeypatch):
+        def boom(envelope):
+            raise KeyError("no such job")
+
+        monkeypatch.setattr("lorchestra.executor.execute", boom)
+
+        with pytest.raises(DaemonError, match="KeyError"):
+            submit({"op": "execute", "envelope": {"job_id": "missing"}}, running)
+
+    def test_running_target_is_skipped(self, running, monkeypatch):
+        from lorchestra.locks import target_lock
+
+        ran = []
+        monkeypatch.setattr("lorchestra.executor.execute", lambda env: ran.append(env) or _result("j1"))
+
+        with target_lock("j1"):
+            result = submit({"op": "execute", "envelope": {"job_id": "j1"}}, running)
+
+        assert ran == []
+        assert result == {"success": False, "skipped": True, "error": "j1 is already running"}
+
+    def test_full_queue_is_rejected(self, running, monkeypatch):
+        release = threading.Event()
+
+        def slow_execute(envelope):
+            release.wait(10)
+            return _result(envelope["job_id"])
+
+        monkeypatch.setattr("lorchestra.executor.execute", slow_execute)
+        request = {"op": "execute", "envelope": {"job_id": "slow"}, "wait": False}
+        try:
+            submit(request, running)
+            # Wait for the worker to pick it up so the queue is empty
+            for _ in range(100):
+                if submit({"op": "ping"}, running)["running"]:
+                    break
+                time.sleep(0.05)
+            submit(request, running)
+            submit(request, running)
+            with pytest.raises(DaemonError, match="Queue full"):
+                submit(request, running)
+        finally:
+            release.set()
+
+    def test_unknown_op(self, running):
+        with pytest.raises(DaemonError, match="Unknown op"):
+            submit({"op": "nope"}, running)
+
+    def test_no_daemon(self, socket_dir):
+        with pytest.raises(DaemonError, match="No daemon listening"):
+            submit({"op": "ping"}, socket_dir / "none.sock")
+
+    def test_stale_socket_is_replaced(self, socket_dir):
+        sock = socket_dir / "d.sock"
+        sock.touch()
+        daemon._claim_socket_path(sock)
+        assert not sock.exists()
+
+    def test_refuses_second_daemon(self, running):
+        with pytest.raises(DaemonError, match="already listening"):
+            daemon._claim_socket_path(running)
@@ -23,7 +23,7 @@ from lorchestra.schemas import (
 
 from lorchestra.registry import JobRegistry, JobNotFoundError
 from lorchestra.compiler import Compiler, compile_job, _resolve_value, _evaluate_condition
-from lorchestra.run_store import InMemoryRunStore, FileRunStore, generate_ulid
+from lorchestra.run_store import InMemoryRunStore, FileRunStore, RunStore, generate_ulid
 from lorchestra.executor import (
     Executor,
     NoOpBackend,
@@ -466,6 +466,46 @@ class TestFileRunStore:
         assert retrieved.run_id == run.run_id
         assert retrieved.job_id == run.job_id
 
+    def test_submit_hash_persists(self, tmp_path):
+        """Submit hashes are kept per job/step across store instances."""
+        store1 = FileRunStore(tmp_path)
+        store1.record_submit_hash("job", "write", "run-1", "sha256:abc")
+
+        store2 = FileRunStore(tmp_path)
+        assert store2.get_submit_hash("job", "write") == "sha256:abc"
+        assert store2.get_submit_hash("job", "other") is None
+
+    def test_submit_hash_optional_for_other_stores(self):
+        """RunStore implementations need not record submit hashes."""
+        assert not {"get_submit_hash", "record_submit_hash"} & RunStore.__abstractmethods__
+
+        class NoHashStore(InMemoryRunStore):
+            get_submit_hash = RunStore.get_submit_hash
+            record_submit_hash = RunStore.record_submit_hash
+
+        store = NoHashStore()
+        store.record_submit_hash("job", "write", "run-1", "sha256:abc")
+        assert store.get_submit_hash("job", "write") is None
+
+    def test_schedule_state_persists(self, tmp_path):
+        """Schedule state is kept per target across store instances."""
+        store1 = FileRunStore(tmp_path)
+        store1.record_schedule_state("pipeline.ingest", {"next_run_at": "2026-01-01T06:00:00"})
+
+        store2 = FileRunStore(tmp_path)
+        assert store2.get_schedule_state("pipeline.ingest") == {"next_run_at": "2026-01-01T06:00:00"}
+        assert store2.get_schedule_state("pipeline.other") is None
+
+    def test_schedule_state_optional_for_other_stores(self):
+        """RunStore implementations not used by a Scheduler need not store its state."""
+        assert not {"get_schedule_state", "record_schedule_state"} & RunStore.__abstractmethods__
+
+        class NoScheduleStore(InMemoryRunStore):
+            get_schedule_state = RunStore.get_schedule_state
+
+        with pytest.raises(NotImplementedError, match="NoScheduleStore"):
+            NoScheduleStore().get_schedule_state("pipeline.ingest")
+
 
 class TestULIDGeneration:
     """Tests for ULID generation."""
@@ -867,3 +907,911 @@ class TestEndToEnd:
         reloaded = store2.get_run(result.run_id)
         assert reloaded is not None
         assert reloaded.job_id == "simple_job"
+
+
+# =============================================================================
+# PAGINATED QUERY TESTS
+# =============================================================================
+
+
+class TestPaginatedQuery:
+    """Tests for keyset-paginated storacle.query steps."""
+
+    SOURCE_KEYS = [f"k{i:02d}" for i in range(7)]
+
+    @pytest.fixture
+    def query_calls(self, monkeypatch):
+        """Serve SOURCE_KEYS page by page from a fake bq.query."""
+        calls: list[dict] = []
+
+        def fake_submit_plan(plan, meta):
+            op = plan.ops[0]
+            params = {p["name"]: p["value"] for p in op.params["query_params"]}
+            calls.append(params)
+            after = params.get("_page_after")
+            page_size = int(op.params["sql"].rsplit("LIMIT ", 1)[1])
+            keys = [k for k in self.SOURCE_KEYS if after is None or k > after]
+            rows = [{"idem_key": k} for k in keys[:page_size]]
+            return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return calls
+
+    def _job(self, page_size: int, **paginate_extra) -> JobDef:
+        return JobDef(
+            job_id="paged_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="read",
+                    op=Op.STORACLE_QUERY,
+                    params={
+                        "dataset": "raw",
+                        "table": "raw_objects",
+                        "columns": ["idem_key"],
+                        "paginate": {"key": "idem_key", "page_size": page_size, **paginate_extra},
+                    },
+                ),
+                StepDef(
+                    step_id="transform",
+                    op=Op.CALL,
+                    params={"callable": "echo", "items": "@run.read.items"},
+                ),
+            ),
+        )
+
+    def test_drains_source_through_downstream_steps(self, query_calls):
+        store = InMemoryRunStore()
+        executor = Executor(store=store)
+        seen: list[list[str]] = []
+        executor._handle_call = lambda m: (
+            seen.append([i["idem_key"] for i in m.resolved_params["items"]])
+            or {"items": m.resolved_params["items"], "stats": {}}
+        )
+
+        result = executor.execute(compile_job(self._job(page_size=3)))
+
+        assert result.success
+        assert seen == [["k00", "k01", "k02"], ["k03", "k04", "k05"], ["k06"]]
+        assert [c.get("_page_after") for c in query_calls] == [None, "k02", "k05"]
+        # One aggregated outcome per step, per-page artifacts in the store
+        assert [o.step_id for o in result.attempt.step_outcomes] == ["read", "transform"]
+        assert store.get_output(f"mem://{result.run_id}/transform[2]/output") is not None
+
+    def test_pages_get_distinct_idempotency_keys(self, query_calls):
+        store = InMemoryRunStore()
+        executor = Executor(store=store)
+        keys: list[str] = []
+
+        def handle_call(manifest):
+            keys.append(manifest.idempotency_key)
+            return {"items": manifest.resolved_params["items"], "stats": {}}
+
+        executor._handle_call = handle_call
+
+        result = executor.execute(compile_job(self._job(page_size=3)))
+
+        assert result.success
+        assert keys == [f"{result.run_id}:transform[{page}]" for page in range(3)]
+
+    def test_exact_multiple_stops_on_empty_page(self, query_calls):
+        executor = Executor(store=InMemoryRunStore())
+        calls: list[int] = []
+        executor._handle_call = lambda m: (
+            calls.append(len(m.resolved_params["items"])) or {"items": [], "stats": {}}
+        )
+        self.SOURCE_KEYS = self.SOURCE_KEYS[:6]
+
+        result = executor.execute(compile_job(self._job(page_size=3)))
+
+        assert result.success
+        assert calls == [3, 3]
+        assert len(query_calls) == 3
+
+    def test_downstream_failure_stops_paging(self, query_calls):
+        executor = Executor(store=InMemoryRunStore())
+
+        def failing_call(manifest):
+            raise RuntimeError("boom")
+
+        executor._handle_call = failing_call
+
+        result = executor.execute(compile_job(self._job(page_size=3)))
+
+        assert not result.success
+        assert len(query_calls) == 1
+        failed = result.attempt.get_failed_steps()
+        assert [o.step_id for o in failed] == ["transform"]
+
+    def test_prefetch_overlaps_next_page_with_downstream(self, query_calls):
+        import threading
+
+        executor = Executor(store=InMemoryRunStore())
+        seen: list[list[str]] = []
+        overlapped: list[bool] = []
+
+        def handle_call(manifest):
+            items = manifest.resolved_params["items"]
+            page_count = len(seen)
+            seen.append([i["idem_key"] for i in items])
+            # Give the prefetch a moment to issue the next page's query
+            tick = threading.Event()
+            for _ in range(100):
+                if len(query_calls) > page_count + 1:
+                    break
+                tick.wait(0.01)
+            overlapped.append(len(query_calls) > page_count + 1)
+            return {"items": items, "stats": {}}
+
+        executor._handle_call = handle_call
+
+        result = executor.execute(compile_job(self._job(page_size=3, prefetch=True)))
+
+        assert result.success
+        assert seen == [["k00", "k01", "k02"], ["k03", "k04", "k05"], ["k06"]]
+        assert [c.get("_page_after") for c in query_calls] == [None, "k02", "k05"]
+        # Pages 1 and 2 were fetched while the previous page was downstream
+        assert overlapped == [True, True, False]
+
+
+# =============================================================================
+# WATERMARK QUERY TESTS
+# =============================================================================
+
+
+class TestWatermarkQuery:
+    """Tests for storacle.query steps with incremental.mode: watermark."""
+
+    SOURCE_ROWS = [
+        {"idem_key": "a", "canonicalized_at": "2026-02-09T10:00:00Z"},
+        {"idem_key": "b", "canonicalized_at": "2026-02-09T11:00:00Z"},
+        {"idem_key": "c", "canonicalized_at": "2026-02-10T09:00:00Z"},
+    ]
+
+    @pytest.fixture
+    def query_calls(self, monkeypatch):
+        """Serve SOURCE_ROWS newer than @_watermark from a fake bq.query."""
+        from lorchestra.watermark_store import normalize_watermark
+
+        calls: list[dict] = []
+
+        def fake_submit_plan(plan, meta):
+            op = plan.ops[0]
+            if op.method != "bq.query":
+                return {"rows_affected": len(plan.ops)}
+            params = {p["name"]: p["value"] for p in op.params["query_params"]}
+            calls.append(params)
+            watermark = params.get("_watermark")
+            rows = [
+                dict(r) for r in self.SOURCE_ROWS
+                if watermark is None or normalize_watermark(r["canonicalized_at"]) > watermark
+            ]
+            return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return calls
+
+    def _job(self) -> JobDef:
+        return JobDef(
+            job_id="wm_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="read",
+                    op=Op.STORACLE_QUERY,
+                    params={
+                        "dataset": "canonical",
+                        "table": "canonical_objects",
+                        "columns": ["idem_key"],
+                        "incremental": {"mode": "watermark", "source_ts": "canonicalized_at"},
+                    },
+                ),
+                StepDef(
+                    step_id="persist",
+                    op=Op.PLAN_BUILD,
+                    params={
+                        "items": "@run.read.items",
+                        "method": "bq.upsert",
+                        "dataset": "derived",
+                        "table": "measurement_events",
+                        "key_columns": ["idem_key"],
+                    },
+                ),
+                StepDef(
+                    step_id="write",
+                    op=Op.STORACLE_SUBMIT,
+                    params={"plan": "@run.persist.plan"},
+                ),
+            ),
+        )
+
+    def test_advances_after_submit_and_skips_processed_rows(self, query_calls):
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        first = executor.execute(compile_job(self._job()))
+        assert first.success
+        assert first.rows_read == 3
+        assert watermarks.get("wm_job:read") == "2026-02-10T09:00:00+00:00"
+
+        second = executor.execute(compile_job(self._job()))
+        assert second.success
+        assert second.rows_read == 0
+        assert [c.get("_watermark") for c in query_calls] == [
+            None, "2026-02-10T09:00:00+00:00",
+        ]
+
+    def test_failed_submit_does_not_advance(self, query_calls, monkeypatch):
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        def failing_submit(manifest):
+            raise RuntimeError("bq unavailable")
+
+        executor._handle_storacle_submit = failing_submit
+
+        result = executor.execute(compile_job(self._job()))
+
+        assert not result.success
+        assert watermarks.get("wm_job:read") is None
+
+    def test_noop_submit_does_not_advance(self, query_calls, monkeypatch):
+        from lorchestra.storacle import client
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+        serve_query = client.submit_plan
+
+        def noop_writes(plan, meta):
+            if plan.ops[0].method == "bq.query":
+                return serve_query(plan, meta)
+            return {"status": "noop", "ops": len(plan.ops)}
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", noop_writes)
+
+        result = executor.execute(compile_job(self._job()))
+
+        assert result.success
+        assert watermarks.get("wm_job:read") is None
+
+    def test_dry_run_does_not_advance(self, query_calls):
+        from lorchestra.stack_clients.event_client import reset_run_mode, set_run_mode
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        set_run_mode(dry_run=True)
+        try:
+            result = executor.execute(compile_job(self._job()))
+        finally:
+            reset_run_mode()
+
+        assert result.success
+        assert watermarks.get("wm_job:read") is None
+
+
+# =============================================================================
+# AUTO_SINCE WATERMARK TESTS
+# =============================================================================
+
+
+class TestAutoSinceWatermark:
+    """Tests for auto_since resolution from the local watermark store."""
+
+    AUTO_SINCE = {
+        "source_system": "stripe",
+        "connection_name": "stripe-prod",
+        "object_type": "refund",
+    }
+
+    @pytest.fixture
+    def bq_queries(self, monkeypatch):
+        """Answer MAX(last_seen) queries from a fake bq.query."""
+        queries: list[str] = []
+
+        def fake_submit_plan(plan, meta):
+            op = plan.ops[0]
+            if op.method == "bq.query":
+                queries.append(op.params["sql"])
+                rows = [{"last_sync": "2026-02-01T00:00:00Z"}]
+                return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+            return [
+                {"jsonrpc": "2.0", "id": o.op_id, "result": {"rows_written": len(o.params["rows"])}}
+                for o in plan.ops
+            ]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return queries
+
+    def _ingest_job(self) -> JobDef:
+        return JobDef(
+            job_id="ingest_stripe_refunds",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="ingest",
+                    op=Op.CALL,
+                    params={"callable": "injest", "auto_since": self.AUTO_SINCE},
+                ),
+                StepDef(
+                    step_id="persist",
+                    op=Op.PLAN_BUILD,
+                    params={
+                        "items": "@run.ingest.items",
+                        "method": "bq.upsert",
+                        "dataset": "raw",
+                        "table": "raw_objects",
+                        "key_columns": ["idem_key"],
+                        "payload_wrap": True,
+                        "id_field": "id",
+                        "field_defaults": self.AUTO_SINCE,
+                        "auto_timestamp_columns": ["first_seen", "last_seen"],
+                    },
+                ),
+                StepDef(
+                    step_id="write",
+                    op=Op.STORACLE_SUBMIT,
+                    params={"plan": "@run.persist.plan"},
+                ),
+            ),
+        )
+
+    def test_first_resolution_verifies_against_bq(self, bq_queries):
+        from lorchestra.watermark_store import InMemoryWatermarkStore, ingest_watermark_key
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        assert executor._resolve_auto_since(self.AUTO_SINCE) == "2026-02-01T00:00:00+00:00"
+        assert executor._resolve_auto_since(self.AUTO_SINCE) == "2026-02-01T00:00:00+00:00"
+        assert len(bq_queries) == 1
+        key = ingest_watermark_key("stripe", "stripe-prod", "refund")
+        assert watermarks.get_verified_at(key) is not None
+
+    def test_stale_verification_reconciles(self, bq_queries):
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        executor = Executor(store=InMemoryRunStore(), watermarks=InMemoryWatermarkStore())
+        executor._resolve_auto_since(self.AUTO_SINCE)
+        executor._resolve_auto_since({**self.AUTO_SINCE, "reconcile_hours": 0})
+        assert len(bq_queries) == 2
+
+    def test_successful_write_advances_watermark(self, bq_queries):
+        from lorchestra.watermark_store import InMemoryWatermarkStore, ingest_watermark_key
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+        sinces: list = []
+
+        def fake_call(manifest):
+            since = executor._resolve_auto_since(manifest.resolved_params["auto_since"])
+            sinces.append(since)
+            return {"items": [{"id": "re_1"}], "stats": {}}
+
+        executor._handle_call = fake_call
+
+        assert executor.execute(compile_job(self._ingest_job())).success
+        assert executor.execute(compile_job(self._ingest_job())).success
+
+        # Second run starts from the rows the first run wrote, without a BQ query
+        assert len(bq_queries) == 1
+        key = ingest_watermark_key("stripe", "stripe-prod", "refund")
+        assert sinces[0] == "2026-02-01T00:00:00+00:00"
+        assert sinces[0] < sinces[1] < watermarks.get(key)
+
+    def _run_ingest(self, executor, watermarks):
+        from lorchestra.watermark_store import ingest_watermark_key
+
+        executor._handle_call = lambda manifest: {"items": [{"id": "re_1"}], "stats": {}}
+        assert executor.execute(compile_job(self._ingest_job())).success
+        return watermarks.get(ingest_watermark_key("stripe", "stripe-prod", "refund"))
+
+    def test_smoke_run_does_not_advance_watermark(self, bq_queries, monkeypatch):
+        from lorchestra.stack_clients.event_client import reset_run_mode, set_run_mode
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        set_run_mode(smoke_namespace="ci")
+        try:
+            assert self._run_ingest(executor, watermarks) is None
+        finally:
+            reset_run_mode()
+
+        monkeypatch.setenv("STORACLE_SMOKE_NAMESPACE", "ci")
+        assert self._run_ingest(executor, watermarks) is None
+
+    def test_noop_submit_does_not_advance_watermark(self, monkeypatch):
+        from lorchestra.watermark_store import InMemoryWatermarkStore
+
+        monkeypatch.setattr(
+            "lorchestra.storacle.client.submit_plan",
+            lambda plan, meta: {"status": "noop", "ops": len(plan.ops)},
+        )
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        watermarks = InMemoryWatermarkStore()
+        executor = Executor(store=InMemoryRunStore(), watermarks=watermarks)
+
+        assert self._run_ingest(executor, watermarks) is None
+
+
+# =============================================================================
+# QUERY CACHE TESTS
+# =============================================================================
+
+
+class TestQueryCacheExecution:
+    """Tests for storacle.query served from a pipeline-scoped QueryCache."""
+
+    @pytest.fixture
+    def bq_calls(self, monkeypatch):
+        calls: list[str] = []
+
+        def fake_submit_plan(plan, meta):
+            op = plan.ops[0]
+            if op.method != "bq.query":
+                return [{"jsonrpc": "2.0", "id": o.op_id, "result": {}} for o in plan.ops]
+            calls.append(op.params["sql"])
+            rows = [{"client_id": "c1", "profile": '{"name": "A"}'}]
+            return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return calls
+
+    def _read_job(self, job_id: str, **extra) -> JobDef:
+        return JobDef(
+            job_id=job_id,
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="read",
+                    op=Op.STORACLE_QUERY,
+                    params={"dataset": "canonical", "table": "proj_clients", **extra},
+                ),
+            ),
+        )
+
+    def test_second_job_served_from_cache(self, bq_calls):
+        from lorchestra.query_cache import QueryCache
+
+        cache = QueryCache()
+        first = execute_job(self._read_job("sync_proj_clients"), query_cache=cache)
+        second = execute_job(
+            self._read_job("proj_sheets_clients", parse_json_columns=["profile"]),
+            query_cache=cache,
+        )
+
+        assert len(bq_calls) == 1
+        assert first.step_outputs["read"]["items"] == [{"client_id": "c1", "profile": '{"name": "A"}'}]
+        # Per-job JSON parsing does not leak into the cached rows
+        assert second.step_outputs["read"]["items"] == [{"client_id": "c1", "profile": {"name": "A"}}]
+
+    def test_write_to_read_dataset_invalidates(self, bq_calls):
+        from lorchestra.query_cache import QueryCache
+
+        cache = QueryCache()
+        execute_job(self._read_job("sync_proj_clients"), query_cache=cache)
+        writer = JobDef(
+            job_id="canonize",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="persist",
+                    op=Op.PLAN_BUILD,
+                    params={
+                        "items": [{"idem_key": "k1"}],
+                        "method": "bq.upsert",
+                        "dataset": "canonical",
+                        "table": "canonical_objects",
+                        "key_columns": ["idem_key"],
+                    },
+                ),
+                StepDef(step_id="write", op=Op.STORACLE_SUBMIT, params={"plan": "@run.persist.plan"}),
+            ),
+        )
+        assert execute_job(writer, query_cache=cache).success
+        execute_job(self._read_job("proj_sheets_clients"), query_cache=cache)
+
+        assert len(bq_calls) == 2
+
+    def test_lazy_json_does_not_parse_cached_rows(self, bq_calls):
+        from lorchestra.query_cache import QueryCache
+        from lorchestra.row_decoder import LazyJson
+
+        cache = QueryCache()
+        lazy = execute_job(
+            self._read_job("a", parse_json_columns=["profile"], lazy_json=True), query_cache=cache
+        )
+        eager = execute_job(self._read_job("b", parse_json_columns=["profile"]), query_cache=cache)
+
+        profile = lazy.step_outputs["read"]["items"][0]["profile"]
+        assert isinstance(profile, LazyJson) and not profile.parsed
+        assert profile["name"] == "A"
+        assert eager.step_outputs["read"]["items"][0]["profile"] == {"name": "A"}
+        assert len(bq_calls) == 1
+
+    def test_cache_false_bypasses(self, bq_calls):
+        from lorchestra.query_cache import QueryCache
+
+        cache = QueryCache()
+        execute_job(self._read_job("a", cache=False), query_cache=cache)
+        execute_job(self._read_job("b", cache=False), query_cache=cache)
+
+        assert len(bq_calls) == 2
+        assert len(cache) == 0
+
+
+class TestShardedQuery:
+    """Tests for range-sharded storacle.query steps."""
+
+    SOURCE_ROWS = [
+        {"idem_key": f"k{day}", "last_seen": f"2026-01-{day:02d}T12:00:00+00:00"}
+        for day in range(1, 9)
+    ]
+
+    @pytest.fixture
+    def query_calls(self, monkeypatch):
+        """Serve SOURCE_ROWS from a fake bq.query honouring shard bounds."""
+        calls: list[dict] = []
+
+        def fake_submit_plan(plan, meta):
+            op = plan.ops[0]
+            params = {p["name"]: p["value"] for p in op.params["query_params"]}
+            calls.append(params)
+            if "MIN(" in op.params["sql"]:
+                rows = [{"lo": self.SOURCE_ROWS[0]["last_seen"], "hi": self.SOURCE_ROWS[-1]["last_seen"]}]
+            else:
+                start, end = params.get("_shard_start"), params.get("_shard_end")
+                rows = [
+                    dict(r) for r in self.SOURCE_ROWS
+                    if (start is None or datetime.fromisoformat(r["last_seen"]) >= datetime.fromisoformat(start))
+                    and (end is None or datetime.fromisoformat(r["last_seen"]) < datetime.fromisoformat(end))
+                ]
+            return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return calls
+
+    def _job(self, shard: dict) -> JobDef:
+        return JobDef(
+            job_id="sharded_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="read",
+                    op=Op.STORACLE_QUERY,
+                    params={
+                        "dataset": "raw",
+                        "table": "raw_objects",
+                        "columns": ["idem_key", "last_seen"],
+                        "filters": {"source_system": "dataverse"},
+                        "shard": shard,
+                    },
+                ),
+            ),
+        )
+
+    def test_shards_merge_in_order(self, query_calls):
+        result = execute_job(self._job({"column": "last_seen", "count": 4}))
+
+        assert result.success
+        assert result.step_outputs["read"]["items"] == self.SOURCE_ROWS
+        # One bounds query, then four disjoint shards
+        assert len(query_calls) == 5
+        shards = query_calls[1:]
+        assert sum("_shard_start" not in c for c in shards) == 1
+        assert sum("_shard_end" not in c for c in shards) == 1
+
+    def test_invalid_shard_spec_fails_step(self, query_calls):
+        result = execute_job(self._job({"column": "last_seen", "bucket": "fortnight"}))
+
+        assert not result.success
+
+
+# =============================================================================
+# PLAN HAND-OFF TESTS
+# =============================================================================
+
+
+class TestPlanHandOff:
+    """Tests for the live plan passed from plan.build to storacle.submit."""
+
+    def _job(self, items=None, **extra) -> JobDef:
+        return JobDef(
+            job_id="persist_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="persist",
+                    op=Op.PLAN_BUILD,
+                    params={
+                        "items": items or [{"idem_key": "k1"}, {"idem_key": "k2"}],
+                        "method": "bq.upsert",
+                        "dataset": "canonical",
+                        "table": "canonical_objects",
+                        "key_columns": ["idem_key"],
+                        **extra,
+                    },
+                ),
+                StepDef(step_id="write", op=Op.STORACLE_SUBMIT, params={"plan": "@run.persist.plan"}),
+            ),
+        )
+
+    @pytest.fixture
+    def submitted(self, monkeypatch):
+        plans: list = []
+
+        def fake_submit_plan(plan, meta):
+            plans.append(plan)
+            return [{"jsonrpc": "2.0", "id": o.op_id, "result": {}} for o in plan.ops]
+
+        monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        return plans
+
+    def test_submit_receives_the_built_plan(self, submitted):
+        result = execute_job(self._job())
+
+        assert result.success
+        handle = result.step_outputs["persist"]["plan"]
+        assert submitted == [handle.plan]
+        assert [r["idem_key"] for r in handle["ops"][0]["params"]["rows"]] == ["k1", "k2"]
+
+    def test_file_run_store_serializes_plan(self, submitted, tmp_path):
+        store = FileRunStore(tmp_path)
+        result = Executor(store=store).execute(compile_job(self._job()))
+
+        stored = store.get_output(f"file://{tmp_path}/outputs/{result.run_id}/persist.json")
+        assert stored["plan"] == result.step_outputs["persist"]["plan"].plan.to_dict()
+
+    def test_dedupe_reports_duplicates(self, submitted):
+        items = [{"idem_key": "k1", "v": 1}, {"idem_key": "k2"}, {"idem_key": "k1", "v": 2}]
+        result = execute_job(self._job(items, dedupe="last"))
+
+        assert result.success
+        output = result.step_outputs["persist"]
+        assert output["stats"] == {"rows_in": 3, "rows": 2, "duplicates": 1}
+        assert submitted[0].ops[0].params["rows"][0]["v"] == 2
+
+
+    def _submit_job(self, items) -> JobDef:
+        job = self._job(items, auto_timestamp_columns=["projected_at"])
+        write = StepDef(
+            step_id="write",
+            op=Op.STORACLE_SUBMIT,
+            params={"plan": "@run.persist.plan", "skip_if_unchanged": True},
+        )
+        return JobDef(job_id=job.job_id, version=job.version, steps=(job.steps[0], write))
+
+    def test_skip_if_unchanged(self, submitted):
+        store = InMemoryRunStore()
+        items = [{"idem_key": "k1", "v": 1}]
+
+        first = Executor(store=store).execute(compile_job(self._submit_job(items)))
+        second = Executor(store=store).execute(compile_job(self._submit_job(items)))
+
+        assert first.success and second.success
+        assert len(submitted) == 1
+        skipped = second.step_outputs["write"]
+        assert skipped["skipped"] is True
+        assert skipped["content_hash"] == store.get_submit_hash("persist_job", "write")
+
+        Executor(store=store).execute(compile_job(self._submit_job([{"idem_key": "k1", "v": 2}])))
+        assert len(submitted) == 2
+
+    def test_failed_submit_is_not_recorded(self, monkeypatch):
+        monkeypatch.setattr(
+            "lorchestra.storacle.client.submit_plan",
+            lambda plan, meta: [{"jsonrpc": "2.0", "id": o.op_id, "error": {"code": -1}} for o in plan.ops],
+        )
+        monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+        store = InMemoryRunStore()
+
+        Executor(store=store).execute(compile_job(self._submit_job([{"idem_key": "k1"}])))
+
+        assert store.get_submit_hash("persist_job", "write") is None
+
+
+class TestParallelCall:
+    """Tests for `parallel:` on call steps."""
+
+    def test_parallel_call_chunks_items(self, monkeypatch):
+        import lorchestra.callable.dispatch as dispatch
+
+        calls = []
+
+        def fake_canonizer(params):
+            calls.append(params)
+            return {"items": [{"n": i["n"] + 1} for i in params["items"]], "stats": {"count": len(params["items"])}}
+
+        monkeypatch.setattr(dispatch, "_CALLABLES", None)
+        dispatch.register_callable("canonizer", fake_canonizer)
+        job = JobDef(
+            job_id="canonize_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="canonize",
+                    op=Op.CALL,
+                    params={
+                        "callable": "canonizer",
+                        "items": [{"n": i} for i in range(10)],
+                        "parallel": {"workers": 1, "chunk_size": 4},
+                    },
+                ),
+            ),
+        )
+
+        result = execute_job(job)
+
+        assert result.success
+        output = result.step_outputs["canonize"]
+        assert [i["n"] for i in output["items"]] == list(range(1, 11))
+        assert output["stats"] == {"count": 10}
+        assert [len(c["items"]) for c in calls] == [4, 4, 2]
+        assert all("parallel" not in c for c in calls)
+
+    def test_pooled_results_spill_to_run_store(self, monkeypatch, tmp_path):
+        import lorchestra.callable.dispatch as dispatch
+        from lorchestra.spill import SpilledItems
+
+        monkeypatch.setattr(dispatch, "_CALLABLES", None)
+        dispatch.register_callable("canonizer", lambda p: {"items": [{"n": i["n"] + 1} for i in p["items"]]})
+        job = JobDef(
+            job_id="canonize_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="canonize",
+                    op=Op.CALL,
+                    params={
+                        "callable": "canonizer",
+                        "items": [{"n": i} for i in range(10)],
+                        "parallel": {"workers": 2, "chunk_size": 4},
+                    },
+                ),
+            ),
+        )
+        store = FileRunStore(tmp_path)
+
+        result = Executor(store=store).execute(compile_job(job))
+
+        assert result.success
+        output = result.step_outputs["canonize"]
+        assert isinstance(output["items"], SpilledItems)
+        assert output["items_ref"] == f"file://{store.spill_path(result.run_id, 'canonize')}"
+        assert [i["n"] for i in output["items"]] == list(range(1, 11))
+
+
+class TestSpilledOutputs:
+    """Tests for items_ref / auto-spilled step outputs."""
+
+    def _job(self) -> JobDef:
+        return JobDef(
+            job_id="spill_job",
+            version="2.0",
+            steps=(
+                StepDef(step_id="read", op=Op.CALL, params={"callable": "source"}),
+                StepDef(step_id="use", op=Op.CALL, params={"callable": "sink", "items": "@run.read.items"}),
+            ),
+        )
+
+    @pytest.fixture
+    def callables(self, monkeypatch):
+        import lorchestra.callable.dispatch as dispatch
+
+        seen = {}
+
+        def sink(params):
+            seen["items"] = params["items"]
+            return {"items": [{"count": len(params["items"]), "first": params["items"][0]}]}
+
+        monkeypatch.setattr(dispatch, "_CALLABLES", None)
+        dispatch.register_callable("sink", sink)
+        return dispatch, seen
+
+    def test_large_output_is_spilled(self, callables, tmp_path):
+        from lorchestra.spill import SpilledItems
+
+        dispatch, seen = callables
+        dispatch.register_callable("source", lambda p: {"items": [{"n": i} for i in range(10)]})
+        store = FileRunStore(tmp_path)
+
+        result = Executor(store=store, spill_threshold=5).execute(compile_job(self._job()))
+
+        assert result.success
+        read = result.step_outputs["read"]
+        assert isinstance(read["items"], SpilledItems)
+        assert read["items_ref"] == f"file://{store.spill_path(result.run_id, 'read')}"
+        assert isinstance(seen["items"], SpilledItems)
+        assert result.step_outputs["use"]["items"] == [{"count": 10, "first": {"n": 0}}]
+        assert result.rows_read == 11
+        stored = store.get_output(f"file://{tmp_path}/outputs/{result.run_id}/read.json")
+        assert stored["items"] == read["items_ref"]
+
+    def test_stale_spill_pruned_by_next_run(self, callables, tmp_path):
+        import os
+        import time
+
+        dispatch, _ = callables
+        dispatch.register_callable("source", lambda p: {"items": [{"n": i} for i in range(10)]})
+        store = FileRunStore(tmp_path)
+        executor = Executor(store=store, spill_threshold=5)
+
+        first = executor.execute(compile_job(self._job()))
+        stale = store.spill_path(first.run_id, "read")
+        old = time.time() - 2 * 24 * 3600
+        os.utime(stale, (old, old))
+        second = executor.execute(compile_job(self._job()))
+
+        assert not stale.parent.exists()
+        assert store.spill_path(second.run_id, "read").exists()
+
+    def test_prune_spill_keeps_recent_runs(self, callables, tmp_path):
+        dispatch, _ = callables
+        dispatch.register_callable("source", lambda p: {"items": [{"n": i} for i in range(10)]})
+        store = FileRunStore(tmp_path)
+
+        result = Executor(store=store, spill_threshold=5).execute(compile_job(self._job()))
+
+        assert store.prune_spill() == []
+        assert store.spill_path(result.run_id, "read").exists()
+        assert store.prune_spill(max_age_seconds=-1) == [result.run_id]
+        assert not (tmp_path / "spill" / result.run_id).exists()
+
+    def test_log_dump_streams_spilled_items(self, callables, tmp_path):
+        from lorchestra.spill import spill_items
+
+        rows = [{"n": i, "name": "é"} for i in range(3)]
+        spilled = spill_items(rows, tmp_path / "items.ndjson")
+        job = JobDef(
+            job_id="dump_job",
+            version="2.0",
+            steps=(
+                StepDef(
+                    step_id="dump",
+                    op=Op.LOG_DUMP,
+                    params={"items": "@payload.items", "file": str(tmp_path / "dump.json")},
+                ),
+            ),
+        )
+
+        result = execute_job(job, payload={"items": spilled})
+
+        assert result.success
+        assert result.step_outputs["dump"] == {"items_count": 3}
+        assert (tmp_path / "dump.json").read_text() == json.dumps(rows, indent=2, default=str)
+
+    def test_small_output_stays_inline(self, callables):
+        dispatch, seen = callables
+        dispatch.register_callable("source", lambda p: {"items": [{"n": i} for i in range(3)]})
+
+        result = Executor(store=InMemoryRunStore(), spill_threshold=5).execute(compile_job(self._job()))
+
+        assert result.step_outputs["read"]["items"] == [{"n": 0}, {"n": 1}, {"n": 2}]
+        assert "items_ref" not in result.step_outputs["read"]
+
+    def test_callable_items_ref(self, callables, tmp_path):
+        from lorchestra.spill import spill_items
+
+        dispatch, seen = callables
+        spilled = spill_items([{"n": 7}, {"n": 8}], tmp_path / "own.ndjson")
+        dispatch.register_callable("source", lambda p: {"items_ref": spilled.ref})
+
+        result = execute_job(self._job())
+
+        assert result.success
+        assert result.step_outputs["read"]["items_ref"] == spilled.ref
+        assert result.step_outputs["use"]["items"] == [{"count": 2, "first": {"n": 7}}]
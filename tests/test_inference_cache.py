@@ -0,0 +1,129 @@
+"""Tests for the persistent inference cache."""
+
+import pytest
+
+from lorchestra.handlers.compute import ComputeHandler, NoOpComputeClient
+from lorchestra.inference_cache import InferenceCache, cache_options
+from lorchestra.schemas import Op, StepManifest
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingClient(NoOpComputeClient):
+    def __init__(self):
+        self.calls = 0
+
+    def llm_invoke(self, prompt, **kwargs):
+        self.calls += 1
+        return super().llm_invoke(prompt, **kwargs)
+
+
+def _manifest(**params) -> StepManifest:
+    return StepManifest.from_op(
+        run_id="01TEST00000000000000000000",
+        step_id="test_llm",
+        op=Op.COMPUTE_LLM,
+        resolved_params={"prompt": "Hello world", "model": "test-model", **params},
+        idempotency_key="test:test_llm",
+    )
+
+
+class TestInferenceCache:
+    """Tests for InferenceCache."""
+
+    def test_put_get_persists(self, tmp_path):
+        key = InferenceCache.make_key("m", "sha256:p", "sha256:c")
+        InferenceCache(tmp_path / "c.sqlite").put(key, {"output": "x"}, model="m")
+
+        cache = InferenceCache(tmp_path / "c.sqlite")
+        assert cache.get(key) == {"output": "x"}
+        assert cache.get(InferenceCache.make_key("m", "sha256:p", "sha256:other")) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_ttl(self, tmp_path):
+        clock = _Clock()
+        cache = InferenceCache(tmp_path / "c.sqlite", ttl_seconds=60, clock=clock)
+        cache.put("k", {"v": 1})
+
+        clock.now += 30
+        assert cache.get("k") == {"v": 1}
+        assert cache.get("k", ttl_seconds=10) is None
+        clock.now += 31
+        assert cache.get("k") is None
+
+        cache.put("k2", {"v": 2})  # Purges the expired entry
+        assert len(cache) == 1
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        clock = _Clock()
+        cache = InferenceCache(tmp_path / "c.sqlite", max_entries=2, clock=clock)
+        cache.put("a", {"v": "a"})
+        clock.now += 1
+        cache.put("b", {"v": "b"})
+        clock.now += 1
+        cache.get("a")
+        clock.now += 1
+        cache.put("c", {"v": "c"})
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": "a"}
+
+    @pytest.mark.parametrize("spec,expected", [
+        (None, (True, None)),
+        (True, (True, None)),
+        (False, (False, None)),
+        ({"ttl_seconds": 3600}, (True, 3600.0)),
+    ])
+    def test_cache_options(self, spec, expected):
+        assert cache_options(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["no", {"ttl_seconds": 0}, {"ttl": 5}])
+    def test_invalid_cache_options(self, spec):
+        with pytest.raises(ValueError):
+            cache_options(spec)
+
+
+class TestComputeHandlerCache:
+    """Tests for ComputeHandler response caching."""
+
+    def test_repeat_call_is_served_from_cache(self, tmp_path):
+        client = _CountingClient()
+        handler = ComputeHandler(client, cache=InferenceCache(tmp_path / "c.sqlite"))
+
+        first = handler.execute(_manifest())
+        second = handler.execute(_manifest())
+
+        assert client.calls == 1
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert second["output_hash"] == first["output_hash"]
+
+        handler.execute(_manifest(temperature=0.9))
+        assert client.calls == 2
+
+    def test_bypass(self, tmp_path):
+        client = _CountingClient()
+        handler = ComputeHandler(client, cache=InferenceCache(tmp_path / "c.sqlite"))
+
+        handler.execute(_manifest(cache=False))
+        result = handler.execute(_manifest(cache=False))
+
+        assert client.calls == 2
+        assert result["cache_hit"] is False
+
+    def test_invalid_cache_option_is_permanent(self, tmp_path):
+        from lorchestra.errors import PermanentError
+
+        client = _CountingClient()
+        handler = ComputeHandler(client, cache=InferenceCache(tmp_path / "c.sqlite"))
+
+        with pytest.raises(PermanentError):
+            handler.execute(_manifest(cache="no"))
+        assert client.calls == 0
@@ -174,3 +174,181 @@ def test_inferometer_inferometer_transient_error_mapped(monkeypatch: pytest.Monk
 
     with pytest.raises(TransientError, match="transient"):
         dispatch_callable("inferometer", params)
+
+
+def test_inferometer_result_is_cached(monkeypatch: pytest.MonkeyPatch):
+    """A second identical plan is served from the inference cache."""
+    captured = _install_fake_inferometer(monkeypatch)
+    register_callable("inferometer", inferometer_execute)
+    params = {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze: {transcript}",
+        "transcript": "x",
+    }
+
+    first = dispatch_callable("inferometer", params)
+    captured.clear()
+    second = dispatch_callable("inferometer", params)
+
+    assert "plan" not in captured
+    assert first.stats["cache_hit"] is False
+    assert second.stats == {"steps_count": 1, "cache_hit": True}
+    assert second.items == first.items
+
+    # Different inputs or config miss
+    dispatch_callable("inferometer", {**params, "transcript": "y"})
+    assert captured["plan"].steps[0].inputs == {"transcript": "y"}
+    captured.clear()
+    dispatch_callable("inferometer", {**params, "temperature": 0.9})
+    assert "plan" in captured
+
+
+def test_inferometer_cache_bypass(monkeypatch: pytest.MonkeyPatch):
+    """cache: false always calls the model."""
+    captured = _install_fake_inferometer(monkeypatch)
+    register_callable("inferometer", inferometer_execute)
+    params = {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze: {transcript}",
+        "transcript": "x",
+        "cache": False,
+    }
+
+    dispatch_callable("inferometer", params)
+    captured.clear()
+    result = dispatch_callable("inferometer", params)
+
+    assert "plan" in captured
+    assert "cache" not in captured["plan"].config
+    assert result.stats["cache_hit"] is False
+
+
+def test_inferometer_failures_are_not_cached(monkeypatch: pytest.MonkeyPatch):
+    """A failed inference is retried against the model, not the cache."""
+    _install_fake_inferometer(monkeypatch, execute_error=RuntimeError("rate limit exceeded"))
+    register_callable("inferometer", inferometer_execute)
+    params = {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze: {transcript}",
+        "transcript": "x",
+    }
+
+    with pytest.raises(TransientError):
+        dispatch_callable("inferometer", params)
+    _install_fake_inferometer(monkeypatch)
+
+    assert dispatch_callable("inferometer", params).stats["cache_hit"] is False
+
+
+def _batch_execute(fake_mod, calls: list):
+    """Fake execute echoing the transcript; "bad"/"busy" transcripts fail."""
+    result_cls = type(fake_mod.execute(None))
+
+    def execute(plan):
+        transcript = plan.steps[0].inputs["transcript"]
+        calls.append(transcript)
+        if transcript == "bad":
+            raise fake_mod.PermanentError("invalid prompt")
+        if transcript == "busy":
+            raise fake_mod.TransientError("overloaded")
+        result = result_cls()
+        result.output = f"analysis of {transcript}"
+        return result
+
+    return execute
+
+
+def test_inferometer_batch_items(monkeypatch: pytest.MonkeyPatch):
+    """items: runs one plan per item and returns results in input order."""
+    _install_fake_inferometer(monkeypatch)
+    fake_mod = sys.modules["inferometer"]
+    calls: list = []
+    fake_mod.execute = _batch_execute(fake_mod, calls)
+    register_callable("inferometer", inferometer_execute)
+
+    params = {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze {session_id}: {transcript}",
+        "items": [{"session_id": f"s{i}", "transcript": f"t{i}"} for i in range(6)],
+        "key_field": "session_id",
+        "max_concurrency": 3,
+    }
+    result = dispatch_callable("inferometer", params)
+
+    assert [item["output"] for item in result.items] == [f"analysis of t{i}" for i in range(6)]
+    assert [item["index"] for item in result.items] == list(range(6))
+    assert [item["key"] for item in result.items] == [f"s{i}" for i in range(6)]
+    assert result.stats["succeeded"] == 6
+    assert result.stats["cache_hits"] == 0
+    assert sorted(calls) == [f"t{i}" for i in range(6)]
+
+    # A re-run is served from the cache
+    calls.clear()
+    rerun = dispatch_callable("inferometer", params)
+    assert calls == []
+    assert rerun.stats["cache_hits"] == 6
+    assert rerun.items == result.items
+
+
+def test_inferometer_batch_isolates_item_errors(monkeypatch: pytest.MonkeyPatch):
+    """A failing item gets an error entry; the other items still succeed."""
+    _install_fake_inferometer(monkeypatch)
+    fake_mod = sys.modules["inferometer"]
+    calls: list = []
+    fake_mod.execute = _batch_execute(fake_mod, calls)
+    register_callable("inferometer", inferometer_execute)
+
+    result = dispatch_callable("inferometer", {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze: {transcript}",
+        "items": [{"transcript": "ok"}, {"transcript": "bad"}, "not-a-dict", {"transcript": "busy"}],
+    })
+
+    ok, bad, not_dict, busy = result.items
+    assert ok["output"] == "analysis of ok"
+    assert bad == {"index": 1, "error": "Inference failed: invalid prompt", "error_type": "permanent"}
+    assert not_dict["error"] == "items entries must be dicts"
+    assert busy["error_type"] == "transient"
+    # Transient failures are retried by the dispatcher before giving up
+    assert calls.count("busy") > 1
+    assert result.stats["succeeded"] == 1
+    assert result.stats["failed"] == 3
+    assert len(result.stats["errors"]) == 3
+
+
+def test_inferometer_batch_all_failed_raises(monkeypatch: pytest.MonkeyPatch):
+    """The step fails when no item succeeds (transient if any item was)."""
+    _install_fake_inferometer(monkeypatch)
+    fake_mod = sys.modules["inferometer"]
+    fake_mod.execute = _batch_execute(fake_mod, [])
+    register_callable("inferometer", inferometer_execute)
+
+    params = {
+        "model": "claude-3-5-sonnet",
+        "prompt_template": "Analyze: {transcript}",
+        "items": [{"transcript": "bad"}, {"transcript": "busy"}],
+    }
+    with pytest.raises(TransientError):
+        dispatch_callable("inferometer", params)
+
+    with pytest.raises(PermanentError, match="invalid prompt"):
+        dispatch_callable("inferometer", {**params, "items": [{"transcript": "bad"}]})
+
+
+def test_inferometer_batch_steps_mode(monkeypatch: pytest.MonkeyPatch):
+    """In steps mode, item fields are merged into every step's inputs."""
+    _install_fake_inferometer(monkeypatch)
+    fake_mod = sys.modules["inferometer"]
+    calls: list = []
+    fake_mod.execute = _batch_execute(fake_mod, calls)
+    register_callable("inferometer", inferometer_execute)
+
+    result = dispatch_callable("inferometer", {
+        "model": "claude-3-5-sonnet",
+        "steps": [{"step_id": "a", "prompt_template": "{transcript} {lang}", "inputs": {"lang": "en"}}],
+        "items": [{"transcript": "x"}, {"transcript": "y"}],
+        "cache": False,
+    })
+
+    assert [item["output"] for item in result.items] == ["analysis of x", "analysis of y"]
+    assert result.stats["items_count"] == 2
@@ -2,7 +2,7 @@
 
 Tests cover:
 - CallableResult to StoraclePlan conversion
-- items_ref raises NotImplementedError
+- items_ref read from spill files
 - Idempotency key computation
 - Batch wrapping mode (e005b-07): payload_wrap, id_field, dataset resolution
 """
@@ -15,13 +15,14 @@ from lorchestra.callable import CallableResult
 from lorchestra.plan_builder import (
     build_plan,
     build_plan_from_items,
+    PlanHandle,
     StoraclePlan,
     _compute_idempotency_key,
-    _compute_idem_key,
     _extract_external_id,
     _hash_canonical,
     _resolve_dataset,
 )
+from lorchestra.row_decoder import json_default
 
 
 class TestBuildPlan:
@@ -89,11 +90,22 @@ class TestBuildPlan:
 
         assert plan.ops[0].method == "custom.method"
 
-    def test_build_plan_items_ref_raises(self):
-        """build_plan should raise NotImplementedError for items_ref."""
+    def test_build_plan_reads_items_ref(self, tmp_path):
+        """build_plan reads items from the spill file an items_ref points at."""
+        from lorchestra.spill import spill_items
+
+        spilled = spill_items([{"id": 1}, {"id": 2}], tmp_path / "items.ndjson")
+        result = CallableResult(items_ref=spilled.ref)
+
+        plan = build_plan(result, correlation_id="corr")
+
+        assert [op.params for op in plan.ops] == [{"id": 1}, {"id": 2}]
+
+    def test_build_plan_unsupported_items_ref_raises(self):
+        """build_plan rejects items_ref that is not a spill file."""
         result = CallableResult(items_ref="artifact://bucket/key")
 
-        with pytest.raises(NotImplementedError, match="items_ref not supported"):
+        with pytest.raises(ValueError, match="Unsupported items_ref"):
             build_plan(result, correlation_id="corr")
 
 
@@ -243,6 +255,33 @@ class TestStoraclePlanToDict:
         assert "method" in op
         assert "params" in op
 
+    def test_to_dict_is_cached(self):
+        """A plan is serialized (and its plan_id hashed) once."""
+        plan = build_plan(CallableResult(items=[{"id": 1}]), correlation_id="corr")
+
+        assert plan.to_dict() is plan.to_dict()
+
+
+class TestPlanHandle:
+    """Tests for the live plan handed from plan.build to storacle.submit."""
+
+    def test_reads_as_plan_dict(self):
+        plan = build_plan(CallableResult(items=[{"id": 1}]), correlation_id="corr")
+        handle = PlanHandle(plan)
+
+        assert handle["meta"]["correlation_id"] == "corr"
+        assert handle == plan.to_dict()
+        assert json.loads(json.dumps({"plan": handle}, default=json_default)) == {"plan": plan.to_dict()}
+
+    def test_pickles_as_plain_dict(self):
+        import pickle
+
+        plan = build_plan(CallableResult(items=[{"id": 1}]), correlation_id="corr")
+        restored = pickle.loads(pickle.dumps(PlanHandle(plan)))
+
+        assert type(restored) is dict
+        assert restored == plan.to_dict()
+
 
 # ============================================================================
 # e005b-07: Batch wrapping mode
@@ -474,17 +513,26 @@ class TestIdemKeyComputation:
                     id_field="id",
                 )
 
-    def test_compute_idem_key_function(self):
-        """_compute_idem_key should follow the pattern."""
-        item = {"contactid": "abc-123"}
-        defaults = {
-            "source_system": "dataverse",
-            "connection_name": "dataverse-clinic",
-            "object_type": "contact",
-        }
+    def test_idem_key_pattern_without_payload_wrap(self):
+        """Unwrapped rows get the same idem_key pattern."""
+        with patch("lorchestra.config.load_config", return_value=_mock_config()):
+            plan = build_plan_from_items(
+                items=[{"contactid": "abc-123"}],
+                correlation_id="test",
+                method="bq.upsert",
+                dataset="raw",
+                table="raw_objects",
+                key_columns=["idem_key"],
+                id_field="contactid",
+                field_defaults={
+                    "source_system": "dataverse",
+                    "connection_name": "dataverse-clinic",
+                    "object_type": "contact",
+                },
+            )
 
-        key = _compute_idem_key(item, "contactid", defaults)
-        assert key == "dataverse:dataverse-clinic:contact:abc-123"
+        row = plan.ops[0].params["rows"][0]
+        assert row["idem_key"] == "dataverse:dataverse-clinic:contact:abc-123"
 
 
 class TestDatasetResolution:
@@ -927,7 +975,7 @@ class TestIdemKeySuffix:
 
         row = plan.ops[0].params["rows"][0]
         # idem_key was already in the item and id_field was not set,
-        # so _compute_idem_key was never called. Suffix is applied to
+        # so no idem_key was computed. Suffix is applied to
         # existing idem_key.
         assert row["idem_key"] == "existing_key#customer"
 
@@ -977,3 +1025,246 @@ class TestIdemKeySuffix:
         rows = plan.ops[0].params["rows"]
         assert rows[0]["idem_key"] == "stripe:stripe-prod:customer:cus_123#customer"
         assert rows[1]["idem_key"] == "stripe:stripe-prod:customer:cus_456#customer"
+
+
+class TestLazyJsonRows:
+    """Batch rows carrying LazyJson cells from a lazy_json storacle.query."""
+
+    def _rows(self, items):
+        with patch("lorchestra.config.load_config", return_value=_mock_config()):
+            plan = build_plan_from_items(
+                items=items,
+                correlation_id="test",
+                method="bq.upsert",
+                dataset="canonical",
+                table="canonical_objects",
+                key_columns=["idem_key"],
+            )
+        return plan.ops[0].params["rows"]
+
+    def test_untouched_payload_passes_through_as_text(self):
+        from lorchestra.row_decoder import LazyJson
+
+        payload = LazyJson('{"a": 1}')
+        rows = self._rows([{"idem_key": "k1", "payload": payload}])
+
+        assert rows[0]["payload"] == '{"a": 1}'
+        assert not payload.parsed
+
+    def test_accessed_payload_passes_through_as_object(self):
+        from lorchestra.row_decoder import LazyJson
+
+        payload = LazyJson('{"a": 1}')
+        payload["b"] = 2
+        rows = self._rows([{"idem_key": "k1", "payload": payload}])
+
+        assert rows[0]["payload"] == {"a": 1, "b": 2}
+
+
+class TestCompiledRowTransformer:
+    """The compiled batch row builder matches the per-step semantics."""
+
+    BATCH = dict(
+        correlation_id="corr",
+        method="bq.upsert",
+        dataset="raw_ds",
+        table="raw_objects",
+        key_columns=["idem_key"],
+        payload_wrap=True,
+        id_field="id",
+        auto_external_id=True,
+        auto_timestamp_columns=["first_seen", "last_seen"],
+        field_defaults={"source_system": "gmail", "connection_name": "acct1", "object_type": "email"},
+        fields=[
+            "idem_key", "source_system", "connection_name", "object_type",
+            "external_id", "payload", "first_seen", "last_seen", "correlation_id",
+        ],
+    )
+
+    ITEMS = [{"id": "m1", "subject": "Hi"}, {"id": 2, "subject": "Yo", "labels": ["A"]}]
+
+    def test_template_path_matches_general_path(self, monkeypatch):
+        from lorchestra import plan_builder
+
+        fast = build_plan_from_items(items=self.ITEMS, **self.BATCH).ops[0].params["rows"]
+        monkeypatch.setattr(plan_builder._RowTransformer, "_compile_template", lambda self: None)
+        general = build_plan_from_items(items=self.ITEMS, **self.BATCH).ops[0].params["rows"]
+
+        assert [{**r, "first_seen": None, "last_seen": None} for r in fast] == \
+            [{**r, "first_seen": None, "last_seen": None} for r in general]
+        assert fast[1]["idem_key"] == "gmail:acct1:email:2"
+        assert json.loads(fast[0]["payload"]) == self.ITEMS[0]
+
+    def test_missing_field_still_raises(self):
+        with pytest.raises(ValueError, match="missing required field"):
+            build_plan_from_items(items=self.ITEMS, **{**self.BATCH, "fields": ["idem_key", "nope"]})
+
+    def test_payload_encoding_matches_json_dumps(self):
+        from datetime import datetime, timezone
+        from lorchestra.plan_builder import _encode_payloads
+
+        ts = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        items = [
+            {"at": ts, 1: "int key", "big": 123456789012345678901234567890},
+            {"name": "Zoë Ångström", "note": "日本語 ✓", "n": 2**63, "neg": -(2**64), "x": 0.1},
+        ]
+
+        assert _encode_payloads(items) == [json.dumps(item, default=str) for item in items]
+
+    def test_build_workers_pool_preserves_order(self, monkeypatch):
+        from lorchestra import plan_builder
+
+        monkeypatch.setattr(plan_builder, "POOL_MIN_ROWS", 4)
+        items = [{"id": f"m{i}"} for i in range(10)]
+        rows = build_plan_from_items(items=items, build_workers=3, **self.BATCH).ops[0].params["rows"]
+
+        assert [r["idem_key"] for r in rows] == [f"gmail:acct1:email:m{i}" for i in range(10)]
+
+
+class TestColumnarRows:
+    """Tests for the rows_columnar batch encoding."""
+
+    ROWS = [
+        {"idem_key": "a", "payload": '{"x": 1}', "object_type": "email", "flag": True},
+        {"idem_key": "b", "payload": '{"x": 2}', "object_type": "email", "flag": 1},
+    ]
+
+    def test_round_trip_with_constants(self):
+        from lorchestra.plan_builder import expand_columnar, to_columnar
+
+        block = to_columnar(self.ROWS)
+
+        assert block["count"] == 2
+        assert block["constants"] == {"object_type": "email"}
+        # True and 1 compare equal but are not the same constant
+        assert block["columns"]["flag"] == [True, 1]
+        assert expand_columnar(block) == self.ROWS
+
+    def test_non_uniform_rows_stay_rows(self):
+        from lorchestra.plan_builder import to_columnar
+
+        assert to_columnar([{"a": 1}, {"b": 2}]) is None
+        assert to_columnar([]) is None
+
+    def test_all_constant_rows(self):
+        from lorchestra.plan_builder import expand_columnar, to_columnar
+
+        block = to_columnar([{"a": 1}, {"a": 1}, {"a": 1}])
+        assert block["columns"] == {}
+        assert expand_columnar(block) == [{"a": 1}, {"a": 1}, {"a": 1}]
+
+    def test_batch_plan_columnar(self):
+        from lorchestra.plan_builder import expand_plan_dict, op_rows
+
+        with patch("lorchestra.config.load_config", return_value=_mock_config()):
+            plan = build_plan_from_items(
+                items=[{"idem_key": "k1"}, {"idem_key": "k2"}],
+                correlation_id="corr",
+                method="bq.upsert",
+                dataset="canonical",
+                table="canonical_objects",
+                key_columns=["idem_key"],
+                field_defaults={"canonical_schema": "iglu:x"},
+                columnar=True,
+            )
+
+        params = plan.ops[0].params
+        assert "rows" not in params
+        assert params["rows_columnar"]["constants"] == {"canonical_schema": "iglu:x", "correlation_id": "corr"}
+        assert [r["idem_key"] for r in op_rows(params)] == ["k1", "k2"]
+
+        plan_dict = plan.to_dict()
+        expanded = expand_plan_dict(plan_dict)
+        assert expanded["ops"][0]["params"]["rows"] == op_rows(params)
+        assert "rows_columnar" in plan_dict["ops"][0]["params"]
+
+
+class TestBatchDedupe:
+    """Tests for in-batch deduplication on key_columns."""
+
+    ITEMS = [
+        {"id": "a", "v": 1, "updated": "2026-01-02T00:00:00Z"},
+        {"id": "b", "v": 1, "updated": "2026-01-01T00:00:00Z"},
+        {"id": "a", "v": 2, "updated": "2026-01-01T00:00:00+00:00"},
+        {"id": "a", "v": 3, "updated": None},
+    ]
+
+    def _build(self, dedupe):
+        with patch("lorchestra.config.load_config", return_value=_mock_config()):
+            return build_plan_from_items(
+                items=self.ITEMS,
+                correlation_id="corr",
+                method="bq.upsert",
+                dataset="canonical",
+                table="t",
+                key_columns=["id"],
+                dedupe=dedupe,
+            )
+
+    def _rows(self, plan):
+        return [(r["id"], r["v"]) for r in plan.ops[0].params["rows"]]
+
+    def test_last_wins(self):
+        plan = self._build("last")
+        assert self._rows(plan) == [("a", 3), ("b", 1)]
+        assert plan.stats == {"rows_in": 4, "rows": 2, "duplicates": 2}
+
+    def test_first_wins(self):
+        plan = self._build("first")
+        assert self._rows(plan) == [("a", 1), ("b", 1)]
+
+    def test_max_by_timestamp(self):
+        plan = self._build({"max_by": "updated"})
+        assert self._rows(plan) == [("a", 1), ("b", 1)]
+
+    def test_no_dedupe_keeps_duplicates(self):
+        plan = self._build(None)
+        assert len(plan.ops[0].params["rows"]) == 4
+        assert plan.stats["duplicates"] == 0
+        assert "stats" not in plan.to_dict()["meta"]
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError, match="Invalid dedupe policy"):
+            self._build("newest")
+
+
+class TestContentHash:
+    """Tests for StoraclePlan.content_hash."""
+
+    def _build(self, items, correlation_id="run1:persist"):
+        with patch("lorchestra.config.load_config", return_value=_mock_config()):
+            return build_plan_from_items(
+                items=items,
+                correlation_id=correlation_id,
+                method="bq.upsert",
+                dataset="canonical",
+                table="t",
+                key_columns=["id"],
+                auto_timestamp_columns=["projected_at"],
+            )
+
+    def test_ignores_run_specific_values(self):
+        a = self._build([{"id": "a", "v": 1}], correlation_id="run1:persist")
+        b = self._build([{"id": "a", "v": 1}], correlation_id="run2:persist")
+
+        assert a.to_dict()["plan_id"] != b.to_dict()["plan_id"]
+        assert a.content_hash() == b.content_hash()
+
+    def test_changes_with_data(self):
+        a = self._build([{"id": "a", "v": 1}])
+        b = self._build([{"id": "a", "v": 2}])
+        assert a.content_hash() != b.content_hash()
+
+    def test_op_auto_timestamp_columns(self):
+        def plan(ts):
+            return build_plan_from_items(
+                items=[{
+                    "table": "clients",
+                    "auto_timestamp_columns": ["projected_at"],
+                    "rows": [{"id": "a", "projected_at": ts}],
+                }],
+                correlation_id="corr",
+                method="sqlite.sync",
+            )
+
+        assert plan("2026-01-01").content_hash() == plan("2026-01-02").content_hash()
@@ -9,7 +9,7 @@ Tests cover:
 """
 
 import pytest
-from lorchestra.query_builder import build_query, QueryParam
+from lorchestra.query_builder import build_query, build_shard_bounds_query, shard_boundaries, QueryParam
 
 
 def _identity_resolve(name: str) -> str:
@@ -278,3 +278,233 @@ class TestInvalidMode:
                 },
                 resolve_dataset=_identity_resolve,
             )
+
+
+class TestKeysetPagination:
+    """Tests for paginate: keyset pagination."""
+
+    def test_first_page_has_no_cursor(self):
+        sql, params = build_query(
+            {
+                "dataset": "raw",
+                "table": "raw_objects",
+                "columns": ["idem_key", "payload"],
+                "paginate": {"key": "idem_key", "page_size": 500},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert sql == (
+            "SELECT idem_key, payload FROM `raw.raw_objects` WHERE TRUE "
+            "ORDER BY idem_key LIMIT 500"
+        )
+        assert params == []
+
+    def test_next_page_uses_cursor_param(self):
+        sql, params = build_query(
+            {
+                "dataset": "raw",
+                "table": "raw_objects",
+                "columns": ["idem_key"],
+                "filters": {"source_system": "gmail"},
+                "paginate": {"key": "idem_key", "page_size": 500, "after": "gmail:a:email:9"},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert "idem_key > @_page_after" in sql
+        assert sql.endswith("ORDER BY idem_key LIMIT 500")
+        cursor = [p for p in params if p.name == "_page_after"]
+        assert cursor == [QueryParam(name="_page_after", type="STRING", value="gmail:a:email:9")]
+
+    def test_paginate_overrides_limit(self):
+        sql, _ = build_query(
+            {
+                "dataset": "raw",
+                "table": "raw_objects",
+                "limit": 1000,
+                "paginate": {"key": "idem_key", "page_size": 50},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert sql.endswith("LIMIT 50")
+        assert "LIMIT 1000" not in sql
+
+    def test_left_anti_paginated(self):
+        sql, params = build_query(
+            {
+                "dataset": "raw",
+                "table": "raw_objects",
+                "columns": ["idem_key", "payload"],
+                "incremental": {
+                    "target_dataset": "canonical",
+                    "target_table": "canonical_objects",
+                    "source_key": "idem_key",
+                    "target_key": "idem_key",
+                    "mode": "left_anti",
+                },
+                "paginate": {"key": "idem_key", "page_size": 100, "after": "k1"},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert "s.idem_key > @_page_after" in sql
+        assert sql.endswith("ORDER BY s.idem_key LIMIT 100")
+
+    def test_key_must_be_selected(self):
+        with pytest.raises(ValueError, match="must be one of the selected columns"):
+            build_query(
+                {
+                    "dataset": "raw",
+                    "table": "raw_objects",
+                    "columns": ["payload"],
+                    "paginate": {"key": "idem_key", "page_size": 10},
+                },
+                resolve_dataset=_identity_resolve,
+            )
+
+
+class TestWatermarkMode:
+    """Tests for incremental mode: watermark."""
+
+    def _params(self, **incremental):
+        return {
+            "dataset": "derived",
+            "table": "measurement_events",
+            "columns": ["measurement_event_id", "metadata"],
+            "filters": {"binding_id": "followup"},
+            "incremental": {"mode": "watermark", "source_ts": "processed_at", **incremental},
+        }
+
+    def test_first_run_reads_everything(self):
+        sql, params = build_query(self._params(), resolve_dataset=_identity_resolve)
+        assert sql == (
+            "SELECT s.measurement_event_id, s.metadata, s.processed_at "
+            "FROM `derived.measurement_events` s "
+            "WHERE s.binding_id = @binding_id ORDER BY s.processed_at"
+        )
+        assert [p.name for p in params] == ["binding_id"]
+
+    def test_watermark_filter_is_parameterized(self):
+        sql, params = build_query(
+            self._params(watermark="2026-02-09T00:00:00+00:00"),
+            resolve_dataset=_identity_resolve,
+        )
+        assert "s.processed_at > @_watermark" in sql
+        assert "JOIN" not in sql and "EXISTS" not in sql
+        assert QueryParam(
+            name="_watermark", type="TIMESTAMP", value="2026-02-09T00:00:00+00:00"
+        ) in params
+
+    def test_target_fields_not_required(self):
+        # Only the source table is read; no target_dataset lookup happens
+        sql, _ = build_query(
+            self._params(watermark="2026-02-09T00:00:00+00:00"),
+            resolve_dataset=lambda name: {"derived": "prod_derived"}[name],
+        )
+        assert "`prod_derived.measurement_events`" in sql
+
+    def test_limit_rejected(self):
+        with pytest.raises(ValueError, match="watermark mode cannot be combined"):
+            build_query({**self._params(), "limit": 10}, resolve_dataset=_identity_resolve)
+
+    def test_max_pages_rejected(self):
+        params = {**self._params(), "paginate": {"key": "measurement_event_id", "page_size": 100, "max_pages": 2}}
+        with pytest.raises(ValueError, match="watermark mode cannot be combined"):
+            build_query(params, resolve_dataset=_identity_resolve)
+
+    def test_unbounded_pagination_allowed(self):
+        params = {**self._params(), "paginate": {"key": "measurement_event_id", "page_size": 100}}
+        sql, _ = build_query(params, resolve_dataset=_identity_resolve)
+        assert "LIMIT 100" in sql
+
+
+class TestInFilter:
+    """Tests for list values in dict filters."""
+
+    def test_list_value_becomes_in(self):
+        sql, params = build_query(
+            {
+                "dataset": "canonical",
+                "table": "canonical_objects",
+                "filters": {"connection_name": ["google-forms-a", "google-forms-b"]},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert "connection_name IN (@connection_name_0, @connection_name_1)" in sql
+        assert [p.value for p in params] == ["google-forms-a", "google-forms-b"]
+
+    def test_empty_list_matches_nothing(self):
+        sql, params = build_query(
+            {"dataset": "raw", "table": "raw_objects", "filters": {"source_system": []}},
+            resolve_dataset=_identity_resolve,
+        )
+        assert "WHERE FALSE" in sql
+        assert params == []
+
+
+class TestSharding:
+    """Tests for range-sharded queries."""
+
+    def test_shard_ranges_emit_bounds(self):
+        base = {"dataset": "raw", "table": "raw_objects", "filters": {"source_system": "dataverse"}}
+        first, first_params = build_query(
+            {**base, "shard": {"column": "last_seen", "end": "2026-01-02T00:00:00+00:00"}},
+            resolve_dataset=_identity_resolve,
+        )
+        middle, middle_params = build_query(
+            {**base, "shard": {
+                "column": "last_seen",
+                "start": "2026-01-02T00:00:00+00:00",
+                "end": "2026-01-03T00:00:00+00:00",
+            }},
+            resolve_dataset=_identity_resolve,
+        )
+        assert "(last_seen < @_shard_end OR last_seen IS NULL)" in first
+        assert "last_seen >= @_shard_start AND last_seen < @_shard_end" in middle
+        assert [p.type for p in middle_params] == ["STRING", "TIMESTAMP", "TIMESTAMP"]
+        assert len(first_params) == 2
+
+    def test_unbounded_shard_is_the_plain_query(self):
+        base = {"dataset": "raw", "table": "raw_objects", "filters": {"source_system": "dataverse"}}
+        assert build_query({**base, "shard": {"column": "last_seen", "count": 4}}, resolve_dataset=_identity_resolve) \
+            == build_query(base, resolve_dataset=_identity_resolve)
+
+    def test_shard_with_limit_rejected(self):
+        with pytest.raises(ValueError, match="shard cannot be combined"):
+            build_query(
+                {"dataset": "raw", "table": "raw_objects", "limit": 10, "shard": {"column": "last_seen", "count": 2}},
+                resolve_dataset=_identity_resolve,
+            )
+
+    def test_bounds_query(self):
+        sql, params = build_shard_bounds_query(
+            {
+                "dataset": "raw",
+                "table": "raw_objects",
+                "filters": {"source_system": "dataverse"},
+                "shard": {"column": "last_seen", "count": 4},
+            },
+            resolve_dataset=_identity_resolve,
+        )
+        assert sql == (
+            "SELECT MIN(s.last_seen) AS lo, MAX(s.last_seen) AS hi "
+            "FROM `raw.raw_objects` s WHERE s.source_system = @source_system"
+        )
+        assert [p.name for p in params] == ["source_system"]
+
+    def test_boundaries_by_count(self):
+        cuts = shard_boundaries("2026-01-01T00:00:00Z", "2026-01-05T00:00:00Z", {"column": "last_seen", "count": 4})
+        assert cuts == [
+            "2026-01-02T00:00:00+00:00",
+            "2026-01-03T00:00:00+00:00",
+            "2026-01-04T00:00:00+00:00",
+        ]
+
+    def test_boundaries_by_bucket(self):
+        cuts = shard_boundaries(
+            "2026-01-01T06:00:00+00:00", "2026-01-03T00:00:00+00:00", {"column": "last_seen", "bucket": "day"}
+        )
+        assert cuts == ["2026-01-02T00:00:00+00:00", "2026-01-03T00:00:00+00:00"]
+
+    def test_boundaries_int64_and_empty_range(self):
+        assert shard_boundaries(0, 100, {"column": "id", "type": "INT64", "count": 4}) == ["25", "50", "75"]
+        assert shard_boundaries(None, None, {"column": "last_seen", "count": 4}) == []
+        assert shard_boundaries("2026-01-01T00:00:00Z", "2026-01-01T00:00:00Z", {"column": "last_seen", "count": 4}) == []
@@ -0,0 +1,69 @@
+"""Tests for the pipeline-scoped QueryCache."""
+
+from lorchestra.plan_builder import StoraclePlan, StoracleOp
+from lorchestra.query_builder import QueryParam
+from lorchestra.query_cache import QueryCache
+
+
+def _plan(method: str, **params) -> StoraclePlan:
+    return StoraclePlan(
+        correlation_id="test",
+        ops=[StoracleOp(op_id="op-1", method=method, params=params)],
+    )
+
+
+class TestMakeKey:
+    def test_params_are_part_of_key(self):
+        sql = "SELECT * FROM `canonical.proj_clients` WHERE status = @status"
+        a = QueryCache.make_key(sql, [QueryParam("status", "STRING", "active")])
+        b = QueryCache.make_key(sql, [QueryParam("status", "STRING", "closed")])
+        assert a != b
+        assert a == QueryCache.make_key(sql, [{"name": "status", "type": "STRING", "value": "active"}])
+
+
+class TestGetPut:
+    def test_miss_then_hit(self):
+        cache = QueryCache()
+        assert cache.get("k") is None
+        cache.put("k", [{"id": 1}], datasets={"canonical"})
+        assert cache.get("k") == [{"id": 1}]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_returns_copies(self):
+        cache = QueryCache()
+        cache.put("k", [{"id": 1, "payload": "{}"}], datasets={"canonical"})
+        rows = cache.get("k")
+        rows[0]["payload"] = {}
+        assert cache.get("k") == [{"id": 1, "payload": "{}"}]
+
+    def test_spills_beyond_memory_budget(self, tmp_path):
+        cache = QueryCache(max_memory_rows=2, spill_dir=tmp_path)
+        cache.put("small", [{"id": 1}], datasets={"canonical"})
+        cache.put("large", [{"id": i} for i in range(5)], datasets={"canonical"})
+        assert (tmp_path / "large.json").exists()
+        assert cache.get("large") == [{"id": i} for i in range(5)]
+        cache.close()
+        assert not (tmp_path / "large.json").exists()
+
+
+class TestInvalidation:
+    def test_bq_write_invalidates_dataset(self):
+        cache = QueryCache()
+        cache.put("clients", [{"id": 1}], datasets={"canonical"})
+        cache.put("events", [{"id": 2}], datasets={"derived"})
+        cache.invalidate_plan(_plan("bq.upsert", dataset="canonical", table="canonical_objects"))
+        assert "clients" not in cache
+        assert "events" in cache
+
+    def test_non_bq_write_keeps_entries(self):
+        cache = QueryCache()
+        cache.put("clients", [{"id": 1}], datasets={"canonical"})
+        cache.invalidate_plan(_plan("sqlite.sync", sqlite_path="/tmp/x.db", table="clients"))
+        cache.invalidate_plan(_plan("sheets.write_table", spreadsheet_id="s", sheet_name="c"))
+        assert "clients" in cache
+
+    def test_unknown_target_clears_cache(self):
+        cache = QueryCache()
+        cache.put("clients", [{"id": 1}], datasets={"canonical"})
+        cache.invalidate_plan(_plan("bq.execute", sql="CREATE OR REPLACE TABLE molt.x AS ..."))
+        assert len(cache) == 0
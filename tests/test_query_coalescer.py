@@ -0,0 +1,111 @@
+"""Tests for coalescing sibling storacle.query reads into one scan."""
+
+import pytest
+import yaml
+
+from lorchestra.executor import execute_job
+from lorchestra.query_cache import QueryCache
+from lorchestra.query_coalescer import prefetch_stage_reads
+from lorchestra.registry import JobRegistry
+from lorchestra.watermark_store import InMemoryWatermarkStore
+
+
+CONNECTIONS = {
+    "form_a": "google-forms-a",
+    "form_b": "google-forms-b",
+    "form_c": "google-forms-c",
+}
+
+SOURCE_ROWS = [
+    {"idem_key": "a1", "connection_name": "google-forms-a", "payload": "{}", "canonicalized_at": "2026-02-01T00:00:00Z"},
+    {"idem_key": "b1", "connection_name": "google-forms-b", "payload": "{}", "canonicalized_at": "2026-02-02T00:00:00Z"},
+    {"idem_key": "a2", "connection_name": "google-forms-a", "payload": "{}", "canonicalized_at": "2026-02-03T00:00:00Z"},
+    {"idem_key": "x1", "connection_name": "google-forms-x", "payload": "{}", "canonicalized_at": "2026-02-03T00:00:00Z"},
+]
+
+
+@pytest.fixture
+def definitions_dir(tmp_path):
+    for job_id, connection in CONNECTIONS.items():
+        job = {
+            "job_id": job_id,
+            "version": "2.0",
+            "steps": [{
+                "step_id": "read",
+                "op": "storacle.query",
+                "params": {
+                    "dataset": "canonical",
+                    "table": "canonical_objects",
+                    "columns": ["idem_key", "payload"],
+                    "filters": {
+                        "canonical_schema": "form_response",
+                        "connection_name": connection,
+                    },
+                    "parse_json_columns": ["payload"],
+                    "incremental": {"mode": "watermark", "source_ts": "canonicalized_at"},
+                },
+            }],
+        }
+        (tmp_path / f"{job_id}.yaml").write_text(yaml.safe_dump(job))
+    return tmp_path
+
+
+@pytest.fixture
+def bq_calls(monkeypatch):
+    """Fake bq.query honouring the connection_name IN filter."""
+    calls: list[dict] = []
+
+    def fake_submit_plan(plan, meta):
+        op = plan.ops[0]
+        params = {p["name"]: p["value"] for p in op.params["query_params"]}
+        calls.append({"sql": op.params["sql"], "params": params})
+        wanted = {v for k, v in params.items() if k.startswith("connection_name")}
+        rows = [dict(r) for r in SOURCE_ROWS if r["connection_name"] in wanted]
+        return [{"jsonrpc": "2.0", "id": op.op_id, "result": {"rows": rows}}]
+
+    monkeypatch.setattr("lorchestra.storacle.client.submit_plan", fake_submit_plan)
+    monkeypatch.setattr("lorchestra.plan_builder._resolve_dataset", lambda name: name)
+    return calls
+
+
+def _run(job_id, definitions_dir, cache, watermarks):
+    job_def = JobRegistry(definitions_dir).load(job_id)
+    return execute_job(job_def, query_cache=cache, watermarks=watermarks)
+
+
+class TestPrefetchStageReads:
+    def test_one_scan_serves_every_sibling(self, definitions_dir, bq_calls):
+        cache = QueryCache()
+        watermarks = InMemoryWatermarkStore()
+
+        served = prefetch_stage_reads(list(CONNECTIONS), definitions_dir, cache, watermarks)
+        results = {j: _run(j, definitions_dir, cache, watermarks) for j in CONNECTIONS}
+
+        assert served == 3
+        assert len(bq_calls) == 1
+        assert "connection_name IN (" in bq_calls[0]["sql"]
+        assert [i["idem_key"] for i in results["form_a"].step_outputs["read"]["items"]] == ["a1", "a2"]
+        assert results["form_b"].step_outputs["read"]["items"] == [
+            {"idem_key": "b1", "payload": {}, "canonicalized_at": "2026-02-02T00:00:00Z"},
+        ]
+        assert results["form_c"].step_outputs["read"]["items"] == []
+
+    def test_demux_honours_each_watermark(self, definitions_dir, bq_calls):
+        cache = QueryCache()
+        watermarks = InMemoryWatermarkStore()
+        watermarks.advance("form_a:read", "2026-02-02T00:00:00Z")
+        watermarks.advance("form_b:read", "2026-01-01T00:00:00Z")
+        watermarks.advance("form_c:read", "2026-01-01T00:00:00Z")
+
+        prefetch_stage_reads(list(CONNECTIONS), definitions_dir, cache, watermarks)
+        result = _run("form_a", definitions_dir, cache, watermarks)
+
+        assert len(bq_calls) == 1
+        # Combined scan starts at the lowest watermark
+        assert bq_calls[0]["params"]["_watermark"] == "2026-01-01T00:00:00+00:00"
+        assert [i["idem_key"] for i in result.step_outputs["read"]["items"]] == ["a2"]
+
+    def test_single_read_is_not_coalesced(self, definitions_dir, bq_calls):
+        cache = QueryCache()
+        assert prefetch_stage_reads(["form_a"], definitions_dir, cache) == 0
+        assert bq_calls == []
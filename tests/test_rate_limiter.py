@@ -0,0 +1,198 @@
+"""Tests for LLM rate limiting and concurrent dispatch."""
+
+import threading
+
+import pytest
+
+from lorchestra.errors import PermanentError, TransientError
+from lorchestra.rate_limiter import (
+    LimiterRegistry,
+    LLMCall,
+    ModelLimiter,
+    TokenBucket,
+    dispatch_concurrent,
+    load_rate_limits,
+)
+
+
+class _Clock:
+    """Fake monotonic clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock, **kwargs):
+    return ModelLimiter("m", clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        clock = _Clock()
+        bucket = TokenBucket(60, clock)  # 1 per second, burst of 60
+
+        assert all(bucket.reserve(1) == 0 for _ in range(60))
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        assert bucket.reserve(1) == pytest.approx(2.0)
+
+        clock.now += 10
+        assert bucket.reserve(1) == 0
+
+    def test_oversized_reservation_is_capped(self):
+        bucket = TokenBucket(100, _Clock())
+        assert bucket.reserve(1000) == 0
+        assert bucket.reserve(1) > 0
+
+
+class TestModelLimiter:
+    """Tests for ModelLimiter."""
+
+    def test_requests_per_minute(self):
+        clock = _Clock()
+        limiter = _limiter(clock, rpm=2)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.slept == [pytest.approx(30.0)]
+
+    def test_tokens_per_minute_with_usage_correction(self):
+        clock = _Clock()
+        limiter = _limiter(clock, tpm=600)
+
+        limiter.call(lambda: {"used": 600}, tokens=10, usage=lambda r: r["used"])
+        limiter.call(lambda: None, tokens=100)
+
+        # 600 used of a 600/min bucket: the next 100 tokens wait 10s
+        assert clock.slept == [pytest.approx(10.0)]
+
+    def test_transient_backs_off_and_recovers(self):
+        clock = _Clock()
+        limiter = _limiter(clock, rpm=6000, backoff_seconds=2)
+        outcomes = [TransientError("overloaded"), TransientError("overloaded"), "ok"]
+
+        def fn():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert limiter.call(fn, max_retries=2) == "ok"
+        # Cooldowns of 2s then 4s; rate halved twice, then +10% on success
+        assert clock.slept == [pytest.approx(2.0), pytest.approx(4.0)]
+        assert limiter.rate_factor == pytest.approx(0.35)
+
+    def test_transient_raised_after_retries(self):
+        clock = _Clock()
+        limiter = _limiter(clock, backoff_seconds=1)
+
+        def fn():
+            raise TransientError("rate limit")
+
+        with pytest.raises(TransientError):
+            limiter.call(fn, max_retries=1)
+        assert len(clock.slept) == 1
+
+    def test_permanent_error_is_not_retried(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise PermanentError("bad prompt")
+
+        with pytest.raises(PermanentError):
+            _limiter(_Clock()).call(fn, max_retries=3)
+        assert calls == [1]
+
+
+class TestLimiterRegistry:
+    """Tests for LimiterRegistry and the limits file."""
+
+    def test_models_and_default(self):
+        registry = LimiterRegistry({
+            "default": {"rpm": 10},
+            "models": {"fast": {"rpm": 100, "tpm": 1000}},
+        })
+
+        assert registry.get("fast").requests.capacity == 100
+        assert registry.get("fast").tokens.capacity == 1000
+        assert registry.get("other").requests.capacity == 10
+        assert registry.get("other").tokens is None
+        assert registry.get("fast") is registry.get("fast")
+
+    def test_loads_shipped_limits(self):
+        from lorchestra.pipeline import DEFINITIONS_DIR
+
+        limits = load_rate_limits(DEFINITIONS_DIR)
+        assert limits["default"]["rpm"] > 0
+        LimiterRegistry(limits)
+
+    def test_missing_file(self, tmp_path):
+        assert load_rate_limits(tmp_path) == {}
+
+
+class TestDispatchConcurrent:
+    """Tests for dispatch_concurrent."""
+
+    def test_results_in_order_with_isolated_failures(self):
+        def make(i):
+            def fn():
+                if i == 2:
+                    raise PermanentError("bad item")
+                return i * 10
+            return fn
+
+        results = dispatch_concurrent(
+            [LLMCall("m", make(i)) for i in range(5)],
+            max_concurrency=3, registry=LimiterRegistry({}, backoff_seconds=0),
+        )
+
+        assert results[:2] == [0, 10] and results[3:] == [30, 40]
+        assert isinstance(results[2], PermanentError)
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+        release = threading.Event()
+
+        def fn():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            release.wait(0.05)
+            with lock:
+                state["running"] -= 1
+
+        dispatch_concurrent(
+            [LLMCall("m", fn) for _ in range(8)],
+            max_concurrency=2, registry=LimiterRegistry({}),
+        )
+
+        assert state["peak"] == 2
+
+    def test_transient_failures_retried(self):
+        attempts = []
+
+        def fn():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise TransientError("overloaded")
+            return "ok"
+
+        results = dispatch_concurrent(
+            [LLMCall("m", fn)], registry=LimiterRegistry({}, backoff_seconds=0),
+        )
+
+        assert results == ["ok"]
+        assert len(attempts) == 2
@@ -0,0 +1,109 @@
+"""Tests for storacle.query row decoding."""
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from lorchestra import row_decoder
+from lorchestra.row_decoder import (
+    LazyJson,
+    decode_rows,
+    json_default,
+    loads_json,
+    parse_json_columns,
+    temporal_columns,
+)
+
+
+TS = datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc)
+
+
+class TestDecodeRows:
+    def test_schema_limits_decoding_to_temporal_columns(self):
+        rows = [{"idem_key": "a", "last_seen": TS, "day": date(2026, 2, 9)}]
+        schema = [
+            {"name": "idem_key", "type": "STRING"},
+            {"name": "last_seen", "type": "TIMESTAMP"},
+            {"name": "day", "type": "DATE"},
+        ]
+        assert decode_rows(rows, schema) == [
+            {"idem_key": "a", "last_seen": "2026-02-09T10:00:00+00:00", "day": "2026-02-09"},
+        ]
+
+    def test_without_schema_uses_first_non_null_value(self):
+        rows = [
+            {"idem_key": "a", "last_seen": None},
+            {"idem_key": "b", "last_seen": TS},
+        ]
+        assert temporal_columns(rows) == ["last_seen"]
+        assert decode_rows(rows)[1]["last_seen"] == "2026-02-09T10:00:00+00:00"
+        assert rows[0]["last_seen"] is None
+
+    def test_empty_rows(self):
+        assert decode_rows([]) == []
+
+
+class TestParseJsonColumns:
+    def test_parses_only_requested_columns(self):
+        rows = [{"payload": '{"a": 1}', "raw": '{"b": 2}'}]
+        parse_json_columns(rows, ["payload"])
+        assert rows == [{"payload": {"a": 1}, "raw": '{"b": 2}'}]
+
+    def test_invalid_and_non_string_values_left_unchanged(self):
+        rows = [{"payload": "not json"}, {"payload": {"already": "parsed"}}, {}]
+        parse_json_columns(rows, ["payload"])
+        assert rows == [{"payload": "not json"}, {"payload": {"already": "parsed"}}, {}]
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_loads_json_with_and_without_orjson(self, monkeypatch, has_orjson):
+        if has_orjson and row_decoder.orjson is None:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(row_decoder, "HAS_ORJSON", has_orjson)
+        assert loads_json('{"n": [1, 2.5, null]}') == {"n": [1, 2.5, None]}
+        # Wider than 64 bits: orjson rejects it, the stdlib fallback does not
+        assert loads_json('{"big": 123456789012345678901234567890}') == {"big": 123456789012345678901234567890}
+        with pytest.raises(ValueError):
+            loads_json("not json")
+
+
+class TestLazyJson:
+    def test_lazy_mode_defers_parsing_objects(self):
+        rows = [{"payload": '{"a": {"b": 1}}'}, {"payload": "[1, 2]"}, {"payload": "oops"}]
+        parse_json_columns(rows, ["payload"], lazy=True)
+
+        lazy = rows[0]["payload"]
+        assert isinstance(lazy, LazyJson) and not lazy.parsed
+        # Arrays are parsed eagerly, invalid JSON stays a string
+        assert rows[1]["payload"] == [1, 2]
+        assert rows[2]["payload"] == "oops"
+
+        assert lazy["a"]["b"] == 1
+        assert lazy.parsed
+        assert lazy == {"a": {"b": 1}}
+        assert dict(lazy) == {"a": {"b": 1}}
+
+    def test_serializes_as_original_text_until_accessed(self):
+        untouched = LazyJson('{"a":1}')
+        touched = LazyJson('{"a":1}')
+        touched["b"] = 2
+
+        assert json.dumps({"p": untouched}, default=json_default) == '{"p": "{\\"a\\":1}"}'
+        assert json.loads(json.dumps({"p": touched}, default=json_default)) == {"p": {"a": 1, "b": 2}}
+        assert not untouched.parsed
+
+    def test_pickles_without_parsing(self):
+        import pickle
+
+        lazy = LazyJson('{"a": 1}')
+        restored = pickle.loads(pickle.dumps(lazy))
+        assert isinstance(restored, LazyJson) and not restored.parsed
+        assert restored["a"] == 1
+
+    def test_file_run_store_writes_untouched_text(self, tmp_path):
+        from lorchestra.run_store import FileRunStore
+
+        store = FileRunStore(tmp_path)
+        ref = store.store_output("run1", "read", {"items": [{"payload": LazyJson('{"a": 1}')}]})
+
+        assert store.get_output(ref) == {"items": [{"payload": '{"a": 1}'}]}
@@ -0,0 +1,216 @@
+"""Tests for the cron scheduler."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lorchestra.locks import LockHeld, target_lock
+from lorchestra.run_store import InMemoryRunStore
+from lorchestra.scheduler import CronSchedule, Schedule, Scheduler, load_schedules
+
+
+def _dt(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCronSchedule:
+    """Tests for cron expression parsing and matching."""
+
+    def test_daily(self):
+        cron = CronSchedule("0 6 * * *")
+        assert cron.next_after(_dt(2026, 3, 1, 5, 59)) == _dt(2026, 3, 1, 6, 0)
+        assert cron.next_after(_dt(2026, 3, 1, 6, 0)) == _dt(2026, 3, 2, 6, 0)
+
+    def test_steps_lists_and_ranges(self):
+        cron = CronSchedule("*/15 9-17 * * 1-5")
+        # Saturday 2026-03-07 -> Monday 09:00
+        assert cron.next_after(_dt(2026, 3, 7, 12, 0)) == _dt(2026, 3, 9, 9, 0)
+        assert cron.next_after(_dt(2026, 3, 9, 9, 7)) == _dt(2026, 3, 9, 9, 15)
+        assert CronSchedule("0 0 1,15 * *").next_after(_dt(2026, 3, 2)) == _dt(2026, 3, 15)
+
+    def test_day_of_month_or_day_of_week(self):
+        # Both restricted: either matches (the 1st, or any Sunday)
+        cron = CronSchedule("0 0 1 * 0")
+        assert cron.next_after(_dt(2026, 3, 2)) == _dt(2026, 3, 8)
+
+    def test_aliases_and_sunday_as_7(self):
+        assert CronSchedule("@hourly").next_after(_dt(2026, 3, 1, 5, 30)) == _dt(2026, 3, 1, 6, 0)
+        assert CronSchedule("0 0 * * 7").next_after(_dt(2026, 3, 2)) == _dt(2026, 3, 8)
+
+    def test_month_rollover(self):
+        assert CronSchedule("0 0 1 1 *").next_after(_dt(2026, 3, 1)) == _dt(2027, 1, 1)
+
+    @pytest.mark.parametrize("expr", ["0 6 * *", "60 * * * *", "x * * * *", "*-5 * * * *"])
+    def test_invalid(self, expr):
+        with pytest.raises(ValueError):
+            CronSchedule(expr)
+
+    def test_never_matches(self):
+        with pytest.raises(ValueError, match="never matches"):
+            CronSchedule("0 0 31 2 *").next_after(_dt(2026, 1, 1))
+
+    def test_count_between(self):
+        cron = CronSchedule("0 * * * *")
+        assert cron.count_between(_dt(2026, 3, 1, 0, 0), _dt(2026, 3, 1, 5, 0)) == 5
+
+
+class TestScheduler:
+    """Tests for Scheduler.tick()."""
+
+    def _scheduler(self, tmp_path, clock, runner, jitter=0):
+        schedules = [Schedule("pipeline.ingest", "0 6 * * *", jitter)]
+        return Scheduler(schedules, InMemoryRunStore(), runner, clock=clock, rng=random.Random(1))
+
+    def test_first_tick_only_schedules(self, tmp_path):
+        runs = []
+        scheduler = self._scheduler(tmp_path, _Clock(_dt(2026, 3, 1, 12)), runs.append)
+
+        assert scheduler.tick() == []
+        assert runs == []
+        state = scheduler.store.get_schedule_state("pipeline.ingest")
+        assert state["next_run_at"] == _dt(2026, 3, 2, 6).isoformat()
+
+    def test_due_schedule_runs_pipeline(self, tmp_path):
+        clock = _Clock(_dt(2026, 3, 1, 12))
+        requests = []
+
+        def runner(request):
+            requests.append(request)
+            return {"success": True}
+
+        scheduler = self._scheduler(tmp_path, clock, runner)
+        scheduler.tick()
+        clock.now = _dt(2026, 3, 2, 6, 0, 30)
+        [state] = scheduler.tick()
+
+        assert requests == [{"op": "run_pipeline", "pipeline_id": "pipeline.ingest"}]
+        assert state["last_status"] == "success"
+        assert state["coalesced"] == 0
+        assert state["next_run_at"] == _dt(2026, 3, 3, 6).isoformat()
+        assert scheduler.store.get_schedule_state("pipeline.ingest") == state
+
+    def test_missed_ticks_coalesce_into_one_run(self, tmp_path):
+        clock = _Clock(_dt(2026, 3, 1, 12))
+        runs = []
+        scheduler = self._scheduler(tmp_path, clock, lambda r: runs.append(r) or {"success": True})
+        scheduler.tick()
+
+        # Down across three daily ticks: they coalesce into one run
+        clock.now = _dt(2026, 3, 4, 9)
+        [state] = scheduler.tick()
+        scheduler.tick()
+
+        assert len(runs) == 1
+        assert state["coalesced"] == 2
+        assert state["next_run_at"] == _dt(2026, 3, 5, 6).isoformat()
+
+    def test_held_lock_skips_run(self, tmp_path, monkeypatch):
+        from lorchestra.daemon import Worker
+
+        clock = _Clock(_dt(2026, 3, 1, 12))
+        monkeypatch.setattr(
+            "lorchestra.pipeline.load_pipeline", lambda pid, d: {"pipeline_id": pid, "stages": []}
+        )
+        worker = Worker.__new__(Worker)
+        worker.definitions_dir = tmp_path
+        worker.watermarks = worker.registry = worker.store = None
+        scheduler = self._scheduler(tmp_path, clock, worker.run)
+        scheduler.tick()
+        clock.now = _dt(2026, 3, 2, 6, 1)
+
+        # The runner takes the lock: held by a manual run, the tick is skipped
+        with target_lock("pipeline.ingest"):
+            [state] = scheduler.tick()
+
+        assert state["last_status"] == "skipped"
+        assert state.get("last_run_id") is None
+        assert state["next_run_at"] == _dt(2026, 3, 3, 6).isoformat()
+
+    def test_failed_run_is_recorded(self, tmp_path):
+        clock = _Clock(_dt(2026, 3, 1, 12))
+
+        def runner(request):
+            raise RuntimeError("BQ down")
+
+        scheduler = self._scheduler(tmp_path, clock, runner)
+        scheduler.tick()
+        clock.now = _dt(2026, 3, 2, 7)
+        [state] = scheduler.tick()
+
+        assert state["last_status"] == "failed"
+        assert state["last_error"] == "RuntimeError: BQ down"
+
+    def test_jitter_delays_run(self, tmp_path):
+        clock = _Clock(_dt(2026, 3, 1, 12))
+        scheduler = self._scheduler(tmp_path, clock, lambda r: {"success": True}, jitter=600)
+        scheduler.tick()
+
+        state = scheduler.store.get_schedule_state("pipeline.ingest")
+        run_at = datetime.fromisoformat(state["next_run_at"])
+        assert _dt(2026, 3, 2, 6) <= run_at <= _dt(2026, 3, 2, 6) + timedelta(seconds=600)
+
+        clock.now = run_at - timedelta(seconds=1)
+        assert scheduler.tick() == []
+        clock.now = run_at
+        assert len(scheduler.tick()) == 1
+
+    def test_job_target_runs_execute(self, tmp_path):
+        clock = _Clock(_dt(2026, 3, 1, 12))
+        requests = []
+        scheduler = Scheduler(
+            [Schedule("sync_proj_clients", "@hourly")], InMemoryRunStore(),
+            lambda r: requests.append(r) or {"success": True, "run_id": "r1"},
+            clock=clock,
+        )
+        scheduler.tick()
+        clock.now = _dt(2026, 3, 1, 13)
+        [state] = scheduler.tick()
+
+        assert requests == [{"op": "execute", "envelope": {"job_id": "sync_proj_clients"}}]
+        assert state["last_run_id"] == "r1"
+
+
+class TestTargetLock:
+    """Tests for the per-target lock."""
+
+    def test_lock_is_exclusive(self, tmp_path):
+        with target_lock("pipeline.x", tmp_path):
+            with pytest.raises(LockHeld):
+                with target_lock("pipeline.x", tmp_path):
+                    pass
+            with target_lock("pipeline.y", tmp_path):
+                pass
+        with target_lock("pipeline.x", tmp_path):
+            pass
+
+
+class TestLoadSchedules:
+    """Tests for load_schedules."""
+
+    def test_loads_shipped_schedules(self):
+        from lorchestra.pipeline import DEFINITIONS_DIR
+
+        targets = [s.target for s in load_schedules(DEFINITIONS_DIR)]
+        assert "pipeline.ingest" in targets
+
+    def test_missing_file(self, tmp_path):
+        assert load_schedules(tmp_path) == []
+
+    def test_duplicate_target(self, tmp_path):
+        (tmp_path / "config").mkdir()
+        (tmp_path / "config" / "schedules.yaml").write_text(
+            "schedules:\n"
+            "  - {target: pipeline.a, cron: '@daily'}\n"
+            "  - {target: pipeline.a, cron: '@hourly'}\n"
+        )
+        with pytest.raises(ValueError, match="scheduled twice"):
+            load_schedules(tmp_path)
@@ -0,0 +1,103 @@
+"""Tests for NDJSON spill files and items_ref."""
+
+import json
+import pickle
+
+import pytest
+
+from lorchestra.row_decoder import LazyJson, json_default
+from lorchestra.spill import concat_spills, encode_row, open_items_ref, read_rows, spill_items, write_rows
+
+
+class TestSpill:
+    """Tests for write_rows / read_rows."""
+
+    def test_round_trip(self, tmp_path):
+        rows = [{"id": 1, "name": "Ada"}, {"id": 2, "tags": ["x"], "meta": {"k": None}}]
+        path = tmp_path / "rows.ndjson"
+
+        offsets = write_rows(rows, path)
+
+        assert offsets[0] == 0 and offsets[-1] == path.stat().st_size
+        assert list(read_rows(path)) == rows
+
+    def test_byte_ranges(self, tmp_path):
+        rows = [{"n": i} for i in range(10)]
+        path = tmp_path / "rows.ndjson"
+        offsets = write_rows(rows, path)
+
+        assert list(read_rows(path, offsets[3], offsets[6])) == rows[3:6]
+        assert list(read_rows(path, offsets[9])) == rows[9:]
+
+    def test_lazy_json_written_unparsed(self, tmp_path):
+        cell = LazyJson('{"a": 1, "b": [1, 2]}')
+        line = encode_row({"id": "k", "payload": cell})
+
+        assert not cell.parsed
+        assert line == b'{"id":"k","payload":{"a": 1, "b": [1, 2]}}\n'
+
+    def test_multiline_lazy_json_stays_one_line(self, tmp_path):
+        path = tmp_path / "rows.ndjson"
+        write_rows([{"payload": LazyJson('{\n  "a": 1\n}')}, {"payload": None}], path)
+
+        assert list(read_rows(path)) == [{"payload": {"a": 1}}, {"payload": None}]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "rows.ndjson"
+        assert write_rows([], path) == [0]
+        assert list(read_rows(path)) == []
+
+    def test_unserializable_raises(self, tmp_path):
+        with pytest.raises(TypeError):
+            write_rows([{"x": object()}], tmp_path / "rows.ndjson")
+
+
+class TestSpilledItems:
+    """Tests for SpilledItems and items_ref."""
+
+    ROWS = [{"n": i} for i in range(5)]
+
+    def test_sequence_access(self, tmp_path):
+        items = spill_items(self.ROWS, tmp_path / "sub" / "items.ndjson")
+
+        assert len(items) == 5
+        assert items[0] == {"n": 0} and items[-1] == {"n": 4}
+        assert items[1:3] == [{"n": 1}, {"n": 2}]
+        assert items[::2] == [{"n": 0}, {"n": 2}, {"n": 4}]
+        assert list(items) == self.ROWS
+        assert items == self.ROWS
+        with pytest.raises(IndexError):
+            items[5]
+
+    def test_items_ref_round_trip(self, tmp_path):
+        items = spill_items(self.ROWS, tmp_path / "items.ndjson")
+
+        reopened = open_items_ref(items.ref)
+
+        assert items.ref == f"file://{tmp_path / 'items.ndjson'}"
+        assert list(reopened.offsets) == list(items.offsets)
+        assert reopened == self.ROWS
+
+    def test_pickles_as_reference(self, tmp_path):
+        items = spill_items(self.ROWS, tmp_path / "items.ndjson")
+
+        assert pickle.loads(pickle.dumps(items)) == self.ROWS
+        assert len(pickle.dumps(items)) < 200
+
+    def test_json_default_writes_ref(self, tmp_path):
+        items = spill_items(self.ROWS, tmp_path / "items.ndjson")
+
+        assert json.loads(json.dumps({"items": items}, default=json_default)) == {"items": items.ref}
+
+    def test_concat_spills(self, tmp_path):
+        parts = [spill_items(self.ROWS[:2], tmp_path / "a.ndjson"), spill_items(self.ROWS[2:], tmp_path / "b.ndjson")]
+
+        items = concat_spills([p.path for p in parts], tmp_path / "out" / "all.ndjson")
+
+        assert items == self.ROWS
+        assert list(items.offsets) == list(spill_items(self.ROWS, tmp_path / "one.ndjson").offsets)
+
+    @pytest.mark.parametrize("ref", ["artifact://bucket/key", "file:///no/such/file.ndjson"])
+    def test_bad_ref(self, ref):
+        with pytest.raises(ValueError):
+            open_items_ref(ref)
@@ -0,0 +1,130 @@
+"""Tests for diff-based sqlite.sync."""
+
+import sqlite3
+
+import pytest
+
+from lorchestra.sqlite_sync import HASH_COLUMN, diff_sync
+
+
+def _item(db, rows, **extra):
+    return {
+        "sqlite_path": str(db),
+        "table": "clients",
+        "columns": ["id", "name", "projected_at"],
+        "rows": rows,
+        "auto_timestamp_columns": ["projected_at"],
+        "mode": "diff",
+        **extra,
+    }
+
+
+def _table(db):
+    conn = sqlite3.connect(db)
+    try:
+        return sorted(conn.execute("SELECT id, name FROM clients").fetchall())
+    finally:
+        conn.close()
+
+
+class TestDiffSync:
+    """Tests for diff_sync."""
+
+    ROWS = [
+        {"id": "1", "name": "Ada", "projected_at": "2026-01-01T00:00:00+00:00"},
+        {"id": "2", "name": "Bo", "projected_at": "2026-01-01T00:00:00+00:00"},
+    ]
+
+    def test_first_sync_creates_table(self, tmp_path):
+        db = tmp_path / "local.db"
+
+        counts = diff_sync(_item(db, self.ROWS))
+
+        assert counts == {"inserted": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert _table(db) == [("1", "Ada"), ("2", "Bo")]
+
+    def test_unchanged_rows_are_not_written(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS))
+
+        # Only projected_at differs: nothing to do
+        later = [{**r, "projected_at": "2026-01-02T00:00:00+00:00"} for r in self.ROWS]
+        counts = diff_sync(_item(db, later))
+
+        assert counts == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+
+    def test_hash_diff_inserts_and_deletes(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS))
+
+        rows = [self.ROWS[0], {"id": "2", "name": "Bea"}, {"id": "3", "name": "Cy"}]
+        counts = diff_sync(_item(db, rows))
+
+        assert counts == {"inserted": 2, "updated": 0, "deleted": 1, "unchanged": 1}
+        assert _table(db) == [("1", "Ada"), ("2", "Bea"), ("3", "Cy")]
+
+    def test_key_columns_update_in_place(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS, key_columns=["id"]))
+
+        rows = [{"id": 2, "name": "Bea"}, {"id": "3", "name": "Cy"}]
+        counts = diff_sync(_item(db, rows, key_columns=["id"]))
+
+        assert counts == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 0}
+        assert _table(db) == [("2", "Bea"), ("3", "Cy")]
+
+    def test_auto_timestamp_filled_on_write(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, [{"id": "1", "name": "Ada"}]))
+
+        conn = sqlite3.connect(db)
+        projected_at, = conn.execute("SELECT projected_at FROM clients").fetchone()
+        conn.close()
+        assert projected_at is not None
+
+    def test_table_without_hash_column_is_replaced(self, tmp_path):
+        db = tmp_path / "local.db"
+        conn = sqlite3.connect(db)
+        conn.execute("CREATE TABLE clients (id TEXT, name TEXT, projected_at TEXT)")
+        conn.execute("INSERT INTO clients VALUES ('9', 'Old', NULL)")
+        conn.commit()
+        conn.close()
+
+        counts = diff_sync(_item(db, self.ROWS))
+
+        assert counts["deleted"] == 1 and counts["inserted"] == 2
+        assert _table(db) == [("1", "Ada"), ("2", "Bo")]
+
+    def test_schema_change_rebuilds_table(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS))
+
+        item = _item(db, [{"id": "1", "email": "a@x"}], columns=["id", "email", "projected_at"])
+        diff_sync(item)
+
+        conn = sqlite3.connect(db)
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(clients)")]
+        conn.close()
+        assert columns == ["id", "email", "projected_at", HASH_COLUMN]
+
+    def test_empty_projection_empties_table(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS))
+
+        counts = diff_sync(_item(db, [], columns=[], allow_empty=True))
+
+        assert counts["deleted"] == 2
+        assert _table(db) == []
+
+    def test_empty_projection_refused_by_default(self, tmp_path):
+        db = tmp_path / "local.db"
+        diff_sync(_item(db, self.ROWS))
+
+        with pytest.raises(ValueError, match="refusing to delete 2 existing rows"):
+            diff_sync(_item(db, [], columns=[]))
+
+        assert _table(db) == [("1", "Ada"), ("2", "Bo")]
+
+    def test_requires_path_and_table(self):
+        with pytest.raises(ValueError, match="sqlite_path and table"):
+            diff_sync({"rows": []})
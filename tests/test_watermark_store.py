@@ -0,0 +1,65 @@
+"""Tests for WatermarkStore implementations."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from lorchestra.watermark_store import (
+    FileWatermarkStore,
+    InMemoryWatermarkStore,
+    normalize_watermark,
+)
+
+
+class TestNormalizeWatermark:
+    def test_z_suffix_and_offset_are_equivalent(self):
+        assert normalize_watermark("2026-02-09T10:00:00Z") == "2026-02-09T10:00:00+00:00"
+        assert normalize_watermark("2026-02-09T12:00:00+02:00") == "2026-02-09T10:00:00+00:00"
+
+    def test_datetime_and_naive(self):
+        dt = datetime(2026, 2, 9, 10, tzinfo=timezone.utc)
+        assert normalize_watermark(dt) == "2026-02-09T10:00:00+00:00"
+        assert normalize_watermark("2026-02-09T10:00:00") == "2026-02-09T10:00:00+00:00"
+
+    def test_empty(self):
+        assert normalize_watermark(None) is None
+        assert normalize_watermark("") is None
+
+
+@pytest.fixture(params=["memory", "file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryWatermarkStore()
+    return FileWatermarkStore(tmp_path / "watermarks")
+
+
+class TestWatermarkStore:
+    def test_missing_key(self, store):
+        assert store.get("job:read") is None
+
+    def test_advance_forward_only(self, store):
+        assert store.advance("job:read", "2026-02-09T10:00:00Z") is True
+        assert store.advance("job:read", "2026-02-08T10:00:00Z") is False
+        assert store.advance("job:read", "2026-02-09T10:00:00+00:00") is False
+        assert store.get("job:read") == "2026-02-09T10:00:00+00:00"
+        assert store.advance("job:read", "2026-02-10T00:00:00Z") is True
+        assert store.get("job:read") == "2026-02-10T00:00:00+00:00"
+
+    def test_reconcile_replaces_and_verifies(self, store):
+        store.advance("raw_objects:gmail:acct1:email", "2026-02-10T00:00:00Z")
+        assert store.get_verified_at("raw_objects:gmail:acct1:email") is None
+        store.reconcile("raw_objects:gmail:acct1:email", "2026-02-09T00:00:00Z")
+        assert store.get("raw_objects:gmail:acct1:email") == "2026-02-09T00:00:00+00:00"
+        assert store.get_verified_at("raw_objects:gmail:acct1:email") is not None
+
+    def test_keys_are_independent(self, store):
+        store.advance("job_a:read", "2026-02-09T10:00:00Z")
+        assert store.get("job_b:read") is None
+
+
+class TestFileWatermarkStore:
+    def test_persists_across_instances(self, tmp_path):
+        FileWatermarkStore(tmp_path).advance("form_me_followup:read", "2026-02-09T10:00:00Z")
+        reopened = FileWatermarkStore(tmp_path)
+        assert reopened.get("form_me_followup:read") == "2026-02-09T10:00:00+00:00"
+        assert not list(tmp_path.glob("*.tmp"))